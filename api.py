@@ -5,11 +5,13 @@ Provides endpoints for document ingestion and workflow management
 """
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import asyncio
+import json
 import logging
 import os
 from pathlib import Path
@@ -56,6 +58,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses for clients that accept gzip; orchestration
+# statuses carry full step results and are fetched repeatedly
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Initialize components
 document_ingester = DocumentIngester()
 action_extractor = ActionExtractor()
@@ -65,6 +71,11 @@ workflow_matcher = WorkflowMatcher(workflow_engine)
 # In-memory orchestration status tracking
 orchestration_status = {}
 
+# Orchestration event streams check the in-memory status this often, and send
+# a comment line when idle so proxies and client read timeouts see traffic
+ORCHESTRATION_EVENT_INTERVAL = 0.5
+ORCHESTRATION_EVENT_HEARTBEAT = 15
+
 class OrchestrationStatus(Enum):
     """Orchestration status enumeration"""
     QUEUED = "queued"
@@ -712,6 +723,112 @@ async def get_workflow_run_status(run_id: str):
 
 # Orchestration Endpoints
 
+def _register_orchestration(orchestration_id: str, request: OrchestrationRequest,
+                            document: Document):
+    """
+    Start tracking an orchestration run for a document
+    Returns the coroutine function that executes the run
+    """
+    # Initialize orchestration status tracking
+    orchestration_status[orchestration_id] = {
+        "orchestration_id": orchestration_id,
+        "document_id": request.document_id,
+        "status": OrchestrationStatus.QUEUED.value,
+        "message": "Orchestration queued for execution",
+        "steps_completed": [],
+        "current_step": None,
+        "started_at": datetime.now().isoformat(),
+        "completed_at": None,
+        "results": None
+    }
+    
+    async def run_orchestration():
+        try:
+            orchestration_status[orchestration_id]["status"] = OrchestrationStatus.RUNNING.value
+            orchestration_status[orchestration_id]["current_step"] = "starting"
+            
+            logger.info(f"[{orchestration_id}] Starting orchestration workflow")
+            
+            # Get document metadata
+            metadata = document.metadata or {}
+            metadata["document_id"] = document.id
+            metadata["content_type"] = document.content_type
+            
+            # Update status for each step
+            orchestration_status[orchestration_id]["current_step"] = "analysis"
+            orchestration_status[orchestration_id]["status"] = OrchestrationStatus.ANALYSIS.value
+            
+            # Run orchestration through Claude service
+            results = await claude_service.orchestrate_workflow(
+                document_id=document.id,
+                document_content=document.text,
+                document_metadata=metadata,
+                workflow_config=request.config
+            )
+            
+            logger.info(f"[{orchestration_id}] Orchestration completed with quality score: {results.get('final_quality_score', 0)}")
+            
+            # Save remediated document to filesystem if available
+            remediated_content = None
+            remediation_path = None
+            
+            # Extract remediated content from the orchestration results
+            remediation_step = results.get('steps', {}).get('remediation', {})
+            if remediation_step.get('status') == 'completed':
+                # Get the actual remediated content from claude_service
+                # This should be available in the orchestration workflow results
+                if 'remediated_content' in results:
+                    remediated_content = results['remediated_content']
+                elif hasattr(claude_service, '_last_remediation_result'):
+                    # Fallback to get content from service if stored there
+                    remediated_content = getattr(claude_service, '_last_remediation_result', None)
+                    
+                if remediated_content:
+                    # Save remediated document to filesystem
+                    output_dir = Path(f"docs/generated/{document.id}")
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                    
+                    output_file = output_dir / "remediated_document.md"
+                    output_file.write_text(remediated_content, encoding='utf-8')
+                    remediation_path = str(output_file)
+                    
+                    logger.info(f"[{orchestration_id}] Saved remediated document to {remediation_path}")
+            
+            # Store results with remediation path
+            document.metadata = document.metadata or {}
+            document.metadata["orchestration_results"] = results
+            
+            # Store remediation path in document metadata
+            if remediation_path:
+                document.metadata["remediation_path"] = remediation_path
+                results["remediation_path"] = remediation_path
+            
+            await document_ingester._store_document(document)
+            
+            # Update final orchestration status
+            orchestration_status[orchestration_id].update({
+                "status": OrchestrationStatus.COMPLETED.value,
+                "current_step": "completed",
+                "completed_at": datetime.now().isoformat(),
+                "results": results,
+                "steps_completed": list(results.get('steps', {}).keys())
+            })
+            
+        except Exception as e:
+            logger.error(f"[{orchestration_id}] Orchestration failed: {e}")
+            orchestration_status[orchestration_id].update({
+                "status": OrchestrationStatus.FAILED.value,
+                "current_step": "failed",
+                "completed_at": datetime.now().isoformat(),
+                "error": str(e)
+            })
+    
+    return run_orchestration
+
+async def _run_orchestrations(runs):
+    """Execute orchestration runs concurrently"""
+    await asyncio.gather(*(run() for run in runs))
+
 @app.post("/orchestrate/workflow", response_model=OrchestrationResponse)
 async def orchestrate_workflow(request: OrchestrationRequest, background_tasks: BackgroundTasks):
     """Execute complete document orchestration workflow using Claude Code"""
@@ -726,103 +843,8 @@ async def orchestrate_workflow(request: OrchestrationRequest, background_tasks:
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        # Initialize orchestration status tracking
-        orchestration_status[orchestration_id] = {
-            "orchestration_id": orchestration_id,
-            "document_id": request.document_id,
-            "status": OrchestrationStatus.QUEUED.value,
-            "message": "Orchestration queued for execution",
-            "steps_completed": [],
-            "current_step": None,
-            "started_at": datetime.now().isoformat(),
-            "completed_at": None,
-            "results": None
-        }
-        
-        # Prepare orchestration task
-        async def run_orchestration():
-            try:
-                orchestration_status[orchestration_id]["status"] = OrchestrationStatus.RUNNING.value
-                orchestration_status[orchestration_id]["current_step"] = "starting"
-                
-                logger.info(f"[{orchestration_id}] Starting orchestration workflow")
-                
-                # Get document metadata
-                metadata = document.metadata or {}
-                metadata["document_id"] = document.id
-                metadata["content_type"] = document.content_type
-                
-                # Update status for each step
-                orchestration_status[orchestration_id]["current_step"] = "analysis"
-                orchestration_status[orchestration_id]["status"] = OrchestrationStatus.ANALYSIS.value
-                
-                # Run orchestration through Claude service
-                results = await claude_service.orchestrate_workflow(
-                    document_id=document.id,
-                    document_content=document.text,
-                    document_metadata=metadata,
-                    workflow_config=request.config
-                )
-                
-                logger.info(f"[{orchestration_id}] Orchestration completed with quality score: {results.get('final_quality_score', 0)}")
-                
-                # Save remediated document to filesystem if available
-                remediated_content = None
-                remediation_path = None
-                
-                # Extract remediated content from the orchestration results
-                remediation_step = results.get('steps', {}).get('remediation', {})
-                if remediation_step.get('status') == 'completed':
-                    # Get the actual remediated content from claude_service
-                    # This should be available in the orchestration workflow results
-                    if 'remediated_content' in results:
-                        remediated_content = results['remediated_content']
-                    elif hasattr(claude_service, '_last_remediation_result'):
-                        # Fallback to get content from service if stored there
-                        remediated_content = getattr(claude_service, '_last_remediation_result', None)
-                        
-                    if remediated_content:
-                        # Save remediated document to filesystem
-                        output_dir = Path(f"docs/generated/{document.id}")
-                        output_dir.mkdir(parents=True, exist_ok=True)
-                        
-                        output_file = output_dir / "remediated_document.md"
-                        output_file.write_text(remediated_content, encoding='utf-8')
-                        remediation_path = str(output_file)
-                        
-                        logger.info(f"[{orchestration_id}] Saved remediated document to {remediation_path}")
-                
-                # Store results with remediation path
-                document.metadata = document.metadata or {}
-                document.metadata["orchestration_results"] = results
-                
-                # Store remediation path in document metadata
-                if remediation_path:
-                    document.metadata["remediation_path"] = remediation_path
-                    results["remediation_path"] = remediation_path
-                
-                await document_ingester._store_document(document)
-                
-                # Update final orchestration status
-                orchestration_status[orchestration_id].update({
-                    "status": OrchestrationStatus.COMPLETED.value,
-                    "current_step": "completed",
-                    "completed_at": datetime.now().isoformat(),
-                    "results": results,
-                    "steps_completed": list(results.get('steps', {}).keys())
-                })
-                
-            except Exception as e:
-                logger.error(f"[{orchestration_id}] Orchestration failed: {e}")
-                orchestration_status[orchestration_id].update({
-                    "status": OrchestrationStatus.FAILED.value,
-                    "current_step": "failed",
-                    "completed_at": datetime.now().isoformat(),
-                    "error": str(e)
-                })
-        
         # Queue orchestration
-        background_tasks.add_task(run_orchestration)
+        background_tasks.add_task(_register_orchestration(orchestration_id, request, document))
         
         return OrchestrationResponse(
             orchestration_id=orchestration_id,
@@ -837,6 +859,46 @@ async def orchestrate_workflow(request: OrchestrationRequest, background_tasks:
         logger.error(f"[{request_id}] Failed to start orchestration: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/orchestrate/workflow:batch", response_model=List[OrchestrationResponse])
+async def orchestrate_workflow_batch(batch: List[OrchestrationRequest], background_tasks: BackgroundTasks):
+    """
+    Queue orchestration workflows for several documents in one request
+    Every document is looked up before any run is queued, so one missing
+    document rejects the whole batch; the queued runs execute concurrently
+    """
+    request_id = generate_request_id()
+    
+    logger.info(f"[{request_id}] Batch orchestration requested for {len(batch)} documents")
+    
+    try:
+        documents = [document_ingester.get_document(request.document_id) for request in batch]
+        missing = [request.document_id for request, document in zip(batch, documents) if not document]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Documents not found: {', '.join(missing)}")
+        
+        responses = []
+        runs = []
+        for request, document in zip(batch, documents):
+            orchestration_id = f"orch_{generate_request_id()}"
+            runs.append(_register_orchestration(orchestration_id, request, document))
+            responses.append(OrchestrationResponse(
+                orchestration_id=orchestration_id,
+                document_id=request.document_id,
+                status="queued",
+                message="Orchestration workflow queued for execution"
+            ))
+        
+        # Background tasks run one after another, so queue the batch as one
+        background_tasks.add_task(_run_orchestrations, runs)
+        
+        return responses
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[{request_id}] Failed to start batch orchestration: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/documents/{document_id}/analyze")
 async def analyze_document(document_id: str, request: AnalysisRequest):
     """Perform multi-agent analysis on document using Claude Code"""
@@ -992,6 +1054,29 @@ async def validate_document(document_id: str, request: ValidationRequest):
         logger.error(f"[{request_id}] Validation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _orchestration_status_info(orchestration_id: str) -> Dict[str, Any]:
+    """Snapshot of an orchestration run's status with progress information"""
+    status_info = orchestration_status[orchestration_id].copy()
+    
+    # Add progress information
+    if status_info["status"] == OrchestrationStatus.RUNNING.value:
+        current_step = status_info.get("current_step")
+        if current_step == "analysis":
+            status_info["message"] = "Performing multi-agent analysis"
+        elif current_step == "consensus":
+            status_info["message"] = "Validating findings through multi-model consensus"
+            status_info["steps_completed"] = ["analysis"]
+        elif current_step == "remediation":
+            status_info["message"] = "Generating remediated document"
+            status_info["steps_completed"] = ["analysis", "consensus"]
+        elif current_step == "validation":
+            status_info["message"] = "Performing quality validation"
+            status_info["steps_completed"] = ["analysis", "consensus", "remediation"]
+        else:
+            status_info["message"] = "Orchestration in progress"
+    
+    return status_info
+
 @app.get("/orchestrate/runs/{orchestration_id}")
 async def get_orchestration_status(orchestration_id: str):
     """Get status of an orchestration run"""
@@ -999,26 +1084,7 @@ async def get_orchestration_status(orchestration_id: str):
         if orchestration_id not in orchestration_status:
             raise HTTPException(status_code=404, detail="Orchestration run not found")
         
-        status_info = orchestration_status[orchestration_id].copy()
-        
-        # Add progress information
-        if status_info["status"] == OrchestrationStatus.RUNNING.value:
-            current_step = status_info.get("current_step")
-            if current_step == "analysis":
-                status_info["message"] = "Performing multi-agent analysis"
-            elif current_step == "consensus":
-                status_info["message"] = "Validating findings through multi-model consensus"
-                status_info["steps_completed"] = ["analysis"]
-            elif current_step == "remediation":
-                status_info["message"] = "Generating remediated document"
-                status_info["steps_completed"] = ["analysis", "consensus"]
-            elif current_step == "validation":
-                status_info["message"] = "Performing quality validation"
-                status_info["steps_completed"] = ["analysis", "consensus", "remediation"]
-            else:
-                status_info["message"] = "Orchestration in progress"
-        
-        return status_info
+        return _orchestration_status_info(orchestration_id)
         
     except HTTPException:
         raise
@@ -1026,6 +1092,43 @@ async def get_orchestration_status(orchestration_id: str):
         logger.error(f"Failed to get orchestration status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/orchestrate/runs/{orchestration_id}/events")
+async def stream_orchestration_status(orchestration_id: str):
+    """
+    Stream status changes of an orchestration run as server-sent events
+    One event is sent immediately and then on every status or step change;
+    the stream ends after the completed or failed event
+    """
+    if orchestration_id not in orchestration_status:
+        raise HTTPException(status_code=404, detail="Orchestration run not found")
+    
+    terminal = (OrchestrationStatus.COMPLETED.value, OrchestrationStatus.FAILED.value)
+    
+    async def events():
+        last_progress = None
+        idle = 0.0
+        while True:
+            status_info = _orchestration_status_info(orchestration_id)
+            progress = (status_info["status"], status_info.get("current_step"))
+            if progress != last_progress:
+                last_progress = progress
+                idle = 0.0
+                yield f"data: {json.dumps(status_info, default=str)}\n\n"
+                if progress[0] in terminal:
+                    return
+            elif idle >= ORCHESTRATION_EVENT_HEARTBEAT:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(ORCHESTRATION_EVENT_INTERVAL)
+            idle += ORCHESTRATION_EVENT_INTERVAL
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # An explicit encoding keeps the gzip middleware from buffering events
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"}
+    )
+
 @app.post("/documents/compress-folder", response_model=FolderCompressionResponse)
 async def compress_folder(request: FolderCompressionRequest, background_tasks: BackgroundTasks):
     """Compress a folder into a zip file using DSL workflow"""
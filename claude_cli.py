@@ -107,6 +107,18 @@ class ClaudeCLI:
         audit_dir = Path(self.audit_log_file).parent
         audit_dir.mkdir(parents=True, exist_ok=True)
     
+    def _print_command(self, system_prompt: Optional[str] = None) -> List[str]:
+        """
+        Build a non-interactive claude command
+        
+        A system prompt is appended to Claude Code's own, so instructions
+        shared across calls form a stable prompt prefix the provider caches
+        """
+        cmd = [self.claude_cmd, "--print"]
+        if system_prompt:
+            cmd += ["--append-system-prompt", system_prompt]
+        return cmd
+    
     def _log_file_access(self, file_path: str, operation: str, status: str, details: Dict[str, Any] = None):
         """Log file access for audit trail"""
         if not self.audit_log_enabled:
@@ -537,7 +549,9 @@ class ClaudeCLI:
             if original_timeout is not None:
                 self.timeout = original_timeout
     
-    def analyze_text(self, text: str, prompt: str, schema: Optional[Dict] = None) -> Dict:
+    def analyze_text(self, text: str, prompt: str, schema: Optional[Dict] = None,
+                     system_prompt: Optional[str] = None, cache_schema: bool = True,
+                     max_text_chars: Optional[int] = 3000) -> Dict:
         """
         Analyze text using Claude and return structured output
         
@@ -545,6 +559,12 @@ class ClaudeCLI:
             text: Text to analyze
             prompt: Analysis prompt/instructions
             schema: Optional JSON schema for structured output
+            system_prompt: Optional instructions shared across calls
+            cache_schema: Send the schema and JSON rules with the system prompt,
+                where they are part of the cached prompt prefix, instead of
+                in every message
+            max_text_chars: Characters of text sent; None when the caller
+                has already cut it to size
             
         Returns:
             Analysis result as dictionary
@@ -552,30 +572,45 @@ class ClaudeCLI:
         Raises:
             Exception: If analysis fails
         """
+        if max_text_chars is not None:
+            text = text[:max_text_chars]
+        
         # Prepare the full prompt with stronger JSON enforcement
         if schema:
             # Much stronger JSON enforcement for schema-based requests
-            full_prompt = f"""{prompt}
-
-CRITICAL JSON OUTPUT REQUIREMENTS:
+            json_rules = f"""CRITICAL JSON OUTPUT REQUIREMENTS:
 1. You MUST respond with valid JSON only
 2. Use this exact schema: {json.dumps(schema, indent=2)}
 3. Do NOT include any explanatory text before or after the JSON
 4. Start your response with {{ or [
 5. End your response with }} or ]
-6. No markdown code blocks, no comments, just pure JSON
+6. No markdown code blocks, no comments, just pure JSON"""
+            if cache_schema:
+                system_prompt = f"{system_prompt.rstrip()}\n\n{json_rules}" if system_prompt else json_rules
+                full_prompt = f"""{prompt}
+
+Text to analyze:
+---
+{text}
+---
+
+JSON OUTPUT (no other text):"""
+            else:
+                full_prompt = f"""{prompt}
+
+{json_rules}
 
 Text to analyze:
 ---
-{text[:3000]}
+{text}
 ---
 
 JSON OUTPUT (no other text):"""
         else:
-            full_prompt = f"{prompt}\n\nText to analyze:\n---\n{text[:3000]}\n---\n"
+            full_prompt = f"{prompt}\n\nText to analyze:\n---\n{text}\n---\n"
         
         # Use claude with --print flag for non-interactive output
-        cmd = [self.claude_cmd, "--print"]
+        cmd = self._print_command(system_prompt)
         
         # Try with retries if JSON parsing fails
         max_attempts = 3 if schema else 1
@@ -729,7 +764,8 @@ JSON OUTPUT (no other text):"""
     def execute_with_mode(self, 
                          prompt: str, 
                          mode: Union[SuperClaudeMode, str], 
-                         context: Optional[Dict[str, Any]] = None) -> CLIResult:
+                         context: Optional[Dict[str, Any]] = None,
+                         system_prompt: Optional[str] = None) -> CLIResult:
         """
         Execute command with SuperClaude behavioral mode
         
@@ -737,6 +773,7 @@ JSON OUTPUT (no other text):"""
             prompt: Command or query to execute
             mode: SuperClaude behavioral mode (brainstorm, task-manage, etc.)
             context: Optional context data
+            system_prompt: Optional instructions shared across calls
             
         Returns:
             CLI execution result with metadata
@@ -754,7 +791,7 @@ JSON OUTPUT (no other text):"""
         }
         
         # Build command with ONLY valid CLI flags
-        cmd = [self.claude_cmd, "--print"]
+        cmd = self._print_command(system_prompt)
         
         # Embed mode instruction in prompt
         mode_instruction = mode_prompts.get(mode_str, f"--{mode_str}: Execute in {mode_str} mode.")
@@ -829,7 +866,8 @@ JSON OUTPUT (no other text):"""
     def use_mcp_server(self, 
                       prompt: str, 
                       mcp: Union[SuperClaudeMCP, str],
-                      additional_flags: List[str] = None) -> CLIResult:
+                      additional_flags: List[str] = None,
+                      system_prompt: Optional[str] = None) -> CLIResult:
         """
         Execute task using specific MCP server
         
@@ -837,6 +875,7 @@ JSON OUTPUT (no other text):"""
             prompt: Task description
             mcp: MCP server to use
             additional_flags: Additional command flags
+            system_prompt: Optional instructions shared across calls
             
         Returns:
             CLI execution result with MCP metadata
@@ -855,7 +894,7 @@ JSON OUTPUT (no other text):"""
         }
         
         # Build command with ONLY valid CLI flags
-        cmd = [self.claude_cmd, "--print"]
+        cmd = self._print_command(system_prompt)
         
         # Build prompt with MCP instruction
         mcp_instruction = mcp_prompts.get(mcp_str, f"Use {mcp_str} MCP server for this task.")
@@ -1046,9 +1085,12 @@ class AsyncClaudeCLI(ClaudeCLI):
         """Async version of read_document"""
         return await asyncio.to_thread(self.read_document, file_path)
     
-    async def analyze_text_async(self, text: str, prompt: str, schema: Optional[Dict] = None) -> Dict:
+    async def analyze_text_async(self, text: str, prompt: str, schema: Optional[Dict] = None,
+                                 system_prompt: Optional[str] = None, cache_schema: bool = True,
+                                 max_text_chars: Optional[int] = 3000) -> Dict:
         """Async version of analyze_text"""
-        return await asyncio.to_thread(self.analyze_text, text, prompt, schema)
+        return await asyncio.to_thread(self.analyze_text, text, prompt, schema, system_prompt,
+                                       cache_schema, max_text_chars)
     
     async def execute_task_async(self, agent: str, action: str, params: Optional[Dict] = None) -> Dict:
         """Async version of execute_task"""
@@ -1061,16 +1103,18 @@ class AsyncClaudeCLI(ClaudeCLI):
     async def execute_with_mode_async(self, 
                                      prompt: str, 
                                      mode: Union[SuperClaudeMode, str], 
-                                     context: Optional[Dict[str, Any]] = None) -> CLIResult:
+                                     context: Optional[Dict[str, Any]] = None,
+                                     system_prompt: Optional[str] = None) -> CLIResult:
         """Async wrapper for execute_with_mode"""
-        return await asyncio.to_thread(self.execute_with_mode, prompt, mode, context)
+        return await asyncio.to_thread(self.execute_with_mode, prompt, mode, context, system_prompt)
     
     async def use_mcp_server_async(self, 
                                   prompt: str, 
                                   mcp: Union[SuperClaudeMCP, str],
-                                  additional_flags: List[str] = None) -> CLIResult:
+                                  additional_flags: List[str] = None,
+                                  system_prompt: Optional[str] = None) -> CLIResult:
         """Async wrapper for use_mcp_server"""
-        return await asyncio.to_thread(self.use_mcp_server, prompt, mcp, additional_flags)
+        return await asyncio.to_thread(self.use_mcp_server, prompt, mcp, additional_flags, system_prompt)
     
     async def delegate_to_agent_async(self, 
                                      prompt: str, 
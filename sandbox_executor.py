@@ -10,17 +10,176 @@ import logging
 import json
 import os
 import time
-import resource
 import shutil
-from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass, asdict
+import signal
+import itertools
+import codecs
+import ctypes
+import functools
+import socket
+import struct
+import sys
+import py_compile
+import re
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 import hashlib
 import asyncio
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if os.name == 'posix':
+    # Only needed for child pre-exec setup, which is POSIX-only
+    import fcntl
+    import resource
+
 logger = logging.getLogger(__name__)
 
+# cgroup v2 unified hierarchy; per-execution cgroups live under a delegated subtree
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+CGROUP_SUBTREE = "docautomate"
+
+# Side file carrying INPUT_DATA into executed Python code
+INPUT_DATA_FILE = "input.json"
+
+# Number of execution directories pre-created per sandbox
+EXECUTION_SLOTS = 4
+
+# Read size when draining subprocess stdout/stderr
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+# Python scripts below this size run via `python3 -c` with INPUT_DATA on stdin
+INLINE_SCRIPT_MAX_SIZE = 8 * 1024
+
+# Compiled scripts kept in memory, most recently used
+COMPILED_SCRIPT_CACHE_SIZE = 64
+
+# Interpreter for every Python execution; cached bytecode is only valid for it
+PYTHON_EXECUTABLE = sys.executable or "python3"
+
+# Grace period for reaping a child after SIGKILL on timeout
+KILL_WAIT_SECONDS = 2.0
+
+# Linux namespace and interface constants used for network isolation
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+SIOCSIFFLAGS = 0x8914
+IFF_UP = 0x1
+IFF_LOOPBACK = 0x8
+IFF_RUNNING = 0x40
+
+def serialize_input_data(input_data: Dict[str, Any]) -> bytes:
+    """Serialize INPUT_DATA to compact JSON bytes, stringifying unknown types"""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            input_data,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(input_data, separators=(',', ':'), default=str).encode('utf-8')
+
+def _unshare(flags: int):
+    """Call unshare(2), via os.unshare on Python 3.12+ or libc otherwise"""
+    if hasattr(os, 'unshare'):
+        os.unshare(flags)
+        return
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.unshare(flags) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+def _isolate_network():
+    """
+    Move the calling process into a new network namespace with only loopback up
+    
+    Unprivileged callers also get a user namespace mapping their own uid/gid so
+    they hold CAP_NET_ADMIN over the new namespace. Meant to run in preexec_fn.
+    """
+    uid, gid = os.getuid(), os.getgid()
+    flags = CLONE_NEWNET
+    if os.geteuid() != 0:
+        flags |= CLONE_NEWUSER
+    
+    _unshare(flags)
+    
+    if flags & CLONE_NEWUSER:
+        with open("/proc/self/setgroups", 'w') as f:
+            f.write("deny")
+        with open("/proc/self/uid_map", 'w') as f:
+            f.write(f"{uid} {uid} 1")
+        with open("/proc/self/gid_map", 'w') as f:
+            f.write(f"{gid} {gid} 1")
+    
+    # A fresh namespace starts with lo down; bring it up so localhost still works
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        ifreq = struct.pack('16sH14x', b'lo', IFF_UP | IFF_LOOPBACK | IFF_RUNNING)
+        fcntl.ioctl(sock, SIOCSIFFLAGS, ifreq)
+
+@functools.lru_cache(maxsize=None)
+def network_isolation_available() -> bool:
+    """Check once per process whether children can be placed in a private netns"""
+    if not os.path.exists("/proc/self/ns/net"):
+        return False
+    try:
+        subprocess.run(["true"], preexec_fn=_isolate_network, check=True, timeout=5)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Network namespaces unavailable, falling back to proxy blocking: {e}")
+        return False
+    return True
+
+class PatternScanner:
+    """
+    Find which of a fixed set of substrings occur in a text in one regex pass
+    
+    Equivalent to ``[p for p in patterns if p in text]``: the alternation is
+    anchored in a lookahead so every start position is tried, and a match of
+    a longer pattern also reports the shorter patterns it contains.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = tuple(patterns)
+        ordered = sorted(set(self.patterns), key=len, reverse=True)
+        self._regex = re.compile("(?=(" + "|".join(re.escape(p) for p in ordered) + "))")
+        self._contained = {p: {q for q in self.patterns if q in p} for p in self.patterns}
+    
+    def find(self, text: str) -> List[str]:
+        """Return the patterns present in text, in declaration order"""
+        matched = set()
+        for match in self._regex.finditer(text):
+            matched |= self._contained[match.group(1)]
+            if len(matched) == len(self._contained):
+                break
+        return [p for p in self.patterns if p in matched]
+
+# Substring patterns rejected by code security validation
+PYTHON_DANGEROUS_IMPORTS = [
+    "subprocess", "os.system", "eval", "exec", "compile",
+    "__import__", "importlib", "sys", "ctypes"
+]
+PYTHON_HIGH_SECURITY_IMPORTS = ["socket", "urllib", "requests", "http"]
+PYTHON_FILE_OPERATIONS = ["open(", "with open", "file(", "shutil.", "os."]
+PYTHON_NETWORK_PATTERNS = ["urllib", "requests", "socket", "http", "ftp"]
+BASH_DANGEROUS_COMMANDS = [
+    "rm -rf", "rm -r", "sudo", "su", "chmod", "chown",
+    "passwd", "adduser", "deluser", "crontab", "systemctl",
+    "service", "mount", "umount", "fdisk", "mkfs"
+]
+BASH_NETWORK_COMMANDS = ["curl", "wget", "nc", "netcat", "ssh", "scp", "rsync"]
+
+_PYTHON_DANGEROUS_SCANNER = PatternScanner(PYTHON_DANGEROUS_IMPORTS)
+_PYTHON_DANGEROUS_HIGH_SCANNER = PatternScanner(PYTHON_DANGEROUS_IMPORTS + PYTHON_HIGH_SECURITY_IMPORTS)
+_PYTHON_FILE_OPS_SCANNER = PatternScanner(PYTHON_FILE_OPERATIONS)
+_PYTHON_NETWORK_SCANNER = PatternScanner(PYTHON_NETWORK_PATTERNS)
+_BASH_DANGEROUS_SCANNER = PatternScanner(BASH_DANGEROUS_COMMANDS)
+_BASH_NETWORK_SCANNER = PatternScanner(BASH_NETWORK_COMMANDS)
+
 class ExecutionStatus(str, Enum):
     """Execution status enumeration"""
     SUCCESS = "success"
@@ -46,6 +205,7 @@ class ExecutionLimits:
     network_access: bool = False
     file_system_access: bool = True
     max_files: int = 100
+    max_processes: int = 64
 
 @dataclass
 class ExecutionResult:
@@ -73,9 +233,89 @@ class SandboxExecutor:
         self.limits = base_limits or ExecutionLimits()
         self.temp_dir = Path(tempfile.mkdtemp(prefix="docautomate_sandbox_"))
         self.allowed_imports = self._get_allowed_imports()
+        self.cgroup_dir = self._create_cgroup()
+        
+        # Ring of reusable execution directories to avoid mkdir/rmtree per execution
+        self._slot_counter = itertools.count()
+        self._dir_ring = [self._new_slot() for _ in range(EXECUTION_SLOTS)]
+        
+        # Bytecode by source hash, held in this process where sandboxed code
+        # cannot reach it and written into each execution directory afresh
+        self._compiled_scripts = OrderedDict()
         
         logger.info(f"Initialized sandbox executor with {security_level.value} security")
         
+    def _create_cgroup(self) -> Optional[Path]:
+        """
+        Create a cgroup v2 parent for this sandbox's executions
+        
+        Requires a delegated, writable cgroup v2 hierarchy. Returns None when
+        unavailable, in which case executions fall back to RLIMIT_AS.
+        """
+        if os.name != 'posix' or not (CGROUP_ROOT / "cgroup.controllers").exists():
+            return None
+        
+        cgroup_dir = CGROUP_ROOT / CGROUP_SUBTREE / f"sandbox_{os.getpid()}_{id(self)}"
+        try:
+            cgroup_dir.mkdir(parents=True, exist_ok=True)
+            # Leaf cgroups need the memory and pids controllers enabled on the parents
+            for parent in (cgroup_dir.parent, cgroup_dir):
+                (parent / "cgroup.subtree_control").write_text("+memory +pids")
+        except OSError as e:
+            logger.debug(f"cgroup v2 delegation unavailable, using rlimits: {e}")
+            try:
+                cgroup_dir.rmdir()
+            except OSError:
+                pass
+            return None
+        
+        logger.info(f"Using cgroup v2 memory accounting at {cgroup_dir}")
+        return cgroup_dir
+    
+    def _create_execution_cgroup(self, limits: ExecutionLimits, name: str) -> Optional[Path]:
+        """Create a leaf cgroup enforcing memory.max and pids.max for one execution"""
+        if not self.cgroup_dir:
+            return None
+        
+        exec_cgroup = self.cgroup_dir / name
+        try:
+            exec_cgroup.mkdir(exist_ok=True)
+            (exec_cgroup / "memory.max").write_text(str(limits.memory_limit_mb * 1024 * 1024))
+            (exec_cgroup / "memory.swap.max").write_text("0")
+            (exec_cgroup / "pids.max").write_text(str(limits.max_processes))
+        except OSError as e:
+            logger.warning(f"Failed to configure execution cgroup, using rlimits: {e}")
+            self._remove_cgroup(exec_cgroup)
+            return None
+        
+        return exec_cgroup
+    
+    def _read_cgroup_memory(self, exec_cgroup: Path) -> Optional[int]:
+        """Read peak RSS (bytes) charged to an execution cgroup"""
+        try:
+            return int((exec_cgroup / "memory.peak").read_text())
+        except (OSError, ValueError):
+            # memory.peak requires Linux 5.19+
+            return None
+    
+    def _cgroup_oom_killed(self, exec_cgroup: Path) -> bool:
+        """Check whether the kernel OOM-killed anything in an execution cgroup"""
+        try:
+            for line in (exec_cgroup / "memory.events").read_text().splitlines():
+                key, _, value = line.partition(" ")
+                if key == "oom_kill":
+                    return int(value) > 0
+        except (OSError, ValueError):
+            pass
+        return False
+    
+    def _remove_cgroup(self, cgroup_dir: Path):
+        """Remove an (empty) cgroup directory"""
+        try:
+            cgroup_dir.rmdir()
+        except OSError as e:
+            logger.debug(f"Failed to remove cgroup {cgroup_dir}: {e}")
+    
     def _get_allowed_imports(self) -> List[str]:
         """Get list of allowed Python imports based on security level"""
         base_imports = [
@@ -135,8 +375,8 @@ class SandboxExecutor:
             )
         
         # Prepare execution environment
-        execution_dir = self.temp_dir / f"exec_{int(time.time())}"
-        execution_dir.mkdir(parents=True, exist_ok=True)
+        execution_dir = self._acquire_slot()
+        result = None
         
         try:
             if language.lower() == "python":
@@ -148,7 +388,10 @@ class SandboxExecutor:
             
             # Collect artifacts
             result.artifacts = self._collect_artifacts(execution_dir)
-            result.files_created = [str(f) for f in execution_dir.rglob("*") if f.is_file()]
+            result.files_created = [
+                str(f) for f in execution_dir.rglob("*")
+                if f.is_file() and f.name != INPUT_DATA_FILE
+            ]
             
             return result
             
@@ -166,12 +409,65 @@ class SandboxExecutor:
                 error_message=str(e)
             )
         finally:
-            # Cleanup execution directory if not needed for artifacts
-            if not result or not result.artifacts:
-                try:
-                    shutil.rmtree(execution_dir)
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup execution directory: {e}")
+            # Keep the execution directory if its artifacts are needed, otherwise recycle it
+            self._release_slot(execution_dir, keep=bool(result and result.artifacts))
+    
+    async def execute_many(self,
+                           jobs: List[Dict[str, Any]],
+                           max_concurrency: Optional[int] = None) -> List[ExecutionResult]:
+        """
+        Execute several code snippets concurrently
+        
+        Args:
+            jobs: Keyword arguments for execute_code, one dict per execution
+            max_concurrency: Maximum simultaneous executions (defaults to CPU count)
+            
+        Returns:
+            Execution results in the same order as jobs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+        
+        async def run(job: Dict[str, Any]) -> ExecutionResult:
+            async with semaphore:
+                return await self.execute_code(**job)
+        
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(run(job)) for job in jobs]
+        
+        return [task.result() for task in tasks]
+    
+    def _new_slot(self) -> Path:
+        """Create a new execution directory under the sandbox root"""
+        slot = self.temp_dir / f"slot_{next(self._slot_counter)}"
+        slot.mkdir()
+        return slot
+    
+    def _acquire_slot(self) -> Path:
+        """Take a clean execution directory from the ring, creating one if exhausted"""
+        if self._dir_ring:
+            return self._dir_ring.pop()
+        return self._new_slot()
+    
+    def _release_slot(self, slot: Path, keep: bool = False):
+        """Return an execution directory to the ring after clearing its contents"""
+        if keep:
+            # Artifacts stay on disk; the slot is retired and replaced lazily
+            return
+        try:
+            self._reset_slot(slot)
+        except OSError as e:
+            logger.warning(f"Failed to reset execution directory: {e}")
+            return
+        self._dir_ring.append(slot)
+    
+    def _reset_slot(self, slot: Path):
+        """Clear an execution directory in place without removing it"""
+        with os.scandir(slot) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
     
     def _validate_code_security(self, code: str, language: str) -> List[str]:
         """
@@ -198,31 +494,23 @@ class SandboxExecutor:
         issues = []
         
         # Check for dangerous imports
-        dangerous_imports = [
-            "subprocess", "os.system", "eval", "exec", "compile",
-            "__import__", "importlib", "sys", "ctypes"
-        ]
-        
         if self.security_level == SecurityLevel.HIGH:
-            dangerous_imports.extend(["socket", "urllib", "requests", "http"])
+            dangerous_scanner = _PYTHON_DANGEROUS_HIGH_SCANNER
+        else:
+            dangerous_scanner = _PYTHON_DANGEROUS_SCANNER
         
-        for dangerous in dangerous_imports:
-            if dangerous in code:
-                issues.append(f"Potentially dangerous import or function: {dangerous}")
+        for dangerous in dangerous_scanner.find(code):
+            issues.append(f"Potentially dangerous import or function: {dangerous}")
         
         # Check for file system operations that might be dangerous
-        if self.security_level == SecurityLevel.HIGH:
-            dangerous_file_ops = ["open(", "with open", "file(", "shutil.", "os."]
-            for op in dangerous_file_ops:
-                if op in code and "/tmp/" not in code:
-                    issues.append(f"File system operation outside sandbox: {op}")
+        if self.security_level == SecurityLevel.HIGH and "/tmp/" not in code:
+            for op in _PYTHON_FILE_OPS_SCANNER.find(code):
+                issues.append(f"File system operation outside sandbox: {op}")
         
         # Check for network operations
         if not self.limits.network_access:
-            network_patterns = ["urllib", "requests", "socket", "http", "ftp"]
-            for pattern in network_patterns:
-                if pattern in code:
-                    issues.append(f"Network access not allowed: {pattern}")
+            for pattern in _PYTHON_NETWORK_SCANNER.find(code):
+                issues.append(f"Network access not allowed: {pattern}")
         
         return issues
     
@@ -231,22 +519,13 @@ class SandboxExecutor:
         issues = []
         
         # Check for dangerous commands
-        dangerous_commands = [
-            "rm -rf", "rm -r", "sudo", "su", "chmod", "chown",
-            "passwd", "adduser", "deluser", "crontab", "systemctl",
-            "service", "mount", "umount", "fdisk", "mkfs"
-        ]
-        
-        for dangerous in dangerous_commands:
-            if dangerous in code:
-                issues.append(f"Dangerous command: {dangerous}")
+        for dangerous in _BASH_DANGEROUS_SCANNER.find(code):
+            issues.append(f"Dangerous command: {dangerous}")
         
         # Check for network operations
         if not self.limits.network_access:
-            network_commands = ["curl", "wget", "nc", "netcat", "ssh", "scp", "rsync"]
-            for cmd in network_commands:
-                if cmd in code:
-                    issues.append(f"Network command not allowed: {cmd}")
+            for cmd in _BASH_NETWORK_SCANNER.find(code):
+                issues.append(f"Network command not allowed: {cmd}")
         
         return issues
     
@@ -257,29 +536,68 @@ class SandboxExecutor:
                                  execution_dir: Path) -> ExecutionResult:
         """Execute Python code with security constraints"""
         
+        # Small scripts skip the disk: source goes on the command line, data over stdin
+        if len(code) < INLINE_SCRIPT_MAX_SIZE:
+            stdin_data = None
+            if input_data:
+                code = "import json, sys\nINPUT_DATA = json.load(sys.stdin)\ndel sys\n\n" + code
+                stdin_data = serialize_input_data(input_data)
+            cmd = [PYTHON_EXECUTABLE, "-u", "-c", code]
+            return await self._execute_with_limits(cmd, limits, execution_dir, stdin_data)
+        
         # Create Python script file
         script_file = execution_dir / "script.py"
         
-        # Prepare the code with input data
+        # Pass input data through a side file instead of embedding it as a source literal
         if input_data:
-            data_setup = f"import json\nINPUT_DATA = {json.dumps(input_data, indent=2, default=str)}\n\n"
+            with open(execution_dir / INPUT_DATA_FILE, 'wb') as f:
+                f.write(serialize_input_data(input_data))
+            data_setup = f"import json\nwith open({INPUT_DATA_FILE!r}) as _input_file:\n    INPUT_DATA = json.load(_input_file)\n\n"
             full_code = data_setup + code
         else:
             full_code = code
         
-        # Write code to file
-        with open(script_file, 'w') as f:
-            f.write(full_code)
+        # Reuse bytecode compiled for an identical script in an earlier execution
+        pyc_file = self._compile_script(full_code, script_file)
         
         # Prepare execution command
         cmd = [
-            "python3", "-u",  # Unbuffered output
-            str(script_file)
+            PYTHON_EXECUTABLE, "-u",  # Unbuffered output
+            str(pyc_file or script_file)
         ]
         
         # Execute with resource limits
         return await self._execute_with_limits(cmd, limits, execution_dir)
     
+    def _compile_script(self, full_code: str, script_file: Path) -> Optional[Path]:
+        """
+        Compile a script to bytecode once, keyed by a hash of its source
+        
+        Writes the bytecode next to ``script_file`` and returns its path, or
+        returns None after writing ``script_file`` when the source does not
+        compile, so the interpreter reports the error itself.
+        """
+        source_hash = hashlib.blake2b(full_code.encode('utf-8'), digest_size=16).hexdigest()
+        pyc_file = script_file.with_suffix(".pyc")
+        
+        bytecode = self._compiled_scripts.get(source_hash)
+        if bytecode is None:
+            with open(script_file, 'w') as f:
+                f.write(full_code)
+            try:
+                py_compile.compile(str(script_file), cfile=str(pyc_file), dfile="script.py", doraise=True)
+            except py_compile.PyCompileError:
+                return None
+            # Read back before the script can run and touch the file
+            self._compiled_scripts[source_hash] = pyc_file.read_bytes()
+            if len(self._compiled_scripts) > COMPILED_SCRIPT_CACHE_SIZE:
+                self._compiled_scripts.popitem(last=False)
+        else:
+            self._compiled_scripts.move_to_end(source_hash)
+            pyc_file.write_bytes(bytecode)
+        
+        return pyc_file
+    
     async def _execute_bash_code(self, 
                                 code: str, 
                                 input_data: Dict[str, Any],
@@ -309,8 +627,9 @@ class SandboxExecutor:
     async def _execute_with_limits(self, 
                                  cmd: List[str], 
                                  limits: ExecutionLimits,
-                                 execution_dir: Path) -> ExecutionResult:
-        """Execute command with resource limits"""
+                                 execution_dir: Path,
+                                 stdin_data: Optional[bytes] = None) -> ExecutionResult:
+        """Execute command with resource limits, optionally feeding stdin_data to the child"""
         
         start_time = time.time()
         
@@ -320,15 +639,25 @@ class SandboxExecutor:
         env['HOME'] = str(execution_dir)
         env['TMPDIR'] = str(execution_dir)
         
-        if not limits.network_access:
-            # Block network access by setting empty proxy
+        # The first probe forks a child and waits on it, so keep it off the event loop
+        isolate_network = (not limits.network_access
+                           and await asyncio.to_thread(network_isolation_available))
+        if not limits.network_access and not isolate_network:
+            # Without namespaces, at least steer HTTP clients to a dead proxy
             env['http_proxy'] = 'http://127.0.0.1:1'
             env['https_proxy'] = 'http://127.0.0.1:1'
         
+        exec_cgroup = self._create_execution_cgroup(limits, execution_dir.name)
+        
         # Set resource limits
         def set_limits():
-            # Memory limit (in bytes)
-            resource.setrlimit(resource.RLIMIT_AS, (limits.memory_limit_mb * 1024 * 1024, -1))
+            if exec_cgroup:
+                # Join the execution cgroup before exec so every allocation is charged
+                with open(exec_cgroup / "cgroup.procs", 'w') as f:
+                    f.write(str(os.getpid()))
+            else:
+                # Memory limit (in bytes)
+                resource.setrlimit(resource.RLIMIT_AS, (limits.memory_limit_mb * 1024 * 1024, -1))
             
             # CPU time limit
             resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_time_seconds, -1))
@@ -338,11 +667,17 @@ class SandboxExecutor:
             
             # Core dump size limit
             resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+            
+            # Network namespace with only loopback (after joining the cgroup)
+            if isolate_network:
+                _isolate_network()
         
+        pidfd = None
         try:
             # Execute the command
             process = await asyncio.create_subprocess_exec(
                 *cmd,
+                stdin=asyncio.subprocess.PIPE if stdin_data is not None else None,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=execution_dir,
@@ -350,10 +685,34 @@ class SandboxExecutor:
                 preexec_fn=set_limits if os.name == 'posix' else None
             )
             
-            # Wait for completion with timeout
+            # Pin the child with a pidfd so a timeout kill cannot hit a recycled PID
+            pidfd = self._open_pidfd(process.pid)
+            
+            # Drain and decode output incrementally while waiting, with timeout
+            async def feed_stdin():
+                try:
+                    process.stdin.write(stdin_data)
+                    await process.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The child exited without reading its input
+                    pass
+                finally:
+                    process.stdin.close()
+            
+            async def communicate():
+                readers = [
+                    self._drain_stream(process.stdout, limits.max_output_size),
+                    self._drain_stream(process.stderr, limits.max_output_size)
+                ]
+                if stdin_data is not None:
+                    readers.append(feed_stdin())
+                output = await asyncio.gather(*readers)
+                await process.wait()
+                return output[:2]
+            
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                stdout_text, stderr_text = await asyncio.wait_for(
+                    communicate(),
                     timeout=limits.timeout_seconds
                 )
                 return_code = process.returncode
@@ -361,11 +720,7 @@ class SandboxExecutor:
                 
             except asyncio.TimeoutError:
                 # Kill the process if it times out
-                try:
-                    process.kill()
-                    await process.wait()
-                except:
-                    pass
+                await self._kill_process(process, pidfd)
                 
                 return ExecutionResult(
                     status=ExecutionStatus.TIMEOUT,
@@ -379,10 +734,6 @@ class SandboxExecutor:
                     error_message="Execution timeout"
                 )
             
-            # Decode output
-            stdout_text = stdout.decode('utf-8', errors='replace')
-            stderr_text = stderr.decode('utf-8', errors='replace')
-            
             # Truncate output if too large
             if len(stdout_text) > limits.max_output_size:
                 stdout_text = stdout_text[:limits.max_output_size] + "\n... (output truncated)"
@@ -392,15 +743,24 @@ class SandboxExecutor:
             
             execution_time = time.time() - start_time
             
+            memory_used = None
+            if exec_cgroup:
+                memory_used = self._read_cgroup_memory(exec_cgroup)
+                if status == ExecutionStatus.FAILED and self._cgroup_oom_killed(exec_cgroup):
+                    status = ExecutionStatus.MEMORY_EXCEEDED
+            if memory_used is None:
+                memory_used = self._estimate_memory_usage(execution_dir)
+            
             return ExecutionResult(
                 status=status,
                 stdout=stdout_text,
                 stderr=stderr_text,
                 return_code=return_code,
                 execution_time=execution_time,
-                memory_used=self._estimate_memory_usage(execution_dir),
+                memory_used=memory_used,
                 files_created=[],
-                artifacts={}
+                artifacts={},
+                error_message="Memory limit exceeded" if status == ExecutionStatus.MEMORY_EXCEEDED else None
             )
             
         except MemoryError:
@@ -441,9 +801,65 @@ class SandboxExecutor:
                 artifacts={},
                 error_message=str(e)
             )
+        
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+            if exec_cgroup:
+                self._remove_cgroup(exec_cgroup)
+    
+    def _open_pidfd(self, pid: int) -> Optional[int]:
+        """Open a pidfd for a child process where the platform supports it"""
+        if not hasattr(os, 'pidfd_open'):
+            return None
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            # Already exited, or the kernel predates pidfd_open (Linux < 5.3)
+            return None
+    
+    async def _kill_process(self, process: asyncio.subprocess.Process, pidfd: Optional[int]):
+        """SIGKILL a timed-out child and wait briefly for it to be reaped"""
+        try:
+            if pidfd is not None:
+                signal.pidfd_send_signal(pidfd, signal.SIGKILL)
+            else:
+                process.kill()
+            await asyncio.wait_for(process.wait(), timeout=KILL_WAIT_SECONDS)
+        except ProcessLookupError:
+            # Exited on its own between the timeout and the kill
+            pass
+        except asyncio.TimeoutError:
+            logger.warning(f"Process {process.pid} was not reaped {KILL_WAIT_SECONDS}s after SIGKILL")
+    
+    async def _drain_stream(self, stream: asyncio.StreamReader, limit: int) -> str:
+        """
+        Read a subprocess pipe to EOF, decoding UTF-8 as chunks arrive
+        
+        Stops keeping text once more than ``limit`` characters have been
+        decoded but keeps reading so the child never blocks on a full pipe.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        parts = []
+        size = 0
+        
+        while True:
+            chunk = await stream.read(OUTPUT_CHUNK_SIZE)
+            if not chunk:
+                break
+            if size > limit:
+                continue
+            text = decoder.decode(chunk)
+            parts.append(text)
+            size += len(text)
+        
+        if size <= limit:
+            parts.append(decoder.decode(b'', final=True))
+        
+        return ''.join(parts)
     
     def _estimate_memory_usage(self, execution_dir: Path) -> int:
-        """Estimate memory usage by looking at created files"""
+        """Estimate memory usage by looking at created files (fallback without cgroup v2)"""
         total_size = 0
         try:
             for file_path in execution_dir.rglob("*"):
@@ -462,6 +878,8 @@ class SandboxExecutor:
             # Look for common output files
             for pattern in ["*.json", "*.csv", "*.txt", "*.png", "*.pdf", "*.xlsx"]:
                 for file_path in execution_dir.glob(pattern):
+                    if file_path.name == INPUT_DATA_FILE:
+                        continue
                     if file_path.is_file() and file_path.stat().st_size < 10 * 1024 * 1024:  # < 10MB
                         rel_path = file_path.relative_to(execution_dir)
                         
@@ -485,6 +903,9 @@ class SandboxExecutor:
     def cleanup(self):
         """Clean up temporary directories and resources"""
         try:
+            if self.cgroup_dir:
+                self._remove_cgroup(self.cgroup_dir)
+                self.cgroup_dir = None
             if self.temp_dir.exists():
                 shutil.rmtree(self.temp_dir)
                 logger.info("Sandbox cleanup completed")
@@ -4,39 +4,102 @@ Document Remediation Generation Pipeline
 Generates new documents that address identified issues using templates
 """
 
+import io
 import json
+import os
+import pickle
 import yaml
 import argparse
+import asyncio
 import sys
+import time
 from pathlib import Path
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Set
 import hashlib
 import re
-from jinja2 import Template, Environment, FileSystemLoader
+import secrets
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Environment, FileSystemLoader, FunctionLoader, FileSystemBytecodeCache
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# libyaml-backed YAML loader/dumper when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+def _intern(value: Any) -> Any:
+    """Intern string values; anything else passes through unchanged"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+# Template sets at least this large are read and parsed on a thread pool
+TEMPLATE_PARALLEL_MIN_FILES = 8
+TEMPLATE_MAX_WORKERS = 32
+
+# Delimiters that make a remediation pattern need Jinja to render
+JINJA_MARKERS = ('{{', '{%', '{#')
+
+# Parsed templates are cached next to the YAML files, keyed on their
+# names, mtimes and sizes
+TEMPLATE_CACHE_PREFIX = ".cache_"
+
+
+@dataclass(slots=True)
+class Issue:
+    """Normalized issue as it moves through the remediation pipeline"""
+    id: str
+    type: str
+    severity: str = 'medium'
+    confidence: float = 0.5
+    location: Dict[str, Any] = field(default_factory=dict)
+    evidence: Dict[str, Any] = field(default_factory=dict)
+    remediation: Dict[str, Any] = field(default_factory=dict)
 
 
 class RemediationGenerator:
     """Generate remediated documents from issues and templates"""
     
+    # First quoted term in an evidence snippet
+    _QUOTED_TERM_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+    
     def __init__(self, templates_dir: str = "templates/remediation",
                  output_dir: str = "docs/generated"):
         self.templates_dir = Path(templates_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Compiled template bytecode persists across runs in a per-user
+        # temporary directory, keyed on template name and source
+        bytecode_cache = FileSystemBytecodeCache()
+        
         # Setup Jinja2 environment
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(self.templates_dir)),
+            bytecode_cache=bytecode_cache,
             trim_blocks=True,
             lstrip_blocks=True
         )
         
+        # Remediation patterns are compiled once per (template_id, pattern)
+        # with default settings, as jinja2.Template(pattern) did. They are
+        # served through a loader so the bytecode cache applies to them.
+        self._pattern_env = Environment(
+            loader=FunctionLoader(self._pattern_source),
+            bytecode_cache=bytecode_cache
+        )
+        self._compiled_patterns: Dict[tuple, Any] = {}
+        
         # Load templates
         self.templates = self._load_templates()
     
-    def generate_remediation(self, doc_id: str, issues_file: str,
-                           original_content_file: str) -> Dict[str, Any]:
+    async def generate_remediation(self, doc_id: str, issues_file: str,
+                                 original_content_file: str) -> Dict[str, Any]:
         """
         Generate remediated document from issues
         
@@ -48,11 +111,11 @@ class RemediationGenerator:
         Returns:
             Generation result with paths and statistics
         """
-        # Load issues
-        issues = self._load_issues(issues_file)
-        
-        # Load original content
-        original_content = self._load_original_content(original_content_file)
+        # Load issues and original content concurrently
+        issues, original_content = await asyncio.gather(
+            asyncio.to_thread(self._load_issues, issues_file),
+            asyncio.to_thread(self._load_original_content, original_content_file)
+        )
         
         # Create run ID
         run_id = self._create_run_id()
@@ -70,7 +133,7 @@ class RemediationGenerator:
         validation_report = self._validate_document(remediated_doc, issues)
         
         # Save outputs
-        output_paths = self._save_outputs(
+        output_paths = await self._save_outputs(
             doc_id, run_id, remediated_doc, 
             pipeline_result, validation_report
         )
@@ -87,27 +150,74 @@ class RemediationGenerator:
         }
     
     def _load_templates(self) -> Dict[str, Dict]:
-        """Load all remediation templates"""
-        templates = {}
+        """
+        Load all remediation templates
+        Reuses the pickled result of an earlier parse while no template file
+        has been added, removed or modified
+        """
+        template_files = list(self.templates_dir.glob("*.yaml"))
+        fingerprint = sorted(
+            (path.name, stat.st_mtime_ns, stat.st_size)
+            for path, stat in ((path, path.stat()) for path in template_files)
+        )
+        key = hashlib.blake2b(repr(fingerprint).encode(), digest_size=16).hexdigest()
+        cache_file = self.templates_dir / f"{TEMPLATE_CACHE_PREFIX}{key}.pkl"
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: ignoring unreadable template cache {cache_file}: {e}", file=sys.stderr)
+        
+        templates = self._parse_templates(template_files)
+        self._write_template_cache(cache_file, templates)
+        return templates
+    
+    def _parse_templates(self, template_files: List[Path]) -> Dict[str, Dict]:
+        """Parse remediation templates from YAML"""
+        def parse(template_file: Path) -> Dict:
+            # Hand libyaml the whole file as one buffer
+            return yaml.load(template_file.read_bytes(), Loader=_YAML_LOADER)
+        
+        if len(template_files) >= TEMPLATE_PARALLEL_MIN_FILES:
+            # Overlap the file reads; map keeps the files in glob order
+            workers = min(TEMPLATE_MAX_WORKERS, len(template_files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(parse, template_files))
+        else:
+            parsed = [parse(template_file) for template_file in template_files]
         
-        for template_file in self.templates_dir.glob("*.yaml"):
-            with open(template_file) as f:
-                template_data = yaml.safe_load(f)
-                template_id = template_data['template']['id']
-                templates[template_id] = template_data['template']
+        templates = {}
+        for template_data in parsed:
+            template_id = template_data['template']['id']
+            templates[template_id] = template_data['template']
         
         return templates
     
+    def _write_template_cache(self, cache_file: Path, templates: Dict[str, Dict]):
+        """Atomically write the template cache and drop caches of older template sets"""
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(templates, f, protocol=5)
+            os.replace(tmp_file, cache_file)
+            for stale in self.templates_dir.glob(f"{TEMPLATE_CACHE_PREFIX}*.pkl"):
+                if stale != cache_file:
+                    stale.unlink(missing_ok=True)
+        except OSError:
+            # Read-only template directories just skip caching
+            tmp_file.unlink(missing_ok=True)
+    
     def _load_issues(self, issues_file: str) -> List[Dict]:
         """Load issues from file"""
         issues_path = Path(issues_file)
         
         if issues_path.suffix == '.yaml':
-            with open(issues_path) as f:
-                data = yaml.safe_load(f)
+            data = yaml.load(issues_path.read_bytes(), Loader=_YAML_LOADER)
         else:
-            with open(issues_path) as f:
-                data = json.load(f)
+            data = _load_json(issues_path.read_bytes())
         
         return data.get('issues', [])
     
@@ -117,9 +227,10 @@ class RemediationGenerator:
     
     def _create_run_id(self) -> str:
         """Create unique run ID"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        hash_part = hashlib.sha256(timestamp.encode()).hexdigest()[:8]
-        return f"{timestamp}_{hash_part}"
+        # The timestamp is a human-readable label; uniqueness comes from the
+        # random suffix, so runs started in the same second still differ
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        return f"{timestamp}_{secrets.token_hex(4)}"
     
     def _run_pipeline(self, issues: List[Dict], 
                      original_content: str) -> Dict[str, Any]:
@@ -158,51 +269,56 @@ class RemediationGenerator:
             "statistics": statistics
         }
     
-    def _normalize_issues(self, issues: List[Dict]) -> List[Dict]:
+    def _normalize_issues(self, issues: List[Dict]) -> List[Issue]:
         """Normalize and deduplicate issues"""
         normalized = []
-        seen_hashes = set()
+        seen_keys = set()
         
         for issue in issues:
-            # Create hash for deduplication
-            issue_hash = hashlib.sha256(
-                f"{issue['type']}{issue.get('location', {}).get('ref', '')}"
-                .encode()
-            ).hexdigest()[:16]
+            # Deduplicate on (type, location ref); dict refs are keyed by
+            # their repr since dicts are not hashable
+            ref = issue.get('location', {}).get('ref', '')
+            key = (issue['type'], ref if isinstance(ref, str) else repr(ref))
             
-            if issue_hash in seen_hashes:
+            if key in seen_keys:
                 continue
             
-            seen_hashes.add(issue_hash)
+            seen_keys.add(key)
             
-            # Normalize structure
-            normalized_issue = {
-                "id": issue.get('id', issue_hash),
-                "type": issue['type'],
-                "severity": issue.get('severity', 'medium'),
-                "confidence": issue.get('confidence', 0.5),
-                "location": issue.get('location', {}),
-                "evidence": issue.get('evidence', {}),
-                "remediation": issue.get('remediation', {})
-            }
+            # Normalize structure; type and severity take a handful of values
+            # and key dict lookups downstream, so share one interned string each
+            normalized_issue = Issue(
+                id=issue['id'] if 'id' in issue else self._issue_hash(issue['type'], ref),
+                type=_intern(issue['type']),
+                severity=_intern(issue.get('severity', 'medium')),
+                confidence=issue.get('confidence', 0.5),
+                location=issue.get('location', {}),
+                evidence=issue.get('evidence', {}),
+                remediation=issue.get('remediation', {})
+            )
             
             normalized.append(normalized_issue)
         
         return normalized
     
-    def _categorize_issues(self, issues: List[Dict]) -> Dict[str, List[Dict]]:
+    def _issue_hash(self, issue_type: str, ref: Any) -> str:
+        """
+        Generated ID for an issue without one, derived from its type and location
+        A 64-bit BLAKE2b digest needs no truncation and is cheaper than SHA-256
+        on these short keys
+        """
+        return hashlib.blake2b(f"{issue_type}{ref}".encode(), digest_size=8).hexdigest()
+    
+    def _categorize_issues(self, issues: List[Issue]) -> Dict[str, List[Issue]]:
         """Group issues by type"""
-        categorized = {}
+        categorized = defaultdict(list)
         
         for issue in issues:
-            issue_type = issue['type']
-            if issue_type not in categorized:
-                categorized[issue_type] = []
-            categorized[issue_type].append(issue)
+            categorized[issue.type].append(issue)
         
-        return categorized
+        return dict(categorized)
     
-    def _prioritize_issues(self, categorized: Dict[str, List[Dict]]) -> List[Dict]:
+    def _prioritize_issues(self, categorized: Dict[str, List[Issue]]) -> List[Issue]:
         """Sort issues by priority"""
         severity_scores = {
             'critical': 1000,
@@ -215,24 +331,28 @@ class RemediationGenerator:
         for issues_list in categorized.values():
             all_issues.extend(issues_list)
         
-        # Sort by severity and confidence
+        if len(all_issues) < 2:
+            return all_issues
+        
+        # Sort by severity and confidence; list.sort evaluates the key once
+        # per issue, not per comparison
         all_issues.sort(
             key=lambda x: (
-                severity_scores.get(x['severity'], 1) * x['confidence'],
-                x['confidence']
+                severity_scores.get(x.severity, 1) * x.confidence,
+                x.confidence
             ),
             reverse=True
         )
         
         return all_issues
     
-    def _select_templates(self, issues: List[Dict]) -> List[Dict]:
+    def _select_templates(self, issues: List[Issue]) -> List[Dict]:
         """Match issues to templates"""
         assignments = []
         
         for issue in issues:
             # Get suggested template from issue
-            suggested_template = issue.get('remediation', {}).get('template_id')
+            suggested_template = issue.remediation.get('template_id')
             
             # Find matching template
             template_id = suggested_template
@@ -250,7 +370,7 @@ class RemediationGenerator:
         
         return assignments
     
-    def _auto_select_template(self, issue: Dict) -> Optional[str]:
+    def _auto_select_template(self, issue: Issue) -> Optional[str]:
         """Automatically select template based on issue type"""
         type_to_template = {
             'clarity': 'define-term',
@@ -260,9 +380,9 @@ class RemediationGenerator:
             'consistency': 'define-term'
         }
         
-        return type_to_template.get(issue['type'])
+        return type_to_template.get(issue.type)
     
-    def _extract_parameters(self, issue: Dict, template: Dict) -> Dict:
+    def _extract_parameters(self, issue: Issue, template: Dict) -> Dict:
         """Extract parameters for template from issue"""
         params = {}
         
@@ -270,8 +390,8 @@ class RemediationGenerator:
         required_inputs = template.get('inputs', {}).get('required', {})
         
         # Extract from issue evidence and remediation
-        evidence = issue.get('evidence', {})
-        remediation = issue.get('remediation', {})
+        evidence = issue.evidence
+        remediation = issue.remediation
         
         # Map common parameters
         if 'term' in required_inputs:
@@ -279,7 +399,7 @@ class RemediationGenerator:
             snippets = evidence.get('snippets', [])
             if snippets:
                 # Simple extraction - find quoted or capitalized terms
-                term_match = re.search(r"['\"]([^'\"]+)['\"]", snippets[0])
+                term_match = self._QUOTED_TERM_RE.search(snippets[0])
                 if term_match:
                     params['term'] = term_match.group(1)
         
@@ -292,11 +412,11 @@ class RemediationGenerator:
         if 'section_title' in required_inputs:
             params['section_title'] = remediation.get('parameters', {}).get(
                 'section_title',
-                f"New Section for {issue['type']}"
+                f"New Section for {issue.type}"
             )
         
         if 'context_section' in required_inputs:
-            location = issue.get('location', {})
+            location = issue.location
             params['context_section'] = location.get('ref', {}).get('path', '/')
         
         # Merge with provided parameters
@@ -316,36 +436,57 @@ class RemediationGenerator:
             
             # Select pattern based on logic
             pattern_name = self._select_pattern(template, issue)
-            pattern = template['generation']['patterns'].get(
-                pattern_name,
-                list(template['generation']['patterns'].values())[0]
-            )
+            key = (assignment['template_id'], pattern_name)
+            compiled = self._compiled_patterns.get(key)
+            if compiled is None:
+                compiled = self._compile_pattern('/'.join(key))
+                self._compiled_patterns[key] = compiled
             
             # Render template
-            jinja_template = Template(pattern)
-            rendered_content = jinja_template.render(**params)
+            if isinstance(compiled, str):
+                rendered_content = compiled
+            else:
+                rendered_content = compiled.render(**params)
             
             remediations.append({
-                "issue_id": issue['id'],
+                "issue_id": issue.id,
                 "template_id": assignment['template_id'],
                 "method": template['generation']['method'],
                 "content": rendered_content,
-                "location": issue.get('location', {}),
+                "location": issue.location,
                 "validation_required": template.get('validators', [])
             })
         
         return remediations
     
-    def _select_pattern(self, template: Dict, issue: Dict) -> str:
+    def _compile_pattern(self, name: str) -> Any:
+        """
+        Compile a remediation pattern, or return its rendered text directly
+        when it has no Jinja syntax. Jinja renders such a pattern verbatim
+        apart from dropping one trailing newline, whatever the parameters;
+        the single-brace placeholders the templates use are plain text to it.
+        """
+        source = self._pattern_source(name)
+        if '\r' in source or any(marker in source for marker in JINJA_MARKERS):
+            return self._pattern_env.get_template(name)
+        return source[:-1] if source.endswith('\n') else source
+    
+    def _pattern_source(self, name: str) -> str:
+        """Source of a remediation pattern named 'template_id/pattern_name'"""
+        template_id, _, pattern_name = name.rpartition('/')
+        patterns = self.templates[template_id]['generation']['patterns']
+        return patterns.get(pattern_name, list(patterns.values())[0])
+    
+    def _select_pattern(self, template: Dict, issue: Issue) -> str:
         """Select which pattern to use from template"""
         # Execute selection logic if provided
         selection_logic = template['generation'].get('selection_logic')
         
         if selection_logic:
             # Simple pattern matching for now
-            if 'glossary' in str(issue.get('location', {})):
+            if 'glossary' in str(issue.location):
                 return 'glossary_entry'
-            elif issue['severity'] == 'low':
+            elif issue.severity == 'low':
                 return 'inline_definition'
             else:
                 return 'detailed_definition'
@@ -356,7 +497,8 @@ class RemediationGenerator:
     def _generate_document(self, original_content: str,
                          remediations: List[Dict]) -> str:
         """Apply remediations to generate new document"""
-        lines = original_content.split('\n')
+        # Line count as split('\n') sees it; inserts are clamped to it
+        line_count = original_content.count('\n') + 1
         
         # Group remediations by method
         inserts = []
@@ -368,32 +510,65 @@ class RemediationGenerator:
             elif remediation['method'] in ['rewrite', 'replace']:
                 rewrites.append(remediation)
         
-        # Apply inserts (in reverse order to preserve line numbers)
-        for remediation in sorted(inserts, 
-                                 key=lambda x: x.get('location', {})
-                                 .get('ref', {}).get('line_range', [0])[0],
-                                 reverse=True):
+        # Sort inserts by line once. Inserts sharing a line keep the order
+        # the old reverse-order list inserts produced.
+        placed = []
+        past_end = []
+        for order, remediation in enumerate(inserts):
             location = remediation.get('location', {})
             line_range = location.get('ref', {}).get('line_range', [0, 0])
             
-            if line_range[0] > 0:
-                insert_point = min(line_range[0], len(lines))
-                lines.insert(insert_point, remediation['content'])
+            if 0 < line_range[0] < line_count:
+                placed.append((line_range[0], -order, remediation['content']))
+            elif line_range[0] >= line_count:
+                past_end.append((-line_range[0], order, remediation['content']))
+        placed.sort()
+        
+        # Inserts at or past the last line were clamped to the length of the
+        # growing list, highest line first; replay that on the tail alone
+        tail = []
+        for neg_line, _, content in sorted(past_end):
+            tail.insert(min(-neg_line - line_count, len(tail)), content)
+        
+        # Stream the original lines (split on '\n' only, ends kept) into
+        # the output, writing each insert ahead of the line it precedes
+        output = io.StringIO()
+        pending = iter(placed)
+        nxt = next(pending, None)
+        for line_number, line in enumerate(io.StringIO(original_content)):
+            while nxt is not None and nxt[0] == line_number:
+                output.write(nxt[2])
+                output.write('\n')
+                nxt = next(pending, None)
+            output.write(line)
+        
+        # Before a trailing empty line, which iteration never yields
+        while nxt is not None:
+            output.write(nxt[2])
+            output.write('\n')
+            nxt = next(pending, None)
         
         # Apply rewrites
         for remediation in rewrites:
             # Simple append for now - more sophisticated merging needed
-            lines.append('\n' + remediation['content'])
+            tail.append('\n' + remediation['content'])
         
-        return '\n'.join(lines)
+        # Inserts after the final line and rewrites follow the last line,
+        # which has no newline of its own
+        for content in tail:
+            output.write('\n')
+            output.write(content)
+        
+        return output.getvalue()
     
     def _validate_document(self, document: str, issues: List[Dict]) -> Dict:
         """Validate the generated document"""
         validation_results = []
+        scan = self._scan_document(document, issues)
         
         # Check if issues are addressed
         for issue in issues:
-            addressed = self._check_issue_addressed(document, issue)
+            addressed = self._check_issue_addressed(document, issue, scan)
             validation_results.append({
                 "issue_id": issue.get('id'),
                 "addressed": addressed,
@@ -408,10 +583,12 @@ class RemediationGenerator:
             'low': 1
         }
         
-        total_weight = sum(severity_weights.get(r['severity'], 1) 
-                          for r in validation_results)
-        addressed_weight = sum(severity_weights.get(r['severity'], 1)
-                              for r in validation_results if r['addressed'])
+        # Look up each result's weight once for both sums
+        weight_of = severity_weights.get
+        weights = [weight_of(r['severity'], 1) for r in validation_results]
+        total_weight = sum(weights)
+        addressed_weight = sum(weight for weight, r in zip(weights, validation_results)
+                               if r['addressed'])
         
         score = (addressed_weight / total_weight * 100) if total_weight > 0 else 0
         
@@ -424,55 +601,94 @@ class RemediationGenerator:
                                       and not r['addressed'])
         }
     
-    def _check_issue_addressed(self, document: str, issue: Dict) -> bool:
-        """Check if an issue has been addressed in the document"""
+    def _scan_document(self, document: str, issues: List[Dict]) -> Dict[str, Any]:
+        """
+        Find which clarity terms are defined, which completeness section
+        titles are present and whether structure markers exist, with one pass
+        over the document for each kind instead of one search per issue
+        """
+        terms = set()
+        titles = set()
+        has_structure_issue = False
+        for issue in issues:
+            if issue['type'] == 'clarity':
+                term = self._clarity_term(issue)
+                if term:
+                    terms.add(term)
+            elif issue['type'] == 'completeness':
+                section_title = self._section_title(issue)
+                if section_title:
+                    titles.add(section_title.lower())
+            elif issue['type'] == 'structure':
+                has_structure_issue = True
+        
+        return {
+            # A term counts as defined when a parenthesized definition follows it
+            "defined_terms": _find_terms(terms, document, r"[^\n]*?\([^\n]*?\)", re.IGNORECASE),
+            "section_titles": _find_terms(titles, document.lower()) if titles else set(),
+            "structure_markers": has_structure_issue and (
+                '## Table of Contents' in document or '### ' in document
+            )
+        }
+    
+    def _clarity_term(self, issue: Dict) -> Optional[str]:
+        """First quoted term in a clarity issue's evidence"""
+        evidence = issue.get('evidence', {}).get('snippets', [])
+        if evidence:
+            term = self._QUOTED_TERM_RE.search(evidence[0])
+            if term:
+                return term.group(1)
+        return None
+    
+    def _section_title(self, issue: Dict) -> str:
+        """Section title a completeness issue asks to add"""
+        return issue.get('remediation', {}).get('parameters', {}).get('section_title', '')
+    
+    def _check_issue_addressed(self, document: str, issue: Dict,
+                               scan: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Check if an issue has been addressed in the document
+        scan is the _scan_document result for a batch of issues including this one
+        """
         # Simple checks - can be made more sophisticated
+        if scan is None:
+            scan = self._scan_document(document, [issue])
         
         if issue['type'] == 'clarity':
             # Check if term is now defined
-            evidence = issue.get('evidence', {}).get('snippets', [])
-            if evidence:
-                term = re.search(r"['\"]([^'\"]+)['\"]", evidence[0])
-                if term:
-                    # Check if term has definition nearby
-                    pattern = f"{term.group(1)}.*?\\(.*?\\)"
-                    return bool(re.search(pattern, document, re.IGNORECASE))
+            term = self._clarity_term(issue)
+            if term:
+                return term in scan["defined_terms"]
         
         elif issue['type'] == 'completeness':
             # Check if section was added
-            section_title = issue.get('remediation', {}).get('parameters', {})\
-                                .get('section_title', '')
+            section_title = self._section_title(issue)
             if section_title:
-                return section_title.lower() in document.lower()
+                return section_title.lower() in scan["section_titles"]
         
         elif issue['type'] == 'structure':
             # Check if structure markers present
-            return '## Table of Contents' in document or '### ' in document
+            return scan["structure_markers"]
         
         # Default: assume addressed if remediation was generated
         return True
     
-    def _save_outputs(self, doc_id: str, run_id: str,
-                     remediated_doc: str, pipeline_result: Dict,
-                     validation_report: Dict) -> Dict[str, str]:
-        """Save all outputs"""
+    async def _save_outputs(self, doc_id: str, run_id: str,
+                            remediated_doc: str, pipeline_result: Dict,
+                            validation_report: Dict) -> Dict[str, str]:
+        """
+        Save all outputs, writing the files concurrently
+        Text outputs are encoded up front and written in binary mode, which
+        skips the text I/O layer's chunked encoding
+        """
         # Create output directory
         output_dir = self.output_dir / doc_id / run_id
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save remediated document
         doc_file = output_dir / "remediated_document.md"
-        doc_file.write_text(remediated_doc, encoding='utf-8')
-        
-        # Save pipeline results
         pipeline_file = output_dir / "pipeline_results.json"
-        with open(pipeline_file, 'w') as f:
-            json.dump(pipeline_result, f, indent=2)
-        
-        # Save validation report
         validation_file = output_dir / "validation_report.json"
-        with open(validation_file, 'w') as f:
-            json.dump(validation_report, f, indent=2)
+        summary_file = output_dir / "summary.yaml"
         
         # Create summary
         summary = {
@@ -485,9 +701,20 @@ class RemediationGenerator:
             "validation_passed": validation_report['passed']
         }
         
-        summary_file = output_dir / "summary.yaml"
-        with open(summary_file, 'w') as f:
-            yaml.dump(summary, f, default_flow_style=False)
+        await asyncio.gather(
+            # Remediated document
+            asyncio.to_thread(doc_file.write_bytes, remediated_doc.encode('utf-8')),
+            # Pipeline results
+            asyncio.to_thread(pipeline_file.write_bytes, _dump_json(pipeline_result)),
+            # Validation report
+            asyncio.to_thread(validation_file.write_bytes, _dump_json(validation_report)),
+            # Summary
+            asyncio.to_thread(
+                summary_file.write_bytes,
+                yaml.dump(summary, Dumper=_YAML_DUMPER, default_flow_style=False,
+                          encoding='utf-8')
+            )
+        )
         
         return {
             "document": str(doc_file),
@@ -497,6 +724,52 @@ class RemediationGenerator:
         }
 
 
+def _dump_json(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes, via orjson when installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _load_json(data: bytes) -> Any:
+    """Parse JSON bytes, via orjson when installed"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _find_terms(terms: Iterable[str], text: str, suffix: str = "", flags: int = 0) -> Set[str]:
+    """
+    Return the terms occurring in text (followed by a match of suffix) in one
+    regex pass. The alternation sits in a lookahead so every start position is
+    tried; terms are tried longest first, and a match also accounts for the
+    shorter terms that are prefixes of the matched one.
+    """
+    terms = set(terms)
+    if not terms:
+        return set()
+    
+    fold = str.lower if flags & re.IGNORECASE else str
+    ordered = sorted(terms, key=len, reverse=True)
+    regex = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + ")" + suffix + ")", flags)
+    
+    prefixes = {}
+    for term in ordered:
+        prefixes.setdefault(fold(term), set()).update(
+            other for other in terms
+            if fold(term).startswith(fold(other))
+            # A line-bound suffix after the shorter term must not cross a newline
+            and not (suffix and '\n' in term[len(other):])
+        )
+    
+    found = set()
+    for match in regex.finditer(text):
+        found |= prefixes.get(fold(match.group(1)), set())
+        if len(found) == len(terms):
+            break
+    return found
+
+
 def main():
     """CLI interface for remediation generation"""
     parser = argparse.ArgumentParser(
@@ -521,11 +794,11 @@ def main():
     )
     
     try:
-        result = generator.generate_remediation(
+        result = asyncio.run(generator.generate_remediation(
             args.doc_id,
             args.issues_file,
             args.content_file
-        )
+        ))
         
         if args.verbose:
             print(f"Remediation generation complete!")
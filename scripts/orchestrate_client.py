@@ -6,15 +6,25 @@ Provides a clean interface for document orchestration workflows
 
 import argparse
 import asyncio
+import functools
+import io
 import json
 import logging
+import random
 import sys
 import time
+import weakref
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import aiohttp
-import requests
-from datetime import datetime
+from yarl import URL
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Configure logging
 logging.basicConfig(
@@ -23,28 +33,231 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by all requests of a client. Requests go to a single
+# API host, so most of the pool may serve it; idle connections are kept long
+# enough to carry a run from upload through status polling.
+POOL_LIMIT = 64
+POOL_LIMIT_PER_HOST = 32
+KEEPALIVE_TIMEOUT = 75
+DNS_CACHE_TTL = 300
+
+# Connect fast-fails; reads stay generous because analyze/remediate answer
+# only once the agents finish. No overall cap, wait_for_completion has its own.
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 300
+
+# Status polling backs off geometrically while a run shows no progress
+POLL_BACKOFF = 1.7
+
+# Documents processed at once by process_documents; stays below the per-host
+# pool limit so status streams never wait for a connection
+BATCH_CONCURRENCY = 16
+
+# Transient failures are retried with full-jitter exponential backoff:
+# attempt n waits a random 0..min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**n)
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 8.0
+
+# Responses rejecting a request before it was processed, safe to resend
+RETRY_STATUSES = (429, 503)
+
+# Failures before a request reached the server; any request may be resent
+CONNECT_ERRORS = (aiohttp.ClientConnectorError,)
+
+# Failures that may follow a sent request; only idempotent requests are resent
+TRANSIENT_ERRORS = CONNECT_ERRORS + (aiohttp.ServerDisconnectedError, asyncio.TimeoutError)
+
+# Responses meaning the server has no batch orchestration endpoint
+NO_BATCH_STATUSES = (404, 405)
+
+# Orchestration statuses after which a run no longer changes
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Responses meaning the server has no status event stream, so the client
+# falls back to polling
+NO_EVENT_STREAM_STATUSES = (404, 405, 406)
+
+# Orchestration defaults; tuples serialize as JSON arrays, so payloads
+# reference them instead of building fresh lists per request
+DEFAULT_AGENTS = (
+    "general-purpose",
+    "technical-writer",
+    "security-engineer",
+    "quality-engineer",
+    "requirements-analyst"
+)
+DEFAULT_MODELS = ("gpt-5", "claude-opus-4.1", "gpt-4.1")
+
+# Request bodies are sent as pre-encoded JSON bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _dump_json(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize to JSON bytes, via orjson when installed
+    
+    Pretty output is indented and falls back to str() for values JSON
+    cannot represent, for display rather than requests
+    """
+    if pretty:
+        if HAS_ORJSON:
+            return orjson.dumps(obj, default=str,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, indent=2, default=str).encode('utf-8')
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def _load_json(data: bytes) -> Any:
+    """Parse JSON bytes, via orjson when installed"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Read and parse a JSON response body"""
+    return _load_json(await response.read())
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create a session with the client's connection pool and timeouts"""
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        enable_cleanup_closed=True
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None,
+        connect=CONNECT_TIMEOUT,
+        sock_read=READ_TIMEOUT
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+# Shared sessions by event loop; a session cannot outlive the loop it was
+# created on, so each asyncio.run() gets its own
+_default_sessions = weakref.WeakKeyDictionary()
+
+def get_default_session() -> aiohttp.ClientSession:
+    """
+    Get the session shared by clients on the running event loop
+    
+    Clients given this session reuse its pooled connections across their
+    lifetimes and leave it open; close it with the loop when done.
+    """
+    loop = asyncio.get_running_loop()
+    session = _default_sessions.get(loop)
+    if session is None or session.closed:
+        session = _default_sessions[loop] = _create_session()
+    return session
+
 class OrchestrationClient:
     """Client for DocAutomate orchestration API"""
     
-    def __init__(self, api_url: str = "http://localhost:8001"):
+    # Endpoint paths, relative to the API URL
+    _UPLOAD = "/documents/upload"
+    _ORCH = "/orchestrate/workflow"
+    _ORCH_BATCH = "/orchestrate/workflow:batch"
+    _RUN = "/orchestrate/runs/{}"
+    _RUN_EVENTS = "/orchestrate/runs/{}/events"
+    _DOC = "/documents/{}"
+    _ANALYZE = "/documents/{}/analyze"
+    _REMEDIATE = "/documents/{}/remediate"
+    
+    def __init__(self, api_url: str = "http://localhost:8001",
+                 session: Optional[aiohttp.ClientSession] = None):
         """
         Initialize orchestration client
         
         Args:
             api_url: Base URL for DocAutomate API
+            session: Existing session to share; it is left open on exit.
+                     A private session is created when omitted.
         """
         self.api_url = api_url.rstrip('/')
-        self.session = None
+        self.session = session
+        self._owns_session = session is None
+        self._warmup = None
         
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = _create_session()
+            # A fresh pool has no connections; open one in the background so
+            # DNS and connection setup overlap preparing the first request
+            self._warmup = asyncio.create_task(self._warm_up())
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        if self._warmup:
+            self._warmup.cancel()
+            await asyncio.gather(self._warmup, return_exceptions=True)
+            self._warmup = None
+        if self.session and self._owns_session:
             await self.session.close()
+            self.session = None
+    
+    async def _warm_up(self):
+        """Send a HEAD request to leave a kept-alive connection in the pool"""
+        try:
+            async with self.session.head(self._url(""), allow_redirects=False):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # The first real request reports connection problems
+            logger.debug(f"Connection warm-up failed: {e!r}")
+    
+    def _url(self, path: str, *args: str) -> URL:
+        """
+        Build a parsed endpoint URL
+        
+        aiohttp parses string URLs on every request but uses URL objects
+        as given, so loops build theirs once and reuse it
+        """
+        return URL(self.api_url + path.format(*args))
+    
+    @asynccontextmanager
+    async def _request(
+        self,
+        method: str,
+        url: URL,
+        idempotent: Optional[bool] = None,
+        data: Any = None,
+        **kwargs
+    ):
+        """
+        Send a request, retrying transient failures, and yield the response
+        
+        GETs are idempotent unless stated otherwise and are resent after
+        connection errors, disconnects and timeouts; other requests only
+        after failing to connect. Any request is resent on 429/503. When
+        data is callable it is called for a fresh body on every attempt.
+        """
+        if idempotent is None:
+            idempotent = method == "GET"
+        retry_errors = TRANSIENT_ERRORS if idempotent else CONNECT_ERRORS
+        
+        for attempt in range(RETRY_ATTEMPTS):
+            last_attempt = attempt == RETRY_ATTEMPTS - 1
+            try:
+                response = await self.session.request(
+                    method, url, data=data() if callable(data) else data, **kwargs
+                )
+            except retry_errors as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"{method} {url} failed ({e!r}), retrying")
+            else:
+                if response.status not in RETRY_STATUSES or last_attempt:
+                    try:
+                        yield response
+                    finally:
+                        response.release()
+                    return
+                response.release()
+                logger.warning(f"{method} {url} returned {response.status}, retrying")
+            
+            await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
     
     async def upload_document(self, file_path: str, auto_process: bool = True) -> str:
         """
@@ -58,22 +271,34 @@ class OrchestrationClient:
             Document ID
         """
         file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"Document not found: {file_path}")
+        try:
+            f = open(file_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Document not found: {file_path}") from None
         
         logger.info(f"Uploading document: {file_path}")
         
-        with open(file_path, 'rb') as f:
+        # aiohttp streams file parts from disk in 64 KiB chunks read on its
+        # executor, with a Content-Length taken from the file size, so the
+        # document is never held in memory or read on the event loop
+        def form():
+            # Sending consumes a form, and older aiohttp closes the file once
+            # sent, so every attempt rebuilds it from a rewound or reopened file
+            nonlocal f
+            if f.closed:
+                f = open(file_path, 'rb')
+            f.seek(0)
             data = aiohttp.FormData()
             data.add_field('file', f, filename=file_path.name)
             data.add_field('auto_process', str(auto_process).lower())
-            
-            async with self.session.post(
-                f"{self.api_url}/documents/upload",
-                data=data
-            ) as response:
+            return data
+        
+        try:
+            async with self._request("POST", self._url(self._UPLOAD), data=form) as response:
                 response.raise_for_status()
-                result = await response.json()
+                result = await _read_json(response)
+        finally:
+            f.close()
                 
         document_id = result.get('document_id')
         logger.info(f"Document uploaded: {document_id}")
@@ -102,72 +327,225 @@ class OrchestrationClient:
         """
         logger.info(f"Starting orchestration for document {document_id}")
         
-        payload = {
-            "document_id": document_id,
-            "workflow_type": workflow_type,
-            "agents": agents or [
-                "general-purpose",
-                "technical-writer",
-                "security-engineer",
-                "quality-engineer",
-                "requirements-analyst"
-            ],
-            "models": models or ["gpt-5", "claude-opus-4.1", "gpt-4.1"],
-            "config": config or {}
-        }
+        payload = self._orchestration_payload(document_id, workflow_type, agents, models, config)
         
-        async with self.session.post(
-            f"{self.api_url}/orchestrate/workflow",
-            json=payload
+        async with self._request(
+            "POST",
+            self._url(self._ORCH),
+            data=_dump_json(payload),
+            headers=JSON_HEADERS
         ) as response:
             response.raise_for_status()
-            result = await response.json()
+            result = await _read_json(response)
         
         orchestration_id = result.get('orchestration_id')
         logger.info(f"Orchestration started: {orchestration_id}")
         return orchestration_id
     
+    async def orchestrate_batch(
+        self,
+        document_ids: List[str],
+        workflow_type: str = "full",
+        agents: Optional[List[str]] = None,
+        models: Optional[List[str]] = None,
+        config: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Start orchestration workflows for several documents in one request
+        
+        Falls back to one request per document against servers without the
+        batch endpoint.
+        
+        Args:
+            document_ids: Document IDs
+            workflow_type: Type of workflow (full, analysis_only, remediation_only)
+            agents: List of agents to use
+            models: List of models for consensus
+            config: Additional configuration
+            
+        Returns:
+            Orchestration IDs in the same order as document_ids
+        """
+        if not document_ids:
+            return []
+        
+        logger.info(f"Starting batch orchestration for {len(document_ids)} documents")
+        
+        payload = [
+            self._orchestration_payload(document_id, workflow_type, agents, models, config)
+            for document_id in document_ids
+        ]
+        
+        async with self._request(
+            "POST",
+            self._url(self._ORCH_BATCH),
+            data=_dump_json(payload),
+            headers=JSON_HEADERS
+        ) as response:
+            if response.status in NO_BATCH_STATUSES:
+                result = None
+            else:
+                response.raise_for_status()
+                result = await _read_json(response)
+        
+        if result is None:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self.orchestrate(document_id, workflow_type, agents, models, config))
+                    for document_id in document_ids
+                ]
+            return [task.result() for task in tasks]
+        
+        orchestration_ids = [item.get('orchestration_id') for item in result]
+        logger.info(f"Batch orchestration started: {', '.join(orchestration_ids)}")
+        return orchestration_ids
+    
+    def _orchestration_payload(
+        self,
+        document_id: str,
+        workflow_type: str,
+        agents: Optional[List[str]],
+        models: Optional[List[str]],
+        config: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Request body starting one orchestration workflow"""
+        return {
+            "document_id": document_id,
+            "workflow_type": workflow_type,
+            "agents": agents or DEFAULT_AGENTS,
+            "models": models or DEFAULT_MODELS,
+            "config": config or {}
+        }
+    
     async def wait_for_completion(
         self,
         orchestration_id: str,
         timeout: int = 300,
-        poll_interval: int = 5
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0
     ) -> Dict[str, Any]:
         """
         Wait for orchestration to complete
         
+        Follows the run's server-sent status events. Against servers without
+        the event stream, polls densely at first and backs off exponentially
+        up to max_poll_interval; the interval resets whenever the run's
+        status or current step changes.
+        
         Args:
             orchestration_id: Orchestration ID
             timeout: Maximum wait time in seconds
-            poll_interval: Polling interval in seconds
+            poll_interval: Initial polling interval in seconds
+            max_poll_interval: Longest polling interval in seconds
             
         Returns:
             Final orchestration status
         """
         logger.info(f"Waiting for orchestration {orchestration_id} to complete...")
         
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        status = await self._stream_status(orchestration_id, deadline)
+        if status is None:
+            status = await self._poll_status(
+                orchestration_id, deadline, poll_interval, max_poll_interval
+            )
+        if status is None:
+            raise TimeoutError(f"Orchestration timed out after {timeout} seconds")
+        
+        if status.get('status') == 'completed':
+            logger.info("Orchestration completed successfully")
+        else:
+            logger.error("Orchestration failed")
+        return status
+    
+    async def _stream_status(
+        self,
+        orchestration_id: str,
+        deadline: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Follow the run's status event stream until a terminal status
         
-        while time.time() - start_time < timeout:
-            async with self.session.get(
-                f"{self.api_url}/orchestrate/runs/{orchestration_id}"
+        Returns None when the server has no event stream, the stream ends
+        early or drops, or the deadline passes, leaving the rest to polling
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # aiohttp reads a total of 0 as no timeout at all
+            return None
+        timeout = aiohttp.ClientTimeout(
+            total=remaining,
+            connect=CONNECT_TIMEOUT,
+            sock_read=READ_TIMEOUT
+        )
+        try:
+            # Not resent on disconnects or timeouts: the stream's timeout is
+            # the wait deadline, and polling takes over when it ends early
+            async with self._request(
+                "GET",
+                self._url(self._RUN_EVENTS, orchestration_id),
+                idempotent=False,
+                headers={"Accept": "text/event-stream"},
+                timeout=timeout
             ) as response:
+                if response.status in NO_EVENT_STREAM_STATUSES:
+                    return None
                 response.raise_for_status()
-                status = await response.json()
+                if response.content_type != "text/event-stream":
+                    return None
+                
+                # Events are separated by blank lines; status payloads can
+                # outgrow a line buffer, so split the raw chunks ourselves
+                buffer = b""
+                async for chunk in response.content.iter_any():
+                    buffer = (buffer + chunk).replace(b"\r\n", b"\n")
+                    while b"\n\n" in buffer:
+                        event, buffer = buffer.split(b"\n\n", 1)
+                        data = [line[5:].removeprefix(b" ") for line in event.split(b"\n")
+                                if line.startswith(b"data:")]
+                        if not data:
+                            continue
+                        status = _load_json(b"\n".join(data))
+                        if status.get('status') in TERMINAL_STATUSES:
+                            return status
+                        logger.debug(f"Status: {status.get('status')}")
+        except asyncio.TimeoutError:
+            pass
+        except (aiohttp.ClientPayloadError, aiohttp.ServerDisconnectedError) as e:
+            # Proxies and restarting workers cut long-lived streams
+            logger.warning(f"Status event stream dropped, polling instead: {e}")
+        return None
+    
+    async def _poll_status(
+        self,
+        orchestration_id: str,
+        deadline: float,
+        poll_interval: float,
+        max_poll_interval: float
+    ) -> Optional[Dict[str, Any]]:
+        """Poll the run's status until terminal; None once the deadline passes"""
+        url = self._url(self._RUN, orchestration_id)
+        delay = poll_interval
+        last_progress = None
+        
+        while time.monotonic() < deadline:
+            async with self._request("GET", url) as response:
+                response.raise_for_status()
+                status = await _read_json(response)
             
             current_status = status.get('status')
-            
-            if current_status == 'completed':
-                logger.info("Orchestration completed successfully")
+            if current_status in TERMINAL_STATUSES:
                 return status
-            elif current_status == 'failed':
-                logger.error("Orchestration failed")
-                return status
-            else:
-                logger.debug(f"Status: {current_status}, waiting...")
-                await asyncio.sleep(poll_interval)
+            
+            progress = (current_status, status.get('current_step'))
+            if progress != last_progress:
+                delay = poll_interval
+                last_progress = progress
+            logger.debug(f"Status: {current_status}, waiting {delay:.1f}s...")
+            await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * POLL_BACKOFF, max_poll_interval)
         
-        raise TimeoutError(f"Orchestration timed out after {timeout} seconds")
+        return None
     
     async def get_document_status(self, document_id: str) -> Dict[str, Any]:
         """
@@ -179,11 +557,9 @@ class OrchestrationClient:
         Returns:
             Document status and results
         """
-        async with self.session.get(
-            f"{self.api_url}/documents/{document_id}"
-        ) as response:
+        async with self._request("GET", self._url(self._DOC, document_id)) as response:
             response.raise_for_status()
-            return await response.json()
+            return await _read_json(response)
     
     async def analyze_document(
         self,
@@ -210,12 +586,14 @@ class OrchestrationClient:
             "parallel": parallel
         }
         
-        async with self.session.post(
-            f"{self.api_url}/documents/{document_id}/analyze",
-            json=payload
+        async with self._request(
+            "POST",
+            self._url(self._ANALYZE, document_id),
+            data=_dump_json(payload),
+            headers=JSON_HEADERS
         ) as response:
             response.raise_for_status()
-            return await response.json()
+            return await _read_json(response)
     
     async def remediate_document(
         self,
@@ -239,12 +617,14 @@ class OrchestrationClient:
             "issues": issues
         }
         
-        async with self.session.post(
-            f"{self.api_url}/documents/{document_id}/remediate",
-            json=payload
+        async with self._request(
+            "POST",
+            self._url(self._REMEDIATE, document_id),
+            data=_dump_json(payload),
+            headers=JSON_HEADERS
         ) as response:
             response.raise_for_status()
-            return await response.json()
+            return await _read_json(response)
     
     async def process_document(
         self,
@@ -271,6 +651,16 @@ class OrchestrationClient:
         # Start orchestration
         orchestration_id = await self.orchestrate(document_id, workflow_type)
         
+        return await self._collect_results(document_id, orchestration_id, wait, timeout)
+    
+    async def _collect_results(
+        self,
+        document_id: str,
+        orchestration_id: str,
+        wait: bool,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """Wait for an orchestration run if asked and gather its results"""
         if wait:
             # Wait for completion
             status = await self.wait_for_completion(orchestration_id, timeout)
@@ -290,16 +680,72 @@ class OrchestrationClient:
                 "orchestration_id": orchestration_id,
                 "status": "queued"
             }
+    
+    async def process_documents(
+        self,
+        file_paths: List[str],
+        workflow_type: str = "full",
+        wait: bool = True,
+        timeout: int = 300,
+        max_concurrency: int = BATCH_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several documents end to end concurrently
+        
+        Documents are uploaded concurrently, started with a single batch
+        orchestration request, then awaited concurrently.
+        
+        Args:
+            file_paths: Paths to document files
+            workflow_type: Type of workflow
+            wait: Whether to wait for completion
+            timeout: Maximum wait time per document
+            max_concurrency: Maximum documents in flight at once
+            
+        Returns:
+            Processing results in the same order as file_paths
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def upload(file_path: str) -> str:
+            async with semaphore:
+                return await self.upload_document(file_path)
+        
+        async def collect(document_id: str, orchestration_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._collect_results(document_id, orchestration_id, wait, timeout)
+        
+        async with asyncio.TaskGroup() as group:
+            uploads = [group.create_task(upload(file_path)) for file_path in file_paths]
+        document_ids = [task.result() for task in uploads]
+        
+        orchestration_ids = await self.orchestrate_batch(document_ids, workflow_type)
+        
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(collect(document_id, orchestration_id))
+                for document_id, orchestration_id in zip(document_ids, orchestration_ids)
+            ]
+        
+        return [task.result() for task in tasks]
 
-def format_results(results: Dict[str, Any]):
+# Icons for workflow step statuses in the results summary
+STATUS_ICONS = {"completed": "✓", "failed": "✗"}
+
+def format_results(results: Dict[str, Any]) -> str:
     """Format results for display"""
-    print("\n" + "="*60)
-    print("ORCHESTRATION RESULTS")
-    print("="*60)
+    out = io.StringIO()
+    out.write("\n" + "="*60 + "\n")
+    out.write("ORCHESTRATION RESULTS\n")
+    out.write("="*60 + "\n")
     
-    print(f"Document ID: {results.get('document_id')}")
-    print(f"Orchestration ID: {results.get('orchestration_id')}")
-    print(f"Status: {results['status'].get('status', 'unknown')}")
+    out.write(f"Document ID: {results.get('document_id')}\n")
+    out.write(f"Orchestration ID: {results.get('orchestration_id')}\n")
+    # Without waiting, the status is the bare string "queued"
+    status = results.get('status')
+    if isinstance(status, dict):
+        status = status.get('status', 'unknown')
+    out.write(f"Status: {status or 'unknown'}\n")
     
     if 'results' in results:
         doc_results = results['results']
@@ -308,21 +754,22 @@ def format_results(results: Dict[str, Any]):
         if 'metadata' in doc_results and 'orchestration_results' in doc_results['metadata']:
             orch_results = doc_results['metadata']['orchestration_results']
             
-            print(f"\nQuality Score: {orch_results.get('final_quality_score', 'N/A')}%")
+            out.write(f"\nQuality Score: {orch_results.get('final_quality_score', 'N/A')}%\n")
             
             if 'steps' in orch_results:
-                print("\nWorkflow Steps:")
+                out.write("\nWorkflow Steps:\n")
                 for step_name, step_data in orch_results['steps'].items():
                     status = step_data.get('status', 'unknown')
-                    icon = "✓" if status == 'completed' else "✗" if status == 'failed' else "?"
-                    print(f"  [{icon}] {step_name}: {status}")
+                    out.write(f"  [{STATUS_ICONS.get(status, '?')}] {step_name}: {status}\n")
             
-            print(f"\nDuration: {orch_results.get('duration_seconds', 'N/A')} seconds")
+            out.write(f"\nDuration: {orch_results.get('duration_seconds', 'N/A')} seconds\n")
     
-    print("\n" + "="*60)
+    out.write("\n" + "="*60 + "\n")
+    return out.getvalue()
 
-async def main():
-    """Main entry point"""
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser once per process"""
     parser = argparse.ArgumentParser(
         description="DocAutomate Orchestration Client"
     )
@@ -373,28 +820,42 @@ async def main():
         help="Output results as JSON"
     )
     
-    args = parser.parse_args()
+    return parser
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Process the document named on the command line"""
+    async with OrchestrationClient(args.api) as client:
+        return await client.process_document(
+            file_path=args.document,
+            workflow_type=args.type,
+            wait=not args.no_wait,
+            timeout=args.timeout
+        )
+
+def main():
+    """Main entry point"""
+    args = _build_parser().parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    # On Ctrl-C asyncio.run cancels run(), unwinding every pending request
+    # and closing the client's session before KeyboardInterrupt surfaces
     try:
-        async with OrchestrationClient(args.api) as client:
-            results = await client.process_document(
-                file_path=args.document,
-                workflow_type=args.type,
-                wait=not args.no_wait,
-                timeout=args.timeout
-            )
-            
-            if args.json:
-                print(json.dumps(results, indent=2, default=str))
-            else:
-                format_results(results)
-                
+        results = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        logger.error("Interrupted")
+        sys.exit(130)
     except Exception as e:
         logger.error(f"Error: {e}")
         sys.exit(1)
+    
+    # Rendered once the event loop is closed, and written in one call
+    if args.json:
+        output = _dump_json(results, pretty=True).decode('utf-8') + "\n"
+    else:
+        output = format_results(results)
+    sys.stdout.write(output)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
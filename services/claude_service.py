@@ -5,18 +5,37 @@ All document operations delegate to Claude Code agents via SuperClaude Framework
 No local document processing - pure API wrapper for Claude CLI invocations
 """
 
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import os
+import re
+import time
+import weakref
 import yaml
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from pathlib import Path
 import asyncio
 from datetime import datetime
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass
 from enum import Enum
 from jinja2 import Template
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
 # Import claude_cli module
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
@@ -25,7 +44,291 @@ from claude_cli import AsyncClaudeCLI, SuperClaudeMode, SuperClaudeAgent, SuperC
 # Configure logging
 logger = logging.getLogger(__name__)
 
-@dataclass
+# libyaml-backed YAML loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Directory holding the orchestration DSL files
+DSL_DIR = Path(__file__).parent.parent / "dsl"
+
+@functools.lru_cache(maxsize=4)
+def _parse_dsl_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a DSL file once per version of it
+    The modification time is part of the cache key, so edits are picked up;
+    callers share the result and must not modify it
+    """
+    return yaml.load(Path(path).read_bytes(), Loader=_YAML_LOADER)
+
+def _load_dsl_file(path: Path) -> Optional[Dict[str, Any]]:
+    """Load a DSL file through the parse cache; None if it does not exist"""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _parse_dsl_file(str(path), mtime_ns)
+
+@functools.lru_cache(maxsize=None)
+def _shared_cli(timeout: int) -> AsyncClaudeCLI:
+    """
+    One CLI wrapper per timeout, shared by every service instance
+    The wrapper keeps no per-call state, so concurrent services can share it
+    """
+    return AsyncClaudeCLI(timeout=timeout)
+
+# Version of the prompts and schemas behind cached responses; bump it when
+# they change so responses to the old prompts are no longer served
+RESPONSE_CACHE_VERSION = "1"
+
+# Most recently used responses kept in memory; the rest are served from disk
+RESPONSE_CACHE_MEMORY_ENTRIES = 128
+
+# Analyses below this confidence are not cached, so they are retried
+RESPONSE_CACHE_MIN_CONFIDENCE = 0.5
+
+# Instructions shared by every call of an operation are sent as system
+# prompts, ahead of the per-document message, so repeated calls start with
+# an identical prefix the provider's prompt cache can serve
+
+ANALYSIS_SYSTEM_PROMPT = """
+You analyze documents for DocAutomate from the perspective of a specialist agent.
+Each request names the agent and its focus, then gives the document's type, ID and content.
+
+Please provide structured analysis with:
+1. Key findings
+2. Issues identified
+3. Recommendations
+4. Confidence score (0-1)
+"""
+
+# Focus of each analysis agent
+AGENT_FOCUS = {
+    "general-purpose": "Analyze document structure, identify major sections, quality issues, and completeness gaps",
+    "technical-writer": "Review for clarity, terminology consistency, and documentation quality",
+    "requirements-analyst": "Validate requirements coverage and completeness",
+    "security-engineer": "Identify security vulnerabilities and compliance gaps",
+    "quality-engineer": "Assess test coverage and quality metrics"
+}
+DEFAULT_AGENT_FOCUS = "Perform comprehensive analysis"
+
+def _agent_prompt(agent: str, focus: str) -> str:
+    """Opening line of an agent's analysis request"""
+    return f"Using the {agent} agent perspective, {focus} for this document:"
+
+# Opening line of each known agent's analysis request, built once
+AGENT_PROMPTS = {agent: _agent_prompt(agent, focus) for agent, focus in AGENT_FOCUS.items()}
+
+# Schema for structured agent analysis output
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "findings": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "issues": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string"},
+                    "severity": {"type": "string"},
+                    "description": {"type": "string"},
+                    "location": {"type": "string"}
+                }
+            }
+        },
+        "recommendations": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "confidence": {"type": "number"}
+    }
+}
+_ANALYSIS_SCHEMA_JSON = json.dumps(ANALYSIS_SCHEMA, sort_keys=True)
+
+CONSENSUS_SYSTEM_PROMPT = """
+You validate and prioritize the findings of several document analysis agents.
+Each request lists the issues, with their IDs, and the recommendations they identified for one document.
+
+Please provide consensus on:
+1. Issue severity and priority
+2. Recommendation validity
+3. Action items
+4. Overall document quality score
+
+Respond with ONLY valid JSON in this structure:
+{
+    "valid_issues": ["<IDs of the issues confirmed as real>"],
+    "priorities": {"<issue ID>": "<critical|high|medium|low>"},
+    "action_items": ["action1", "action2"],
+    "quality_score": <number 0-100>,
+    "agreement_score": <number 0-1>
+}
+"""
+
+REMEDIATION_SYSTEM_PROMPT = """
+CRITICAL INSTRUCTION: You MUST return ONLY the complete remediated document in Markdown format.
+DO NOT include any summary, explanation, or commentary.
+DO NOT start with "Here is..." or "Below is..." or any introduction.
+DO NOT end with any summary of changes made.
+ONLY output the full document text itself.
+
+Requirements:
+1. Fix all identified issues
+2. Maintain original document structure
+3. Improve clarity and completeness
+4. Add missing sections if needed
+5. Ensure consistency throughout
+"""
+
+QUALITY_SYSTEM_PROMPT = """
+CRITICAL: Respond with ONLY valid JSON in the exact format specified below. No explanatory text.
+
+You compare an original document with its remediated version.
+
+Return ONLY this JSON structure:
+{
+    "quality_score": <number 0-100>,
+    "improvements": ["improvement1", "improvement2"],
+    "remaining_issues": ["issue1", "issue2"],
+    "structure_score": <number 0-100>,
+    "accuracy_score": <number 0-100>,
+    "completeness_score": <number 0-100>
+}
+"""
+
+# Schema for structured quality validation output
+QUALITY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "quality_score": {"type": "number"},
+        "improvements": {"type": "array", "items": {"type": "string"}},
+        "remaining_issues": {"type": "array", "items": {"type": "string"}},
+        "structure_score": {"type": "number"},
+        "accuracy_score": {"type": "number"},
+        "completeness_score": {"type": "number"}
+    }
+}
+
+# Token budgets for the document text sent with each operation
+ANALYSIS_CONTENT_TOKENS = 750
+REMEDIATION_CONTENT_TOKENS = 2500
+VALIDATION_CONTENT_TOKENS = 375
+VALIDATION_FALLBACK_CONTENT_TOKENS = 125
+
+# Characters per token assumed when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Most characters a single token spans, bounding how much text is tokenized
+MAX_CHARS_PER_TOKEN = 8
+
+@functools.lru_cache(maxsize=1)
+def _token_encoding():
+    """Tokenizer used to budget prompt content; None without tiktoken"""
+    if not HAS_TIKTOKEN:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, truncating by characters: {e}")
+        return None
+
+def _truncate_tokens(content: str, max_tokens: int) -> str:
+    """
+    Cut content to at most max_tokens tokens
+    Only a prefix of MAX_CHARS_PER_TOKEN characters per token is encoded,
+    since nothing past it can fit; without a tokenizer, CHARS_PER_TOKEN
+    characters stand in for a token
+    """
+    encoding = _token_encoding()
+    if encoding is None:
+        return content[:max_tokens * CHARS_PER_TOKEN]
+    prefix = content[:max_tokens * MAX_CHARS_PER_TOKEN]
+    tokens = encoding.encode(prefix, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return prefix
+    # A multi-byte character split at the cut decodes to a replacement mark
+    return encoding.decode(tokens[:max_tokens]).rstrip("\ufffd")
+
+# Remediation output shorter than this is not a full document
+MIN_REMEDIATION_LENGTH = 500
+
+# First lines that mark remediation output as a summary of changes, looked
+# for in at most the first SUMMARY_SCAN_CHARS characters
+SUMMARY_SCAN_CHARS = 256
+_SUMMARY_LINE = re.compile(
+    r"Summary of Improvements|## Summary|Changes made:|Improvements:|Fixed the following|Here is|Below is"
+)
+
+# Markdown heading lines, matched per line of a document
+_HEADING_LINE = re.compile(r"^#{1,6}[ \t].*$", re.MULTILINE)
+
+# Final characters of a document cut off mid-sentence
+_MID_SENTENCE_ENDINGS = (",", ";", ":", "-", "(", "[")
+
+# Issue severities from least to most severe
+SEVERITY_RANK = {"info": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
+
+# Characters that change nesting or string state while scanning JSON
+_JSON_TOKEN = re.compile(r'[{}\[\]"\\]')
+
+def _load_json(text: str) -> Any:
+    """Parse JSON text, via orjson when installed"""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _dump_json(data: Any) -> str:
+    """Serialize data to compact JSON, via orjson when installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, default=str).decode('utf-8')
+    return json.dumps(data, default=str, separators=(',', ':'))
+
+def _extract_first_json(text: str, pos: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Find the first balanced top-level JSON object or array in text from pos
+    
+    Returns its (start, end) span, or None when no bracket ever balances
+    """
+    depth = 0
+    start = None
+    in_string = False
+    escaped_at = -1
+    for match in _JSON_TOKEN.finditer(text, pos):
+        pos, char = match.start(), match.group()
+        if in_string:
+            if pos == escaped_at:
+                continue
+            if char == '\\':
+                escaped_at = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = start is not None
+        elif char in '{[':
+            if start is None:
+                start = pos
+            depth += 1
+        elif start is not None and char in '}]':
+            depth -= 1
+            if depth == 0:
+                return start, pos + 1
+    return None
+
+def _issue_ids(issues: List[Any]) -> Tuple[str, ...]:
+    """IDs of issues, numbered by position for issues without one or not given as dicts"""
+    return tuple(
+        issue.get("id", f"issue_{i}") if isinstance(issue, dict) else f"issue_{i}"
+        for i, issue in enumerate(issues)
+    )
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two sets; two empty sets agree fully"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Result from document analysis"""
     success: bool
@@ -34,7 +337,7 @@ class AnalysisResult:
     confidence: float = 0.0
     metadata: Optional[Dict[str, Any]] = None
 
-@dataclass
+@dataclass(slots=True)
 class ConsensusResult:
     """Result from multi-model consensus"""
     success: bool
@@ -43,12 +346,12 @@ class ConsensusResult:
     agreement_score: float
     metadata: Optional[Dict[str, Any]] = None
 
-@dataclass
+@dataclass(slots=True)
 class RemediationResult:
     """Result from document remediation"""
     success: bool
     remediated_content: str
-    issues_resolved: List[str]
+    issues_resolved: Tuple[str, ...]
     quality_score: float
     metadata: Optional[Dict[str, Any]] = None
 
@@ -62,34 +365,113 @@ class ClaudeService:
         """Initialize service with DSL configurations and CLI wrapper"""
         # Use extended timeout for validation operations to reduce timeout failures
         validation_timeout = int(os.getenv("CLAUDE_VALIDATION_TIMEOUT", "300"))  # 5 minutes default
-        self.cli = AsyncClaudeCLI(timeout=validation_timeout)
+        self.cli = _shared_cli(validation_timeout)
         self._load_dsl_configurations()
+        
+        # Exact-match cache of Claude responses, kept in memory and on disk
+        self.response_cache_enabled = os.getenv("CLAUDE_RESPONSE_CACHE", "true").lower() == "true"
+        self.response_cache_dir = Path(os.getenv(
+            "CLAUDE_RESPONSE_CACHE_DIR",
+            str(Path.home() / ".cache" / "docautomate" / "claude")
+        ))
+        self._response_cache = OrderedDict()
+        
+        # Agent CLI calls in flight at once, across all analyses; one
+        # semaphore per event loop, since a semaphore is bound to its loop
+        self.agent_concurrency = int(os.getenv("CLAUDE_AGENT_CONCURRENCY", "5"))
+        self._agent_semaphores = weakref.WeakKeyDictionary()
+        
         logger.info(f"Claude Service initialized with {validation_timeout}s timeout for validation operations")
     
     def _load_dsl_configurations(self):
         """Load DSL configurations for orchestration"""
         # Load unified operations DSL
-        dsl_path = Path(__file__).parent.parent / "dsl" / "unified-operations.yaml"
-        if dsl_path.exists():
-            with open(dsl_path, 'r') as f:
-                self.dsl_config = yaml.safe_load(f)
-        else:
+        self.dsl_config = _load_dsl_file(DSL_DIR / "unified-operations.yaml")
+        if self.dsl_config is None:
             self.dsl_config = {}
             logger.warning("DSL configuration not found, using defaults")
         
         # Load agent mappings
-        mappings_path = Path(__file__).parent.parent / "dsl" / "agent-mappings.yaml"
-        if mappings_path.exists():
-            with open(mappings_path, 'r') as f:
-                self.agent_mappings = yaml.safe_load(f)
-        else:
+        self.agent_mappings = _load_dsl_file(DSL_DIR / "agent-mappings.yaml")
+        if self.agent_mappings is None:
             self.agent_mappings = {}
             logger.warning("Agent mappings not found, using defaults")
+        
+        # Prompt templates by operation, compiled once at load time
+        self._compiled_templates = {
+            operation: Template(config.get('template', ''))
+            for operation, config in self.dsl_config.get('prompt_templates', {}).items()
+        }
+    
+    def _agent_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore limiting agent calls on the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._agent_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._agent_semaphores[loop] = asyncio.Semaphore(self.agent_concurrency)
+        return semaphore
     
-    def _get_prompt_template(self, operation: str) -> str:
-        """Get prompt template from DSL for operation"""
-        templates = self.dsl_config.get('prompt_templates', {})
-        return templates.get(operation, {}).get('template', '')
+    def _response_cache_key(self, operation: str, *parts: str) -> str:
+        """Hash an operation and its exact inputs into a response cache key"""
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (RESPONSE_CACHE_VERSION, operation, *parts):
+            digest.update(part.encode('utf-8'))
+            digest.update(b"\0")
+        return f"{operation}-{digest.hexdigest()}"
+    
+    async def _get_cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response in memory, then on disk"""
+        if not self.response_cache_enabled:
+            return None
+        # Kept serialized, so every hit gets its own copy to modify
+        text = self._response_cache.get(key)
+        if text is None:
+            cache_file = self.response_cache_dir / f"{key}.json"
+            try:
+                text = await asyncio.to_thread(cache_file.read_text, encoding='utf-8')
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.warning(f"Failed to load cached response {key}: {e}")
+                return None
+        
+        try:
+            data = _load_json(text)
+        except ValueError as e:
+            logger.warning(f"Ignoring corrupt cached response {key}: {e}")
+            return None
+        self._remember_response(key, text)
+        return data
+    
+    def _remember_response(self, key: str, text: str):
+        """Keep a serialized response in memory, evicting the least recently used"""
+        self._response_cache[key] = text
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > RESPONSE_CACHE_MEMORY_ENTRIES:
+            self._response_cache.popitem(last=False)
+    
+    async def _cache_response(self, key: str, data: Dict[str, Any]):
+        """Cache a response in memory and on disk"""
+        if not self.response_cache_enabled:
+            return
+        text = _dump_json(data)
+        self._remember_response(key, text)
+        
+        def write():
+            self.response_cache_dir.mkdir(parents=True, exist_ok=True)
+            # Written aside and renamed so readers never see a partial file
+            tmp_file = self.response_cache_dir / f".{key}.{os.getpid()}.tmp"
+            tmp_file.write_text(text, encoding='utf-8')
+            tmp_file.replace(self.response_cache_dir / f"{key}.json")
+        
+        try:
+            await asyncio.to_thread(write)
+        except Exception as e:
+            logger.warning(f"Failed to cache response {key}: {e}")
+    
+    def _get_prompt_template(self, operation: str) -> Optional[Template]:
+        """Get the compiled DSL prompt template for operation, if any"""
+        return self._compiled_templates.get(operation)
     
     def _select_agents_for_operation(self, operation: str, document_type: str) -> Dict[str, Any]:
         """Select appropriate agents based on DSL mappings"""
@@ -131,41 +513,36 @@ class ClaudeService:
                 "quality-engineer"
             ]
         
-        results = {}
-        
-        # Create analysis tasks for each agent
-        tasks = []
-        for agent in agents:
-            task = self._analyze_with_agent(
-                agent, 
-                document_content, 
-                document_metadata
-            )
-            tasks.append((agent, task))
+        async def analyze(agent):
+            try:
+                return agent, await self._analyze_with_agent(agent, document_content, document_metadata)
+            except Exception as e:
+                return agent, e
         
-        # Execute all analyses in parallel using asyncio.gather
+        # Run analyses in parallel, at most agent_concurrency calling Claude
+        # at once, and report each agent as soon as it finishes
         logger.info(f"Starting parallel analysis with {len(agents)} agents")
-        start_time = datetime.now()
-        
-        # Execute all tasks in parallel
-        task_results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
+        t0 = time.perf_counter()
         
-        # Process results
-        for i, (agent, _) in enumerate(tasks):
-            result = task_results[i]
+        outcomes = {}
+        for finished in asyncio.as_completed([analyze(agent) for agent in agents]):
+            agent, result = await finished
             if isinstance(result, Exception):
                 logger.error(f"Agent {agent} failed: {result}")
-                results[agent] = AnalysisResult(
+                outcomes[agent] = AnalysisResult(
                     success=False,
                     analysis={"error": str(result)},
                     agent_used=agent,
                     confidence=0.0
                 )
             else:
-                results[agent] = result
+                outcomes[agent] = result
                 logger.info(f"Agent {agent} completed with confidence {result.confidence:.2f}")
         
-        elapsed = (datetime.now() - start_time).total_seconds()
+        # Results follow the requested agent order
+        results = {agent: outcomes[agent] for agent in agents}
+        
+        elapsed = time.perf_counter() - t0
         logger.info(f"Multi-agent analysis completed in {elapsed:.2f}s")
         
         return results
@@ -185,82 +562,63 @@ class ClaudeService:
         Returns:
             Analysis result from agent
         """
-        # Build agent-specific prompt
-        prompts = {
-            "general-purpose": "Analyze document structure, identify major sections, quality issues, and completeness gaps",
-            "technical-writer": "Review for clarity, terminology consistency, and documentation quality",
-            "requirements-analyst": "Validate requirements coverage and completeness",
-            "security-engineer": "Identify security vulnerabilities and compliance gaps",
-            "quality-engineer": "Assess test coverage and quality metrics"
-        }
+        # Build agent-specific prompt; the content itself is passed as the
+        # text to analyze
+        agent_prompt = AGENT_PROMPTS.get(agent) or _agent_prompt(agent, DEFAULT_AGENT_FOCUS)
         
-        base_prompt = prompts.get(agent, "Perform comprehensive analysis")
-        
-        # Prepare full prompt with context
         prompt = f"""
-Using the {agent} agent perspective, {base_prompt} for this document:
+{agent_prompt}
 
 Document Type: {metadata.get('content_type', 'unknown')}
 Document ID: {metadata.get('document_id', 'unknown')}
-
-Content to analyze:
-{content[:3000]}...
-
-Please provide structured analysis with:
-1. Key findings
-2. Issues identified
-3. Recommendations
-4. Confidence score (0-1)
 """
+        text = _truncate_tokens(content, ANALYSIS_CONTENT_TOKENS)
         
-        # Define schema for structured output
-        schema = {
-            "type": "object",
-            "properties": {
-                "findings": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "issues": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "type": {"type": "string"},
-                            "severity": {"type": "string"},
-                            "description": {"type": "string"},
-                            "location": {"type": "string"}
-                        }
-                    }
-                },
-                "recommendations": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "confidence": {"type": "number"}
-            }
-        }
+        # Keyed on exactly what is sent, so prompt, schema and truncation
+        # changes miss the cache on their own
+        cache_key = self._response_cache_key(
+            "analysis", ANALYSIS_SYSTEM_PROMPT, _ANALYSIS_SCHEMA_JSON, prompt, text
+        )
+        cached = await self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached analysis for agent {agent}")
+            return self._analysis_result(agent, cached, metadata)
         
         try:
             # Execute analysis using Claude CLI
-            result = await self.cli.analyze_text_async(
-                text=content,
-                prompt=prompt,
-                schema=schema
-            )
+            async with self._agent_semaphore():
+                result = await self.cli.analyze_text_async(
+                    text=text,
+                    prompt=prompt,
+                    schema=ANALYSIS_SCHEMA,
+                    system_prompt=ANALYSIS_SYSTEM_PROMPT,
+                    max_text_chars=None
+                )
             
-            return AnalysisResult(
-                success=True,
-                analysis=result,
-                agent_used=agent,
-                confidence=result.get("confidence", 0.5),
-                metadata={"document_id": metadata.get("document_id")}
-            )
+            analysis = self._analysis_result(agent, result, metadata)
+            # Unparseable output comes back empty, without a confidence of
+            # its own; only analyses that report enough confidence are kept
+            confidence = result.get("confidence") if isinstance(result, dict) else None
+            if (isinstance(confidence, (int, float)) and not isinstance(confidence, bool)
+                    and confidence >= RESPONSE_CACHE_MIN_CONFIDENCE):
+                await self._cache_response(cache_key, result)
+            return analysis
             
         except Exception as e:
             logger.error(f"Analysis failed for agent {agent}: {e}")
             raise
     
+    def _analysis_result(self, agent: str, result: Dict[str, Any],
+                         metadata: Dict[str, Any]) -> AnalysisResult:
+        """Wrap an agent's structured analysis output"""
+        return AnalysisResult(
+            success=True,
+            analysis=result,
+            agent_used=agent,
+            confidence=result.get("confidence", 0.5),
+            metadata={"document_id": metadata.get("document_id")}
+        )
+    
     async def consensus_validation(self,
                                   analysis_results: Dict[str, AnalysisResult],
                                   document_id: str,
@@ -268,6 +626,10 @@ Please provide structured analysis with:
         """
         Perform multi-model consensus validation on analysis results
         
+        Each model reviews the findings in parallel and the votes are
+        aggregated locally; a single Zen MCP consensus call is the fallback
+        when any model gives no usable vote.
+        
         Args:
             analysis_results: Results from multi-agent analysis
             document_id: Document identifier
@@ -279,64 +641,52 @@ Please provide structured analysis with:
         if models is None:
             models = ["gpt-5", "claude-opus-4.1", "gpt-4.1"]
         
-        # Prepare consolidated findings for consensus
-        all_issues = []
-        all_recommendations = []
-        
-        for agent, result in analysis_results.items():
-            if result.success:
-                issues = result.analysis.get("issues", [])
-                all_issues.extend(issues)
-                recs = result.analysis.get("recommendations", [])
-                all_recommendations.extend(recs)
+        # Prepare consolidated findings for consensus, one entry per distinct finding
+        successful = {agent: result.analysis for agent, result in analysis_results.items() if result.success}
+        all_issues = self._merge_issues(
+            {agent: analysis.get("issues") or [] for agent, analysis in successful.items()}
+        )
+        all_recommendations = self._merge_recommendations(
+            {agent: analysis.get("recommendations") or [] for agent, analysis in successful.items()}
+        )
         
-        # Build consensus prompt
-        prompt = f"""
-Validate and prioritize the following analysis findings for document {document_id}:
-
+        findings = f"""
 Issues Identified:
-{json.dumps(all_issues, indent=2)}
+{_dump_json(all_issues)}
 
 Recommendations:
-{json.dumps(all_recommendations, indent=2)}
-
-Please provide consensus on:
-1. Issue severity and priority
-2. Recommendation validity
-3. Action items
-4. Overall document quality score
-
-Use multi-model consensus with models: {', '.join(models)}
+{_dump_json(all_recommendations)}
 """
         
-        # Execute consensus using Zen MCP
         try:
-            result = await self.cli.use_mcp_server_async(
-                prompt=prompt,
-                mcp=SuperClaudeMCP.ZEN,
-                additional_flags=["--consensus", "--model", models[0]]
+            consensus_data = await self._per_model_consensus(
+                document_id, findings, [issue["id"] for issue in all_issues], models
             )
+            success = consensus_data is not None
             
-            # Parse consensus result with robust JSON handling
-            if result.success and result.output:
-                raw = result.output.strip()
-                try:
-                    if raw.startswith("{") or raw.startswith("["):
-                        consensus_data = json.loads(raw)
-                    else:
-                        logger.warning(f"Non-JSON consensus output (len={len(raw)}): {raw[:200]}...")
-                        consensus_data = {}
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse consensus JSON (len={len(raw)}): {raw[:200]}... Error: {e}")
-                    consensus_data = {}
-            else:
-                consensus_data = {}
+            if not success:
+                logger.warning("Per-model consensus incomplete, falling back to unified Zen consensus")
+                prompt = f"""
+Validate and prioritize the following analysis findings for document {document_id}:
+{findings}
+Use multi-model consensus with models: {', '.join(models)}
+"""
+                
+                # Execute consensus using Zen MCP
+                result = await self.cli.use_mcp_server_async(
+                    prompt=prompt,
+                    mcp=SuperClaudeMCP.ZEN,
+                    additional_flags=["--consensus", "--model", models[0]],
+                    system_prompt=CONSENSUS_SYSTEM_PROMPT
+                )
+                success = result.success
+                consensus_data = self._parse_json_output(result.output, "consensus") if success else {}
             
             # Calculate agreement score based on model responses
             agreement_score = consensus_data.get("agreement_score", 0.7)
             
             return ConsensusResult(
-                success=result.success,
+                success=success,
                 consensus=consensus_data,
                 models_used=models,
                 agreement_score=agreement_score,
@@ -353,10 +703,174 @@ Use multi-model consensus with models: {', '.join(models)}
                 metadata={"document_id": document_id}
             )
     
+    def _merge_issues(self, issues_by_agent: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge the issues reported by several agents
+        
+        Issues with the same type and description (or identical issues without
+        a description) are reported once, with the highest severity, every
+        location and the agents that found them.
+        Every merged issue gets a unique ID for models to vote on.
+        """
+        groups = defaultdict(list)
+        for agent, issues in issues_by_agent.items():
+            for issue in issues:
+                if not isinstance(issue, dict):
+                    issue = {"description": str(issue)}
+                description = str(issue.get("description") or "").strip().lower()[:120]
+                key = (issue.get("type"), description or json.dumps(issue, sort_keys=True, default=str))
+                groups[key].append((agent, issue))
+        
+        merged = []
+        used_ids = set()
+        for n, reports in enumerate(groups.values()):
+            issue = {k: v for k, v in reports[0][1].items() if k != "location"}
+            issue_id = str(issue.get("id", f"issue_{n}"))
+            if issue_id in used_ids:
+                issue_id = f"issue_{n}"
+            used_ids.add(issue_id)
+            
+            severities = [report["severity"] for _, report in reports if report.get("severity")]
+            locations = []
+            for _, report in reports:
+                if report.get("location") and report["location"] not in locations:
+                    locations.append(report["location"])
+            agents = list(dict.fromkeys(agent for agent, _ in reports))
+            issue.update(id=issue_id, agents=agents, count=len(reports))
+            if severities:
+                issue["severity"] = max(severities, key=lambda s: SEVERITY_RANK.get(str(s).lower(), -1))
+            if locations:
+                issue["locations"] = locations
+            merged.append(issue)
+        return merged
+    
+    def _merge_recommendations(self, recommendations_by_agent: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """Merge recommendations that start alike, keeping the agents that made them"""
+        groups = {}
+        for agent, recommendations in recommendations_by_agent.items():
+            for recommendation in recommendations:
+                text = recommendation if isinstance(recommendation, str) else json.dumps(recommendation)
+                merged = groups.setdefault(text.strip().lower()[:80], {"recommendation": recommendation, "agents": []})
+                if agent not in merged["agents"]:
+                    merged["agents"].append(agent)
+        return list(groups.values())
+    
+    async def _per_model_consensus(self,
+                                   document_id: str,
+                                   findings: str,
+                                   issue_ids: List[str],
+                                   models: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Ask every model to review the findings in parallel and aggregate the votes
+        
+        Returns None when any model fails or returns no valid_issues list
+        """
+        async def review(model: str) -> Dict[str, Any]:
+            prompt = f"""
+Validate and prioritize the following analysis findings for document {document_id}.
+You are one independent voter in a multi-model consensus; answer as {model}.
+{findings}"""
+            async with self._agent_semaphore():
+                result = await self.cli.use_mcp_server_async(
+                    prompt=prompt,
+                    mcp=SuperClaudeMCP.ZEN,
+                    additional_flags=["--model", model],
+                    system_prompt=CONSENSUS_SYSTEM_PROMPT
+                )
+            if not result.success:
+                raise Exception(f"Consensus review failed: {result.error}")
+            return self._parse_json_output(result.output, f"{model} consensus")
+        
+        reviews = await asyncio.gather(*(review(model) for model in models), return_exceptions=True)
+        
+        for model, review in zip(models, reviews):
+            if isinstance(review, Exception) or not isinstance(review.get("valid_issues"), list):
+                logger.warning(f"No usable consensus vote from {model}: {review}")
+                return None
+        
+        return self._aggregate_consensus(dict(zip(models, reviews)), issue_ids)
+    
+    def _aggregate_consensus(self,
+                             reviews: Dict[str, Dict[str, Any]],
+                             issue_ids: List[str]) -> Dict[str, Any]:
+        """
+        Combine per-model reviews into one consensus
+        
+        Agreement is the mean pairwise Jaccard similarity of the models'
+        valid issue sets; issues and priorities are decided by majority
+        """
+        votes = [{str(issue_id) for issue_id in review["valid_issues"]} for review in reviews.values()]
+        pairs = list(itertools.combinations(votes, 2))
+        agreement = sum(_jaccard(a, b) for a, b in pairs) / len(pairs) if pairs else 1.0
+        
+        counts = Counter(issue_id for vote in votes for issue_id in vote)
+        validated = [issue_id for issue_id in issue_ids if counts[issue_id] * 2 > len(votes)]
+        
+        priorities = {}
+        for issue_id in validated:
+            ranked = Counter(
+                review["priorities"][issue_id] for review in reviews.values()
+                if isinstance(review.get("priorities"), dict) and issue_id in review["priorities"]
+            ).most_common(1)
+            if ranked:
+                priorities[issue_id] = ranked[0][0]
+        
+        action_items = list(dict.fromkeys(
+            item for review in reviews.values()
+            for item in review.get("action_items") or [] if isinstance(item, str)
+        ))
+        scores = [review["quality_score"] for review in reviews.values()
+                  if isinstance(review.get("quality_score"), (int, float))]
+        
+        return {
+            "valid_issues": validated,
+            "priorities": priorities,
+            "action_items": action_items,
+            "quality_score": sum(scores) / len(scores) if scores else None,
+            "agreement_score": round(agreement, 3),
+            "models": reviews
+        }
+    
+    def _parse_json_output(self, raw: Optional[str], label: str) -> Dict[str, Any]:
+        """
+        Parse the JSON object returned by Claude
+        
+        Output wrapped in commentary or code fences is reduced to its first
+        complete JSON object; empty when no JSON object can be recovered
+        """
+        raw = (raw or "").strip()
+        try:
+            data = _load_json(raw)
+        except ValueError as e:
+            error = e
+        else:
+            if isinstance(data, dict):
+                return data
+            error = f"expected a JSON object, got {type(data).__name__}"
+        
+        # Bracketed commentary and non-object values before the object are
+        # skipped whole, so scanning never restarts inside them
+        span = _extract_first_json(raw)
+        while span is not None:
+            start, end = span
+            try:
+                data = _load_json(raw[start:end])
+            except ValueError as exc:
+                error = exc
+            else:
+                if isinstance(data, dict):
+                    logger.debug(f"Dropped text around {label} JSON: prefix={raw[:start][:200]!r} suffix={raw[end:][:200]!r}")
+                    return data
+                error = f"expected a JSON object, got {type(data).__name__}"
+            span = _extract_first_json(raw, end)
+        logger.warning(f"Failed to parse {label} JSON (len={len(raw)}): {raw[:200]}... Error: {error}")
+        return {}
+    
     async def generate_remediation(self,
                                  document_content: str,
                                  issues: List[Dict[str, Any]],
-                                 document_id: str) -> RemediationResult:
+                                 document_id: str,
+                                 issue_ids: Optional[Tuple[str, ...]] = None) -> RemediationResult:
         """
         Generate remediated document based on identified issues
         
@@ -364,30 +878,22 @@ Use multi-model consensus with models: {', '.join(models)}
             document_content: Original document content
             issues: List of issues to remediate
             document_id: Document identifier
+            issue_ids: IDs of the issues, when the caller already has them
             
         Returns:
             Remediation result with improved content
         """
+        original = _truncate_tokens(document_content, REMEDIATION_CONTENT_TOKENS)
+        # Compact JSON: indentation only adds tokens to the prompt
+        issues_json = _dump_json(issues)
+        
         # Build remediation prompt
         prompt = f"""
-CRITICAL INSTRUCTION: You MUST return ONLY the complete remediated document in Markdown format.
-DO NOT include any summary, explanation, or commentary.
-DO NOT start with "Here is..." or "Below is..." or any introduction.
-DO NOT end with any summary of changes made.
-ONLY output the full document text itself.
-
 Original Document (truncated for context):
-{document_content[:10000]}
+{original}
 
 Issues to Address:
-{json.dumps(issues, indent=2)}
-
-Requirements:
-1. Fix all identified issues
-2. Maintain original document structure  
-3. Improve clarity and completeness
-4. Add missing sections if needed
-5. Ensure consistency throughout
+{issues_json}
 
 OUTPUT ONLY THE COMPLETE REMEDIATED DOCUMENT IN MARKDOWN - NOTHING ELSE.
 Start directly with the document title or first line.
@@ -401,30 +907,16 @@ Start directly with the document title or first line.
                 context={
                     "document_id": document_id,
                     "issue_count": len(issues)
-                }
+                },
+                system_prompt=REMEDIATION_SYSTEM_PROMPT
             )
             
             if result.success:
                 # Validate output is a full document, not a summary
-                output = (result.output or "").strip()
-                
-                # Check for summary indicators
-                summary_indicators = [
-                    "Summary of Improvements",
-                    "## Summary",
-                    "Changes made:",
-                    "Improvements:",
-                    "Fixed the following",
-                    "Here is",
-                    "Below is"
-                ]
+                output = self._strip_summary_preamble((result.output or "").strip())
                 
-                first_line = output.split('\n')[0] if output else ""
-                is_summary = any(indicator in first_line for indicator in summary_indicators)
-                
-                # Also check if output is too short to be a full document
-                if is_summary or len(output) < 500:
-                    logger.warning(f"Remediation appears to be a summary (length: {len(output)}, starts with: {first_line[:50]})")
+                if self._looks_like_summary(output):
+                    logger.warning(f"Remediation appears to be a summary (length: {len(output)}, starts with: {output[:50]})")
                     # Retry with even stricter prompt
                     stricter_prompt = f"""
 YOU ARE RETURNING A SUMMARY INSTEAD OF THE DOCUMENT. THIS IS WRONG.
@@ -435,25 +927,49 @@ Include ALL sections of the NDA.
 DO NOT include any summary or explanation.
 
 Original Document:
-{document_content[:10000]}
+{original}
 
-Issues: {json.dumps(issues)}
+Issues: {issues_json}
 
 OUTPUT THE FULL REMEDIATED DOCUMENT NOW:
 """
                     retry_result = await self.cli.execute_with_mode_async(
                         prompt=stricter_prompt,
                         mode=SuperClaudeMode.TASK_MANAGE,
-                        context={"document_id": document_id, "retry": True}
+                        context={"document_id": document_id, "retry": True},
+                        system_prompt=REMEDIATION_SYSTEM_PROMPT
                     )
                     
-                    if retry_result.success:
-                        output = (retry_result.output or "").strip()
-                        # If still too short, raise error
-                        if len(output) < 500:
-                            raise Exception(f"Remediation output too short ({len(output)} chars) - appears to be summary")
-                    else:
+                    if not retry_result.success:
                         raise Exception(f"Remediation retry failed: {retry_result.error}")
+                    output = (retry_result.output or "").strip()
+                
+                elif self._looks_incomplete(output, original):
+                    logger.warning(f"Remediation appears incomplete (length: {len(output)}), asking for the rest")
+                    # Only the partial output goes back, not the original and issues again
+                    missing = self._missing_headings(output, original)
+                    missing_sections = "\n".join(missing) if missing else "(none)"
+                    continuation_prompt = f"""Previous output was incomplete:
+{output}
+
+Sections of the original document still missing:
+{missing_sections}
+
+Continue the document from where it stopped. Output only the remaining sections."""
+                    continuation = await self.cli.execute_with_mode_async(
+                        prompt=continuation_prompt,
+                        mode=SuperClaudeMode.TASK_MANAGE,
+                        context={"document_id": document_id, "continuation": True},
+                        system_prompt=REMEDIATION_SYSTEM_PROMPT
+                    )
+                    
+                    if not continuation.success:
+                        raise Exception(f"Remediation continuation failed: {continuation.error}")
+                    output = f"{output}\n\n{(continuation.output or '').strip()}".strip()
+                
+                # If still too short, raise error
+                if len(output) < MIN_REMEDIATION_LENGTH:
+                    raise Exception(f"Remediation output too short ({len(output)} chars) - appears to be summary")
                 
                 # Calculate quality score based on issues resolved
                 quality_score = min(1.0, 0.5 + (0.1 * len(issues)))
@@ -461,8 +977,7 @@ OUTPUT THE FULL REMEDIATED DOCUMENT NOW:
                 return RemediationResult(
                     success=True,
                     remediated_content=output,
-                    issues_resolved=[issue.get("id", f"issue_{i}") 
-                                    for i, issue in enumerate(issues)],
+                    issues_resolved=issue_ids if issue_ids is not None else _issue_ids(issues),
                     quality_score=quality_score,
                     metadata={"document_id": document_id}
                 )
@@ -474,11 +989,45 @@ OUTPUT THE FULL REMEDIATED DOCUMENT NOW:
             return RemediationResult(
                 success=False,
                 remediated_content="",
-                issues_resolved=[],
+                issues_resolved=(),
                 quality_score=0.0,
                 metadata={"document_id": document_id, "error": str(e)}
             )
     
+    def _strip_summary_preamble(self, output: str) -> str:
+        """Drop an introduction line such as "Here is..." before a Markdown document"""
+        if not self._looks_like_summary(output):
+            return output
+        rest = output.partition('\n')[2].strip()
+        return rest if rest.startswith('#') else output
+    
+    def _looks_like_summary(self, output: str) -> bool:
+        """Whether remediation output opens like a summary of changes"""
+        # Only the start of the first line is scanned, without splitting the output
+        end = output.find('\n', 0, SUMMARY_SCAN_CHARS)
+        return _SUMMARY_LINE.search(output, 0, end if end >= 0 else SUMMARY_SCAN_CHARS) is not None
+    
+    def _looks_incomplete(self, output: str, original: str) -> bool:
+        """
+        Whether remediation output looks like a document cut short
+        
+        It is too short outright, under half the length of the original, or
+        ends mid-section: on a heading with no body, inside an open code
+        fence, or partway through a sentence
+        """
+        if len(output) < MIN_REMEDIATION_LENGTH or len(output) * 2 < len(original):
+            return True
+        last_line = output.rstrip().rpartition('\n')[2].strip()
+        return (_HEADING_LINE.match(last_line) is not None
+                or output.count('```') % 2 == 1
+                or last_line.endswith(_MID_SENTENCE_ENDINGS))
+    
+    def _missing_headings(self, output: str, original: str) -> List[str]:
+        """Headings of the original document, in order, that the output lacks"""
+        present = {heading.strip() for heading in _HEADING_LINE.findall(output)}
+        return [heading.strip() for heading in _HEADING_LINE.findall(original)
+                if heading.strip() not in present]
+    
     async def quality_validation(self,
                                 remediated_content: str,
                                 original_content: str,
@@ -494,45 +1043,39 @@ OUTPUT THE FULL REMEDIATED DOCUMENT NOW:
         Returns:
             Validation results with quality metrics
         """
-        # Enhanced prompt with explicit JSON structure requirements and simplified approach
+        cache_key = self._response_cache_key(
+            "validation", document_id, original_content, remediated_content
+        )
+        cached = await self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached quality validation for {document_id}")
+            return cached
+        
+        validation = await self._validate_quality(remediated_content, original_content, document_id)
+        # Unparseable fallback output validates to an empty result; retry it
+        if validation.get("success") and validation.get("validation"):
+            await self._cache_response(cache_key, validation)
+        return validation
+    
+    async def _validate_quality(self,
+                                remediated_content: str,
+                                original_content: str,
+                                document_id: str) -> Dict[str, Any]:
+        """Run quality validation through Claude, falling back to Zen MCP"""
+        # The beginnings of both documents are passed as the text to analyze
         prompt = f"""
-CRITICAL: Respond with ONLY valid JSON in the exact format specified below. No explanatory text.
-
-Compare original vs remediated document for Document ID: {document_id}
-
-Original content (first 800 chars):
-{original_content[:800]}...
-
-Remediated content (first 800 chars):
-{remediated_content[:800]}...
-
-Return ONLY this JSON structure:
-{{
-    "quality_score": <number 0-100>,
-    "improvements": ["improvement1", "improvement2"],
-    "remaining_issues": ["issue1", "issue2"],
-    "structure_score": <number 0-100>,
-    "accuracy_score": <number 0-100>,
-    "completeness_score": <number 0-100>
-}}
+Compare the original and remediated documents below for Document ID: {document_id}
 """
         
         try:
             # Try simplified approach first (faster, more reliable)
             result = await self.cli.analyze_text_async(
-                text=f"Original:\n{original_content[:1500]}\n\nRemediated:\n{remediated_content[:1500]}",
+                text=(f"Original:\n{_truncate_tokens(original_content, VALIDATION_CONTENT_TOKENS)}\n\n"
+                      f"Remediated:\n{_truncate_tokens(remediated_content, VALIDATION_CONTENT_TOKENS)}"),
                 prompt=prompt,
-                schema={
-                    "type": "object",
-                    "properties": {
-                        "quality_score": {"type": "number"},
-                        "improvements": {"type": "array", "items": {"type": "string"}},
-                        "remaining_issues": {"type": "array", "items": {"type": "string"}},
-                        "structure_score": {"type": "number"},
-                        "accuracy_score": {"type": "number"},
-                        "completeness_score": {"type": "number"}
-                    }
-                }
+                schema=QUALITY_SCHEMA,
+                system_prompt=QUALITY_SYSTEM_PROMPT,
+                max_text_chars=None
             )
             
             # If analyze_text succeeds, use it directly
@@ -557,8 +1100,8 @@ Validate document quality for {document_id}. Return valid JSON only:
 
 {{"quality_score": <0-100>, "improvements": [], "remaining_issues": []}}
 
-Original: {original_content[:500]}...
-Remediated: {remediated_content[:500]}...
+Original: {_truncate_tokens(original_content, VALIDATION_FALLBACK_CONTENT_TOKENS)}...
+Remediated: {_truncate_tokens(remediated_content, VALIDATION_FALLBACK_CONTENT_TOKENS)}...
 """
         
         try:
@@ -569,17 +1112,7 @@ Remediated: {remediated_content[:500]}...
             )
             
             if result.success:
-                # Robust JSON parsing with validation and fallback
-                raw = result.output or ""
-                try:
-                    if raw.strip().startswith("{") or raw.strip().startswith("["):
-                        validation_data = json.loads(raw)
-                    else:
-                        logger.warning(f"Non-JSON validation output (len={len(raw)}): {raw[:200]}...")
-                        validation_data = {}
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse validation JSON (len={len(raw)}): {raw[:200]}... Error: {e}")
-                    validation_data = {}
+                validation_data = self._parse_json_output(result.output, "validation")
                 
                 logger.info(f"Quality validation completed using fallback approach for {document_id}")
                 return {
@@ -620,11 +1153,11 @@ Remediated: {remediated_content[:500]}...
             Complete workflow execution results
         """
         logger.info(f"Starting orchestration for document {document_id}")
-        start_time = datetime.now()
+        t0 = time.perf_counter()
         
         results = {
             "document_id": document_id,
-            "start_time": start_time.isoformat(),
+            "start_time": datetime.now().isoformat(),
             "steps": {}
         }
         
@@ -641,35 +1174,50 @@ Remediated: {remediated_content[:500]}...
                 "agents": list(analysis_results.keys())
             }
             
-            # Step 2: Consensus validation
-            logger.info("Step 2: Consensus validation")
-            consensus = await self.consensus_validation(
-                analysis_results,
-                document_id
+            # Steps 2 and 3 both only need the analysis, so they run together
+            logger.info("Steps 2-3: Consensus validation and remediation in parallel")
+            # Extract issues from analysis
+            all_issues = [
+                issue
+                for result in analysis_results.values() if result.success
+                for issue in result.analysis.get("issues", [])
+            ]
+            
+            issue_ids = _issue_ids(all_issues)
+            step_times = {}
+            
+            # Step start and end, in seconds since the workflow started
+            async def timed(step: str, awaitable):
+                started = time.perf_counter() - t0
+                try:
+                    return await awaitable
+                finally:
+                    step_times[step] = {"start_offset_seconds": started,
+                                        "end_offset_seconds": time.perf_counter() - t0}
+            
+            consensus, remediation = await asyncio.gather(
+                timed("consensus", self.consensus_validation(
+                    analysis_results,
+                    document_id
+                )),
+                timed("remediation", self.generate_remediation(
+                    document_content,
+                    all_issues,
+                    document_id,
+                    issue_ids=issue_ids
+                ))
             )
             results["steps"]["consensus"] = {
                 "status": "completed" if consensus.success else "failed",
                 "agreement_score": consensus.agreement_score,
-                "models_used": consensus.models_used
+                "models_used": consensus.models_used,
+                **step_times["consensus"]
             }
-            
-            # Step 3: Generate remediation
-            logger.info("Step 3: Generate remediation")
-            # Extract issues from analysis
-            all_issues = []
-            for agent, result in analysis_results.items():
-                if result.success:
-                    all_issues.extend(result.analysis.get("issues", []))
-            
-            remediation = await self.generate_remediation(
-                document_content,
-                all_issues,
-                document_id
-            )
             results["steps"]["remediation"] = {
                 "status": "completed" if remediation.success else "failed",
                 "issues_resolved": len(remediation.issues_resolved),
-                "quality_score": remediation.quality_score
+                "quality_score": remediation.quality_score,
+                **step_times["remediation"]
             }
             
             # Store remediated content in results for filesystem saving
@@ -677,6 +1225,10 @@ Remediated: {remediated_content[:500]}...
                 results["remediated_content"] = remediation.remediated_content
                 logger.info(f"Stored remediated content ({len(remediation.remediated_content)} chars) in orchestration results")
             
+            # Full analyses are not needed past this point; release them
+            # before the validation call rather than when the workflow returns
+            del analysis_results, all_issues, consensus
+            
             # Step 4: Quality validation
             logger.info("Step 4: Quality validation")
             validation = await self.quality_validation(
@@ -691,7 +1243,7 @@ Remediated: {remediated_content[:500]}...
             }
             
             # Calculate overall metrics
-            elapsed = (datetime.now() - start_time).total_seconds()
+            elapsed = time.perf_counter() - t0
             results["completed_at"] = datetime.now().isoformat()
             results["duration_seconds"] = elapsed
             results["overall_status"] = "completed"
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Tests for the Claude orchestration service
+Runs the service against a Claude CLI that records commands instead of
+invoking claude
+"""
+
+import importlib
+import json
+import os
+import pytest
+import threading
+import time
+from pathlib import Path
+
+# Import our modules
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from claude_cli import AsyncClaudeCLI, CLIResult
+from services.claude_service import ClaudeService, AnalysisResult
+
+# The services package exports the service singleton under the module's name
+service_module = importlib.import_module("services.claude_service")
+
+
+class RecordingCLI(AsyncClaudeCLI):
+    """Claude CLI answering every command with a scripted output"""
+
+    def __init__(self, outputs=None, delay=0.0):
+        super().__init__(timeout=5, claude_cmd="claude")
+        self.outputs = outputs or {}
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _run_command(self, cmd, input_text=None, **kwargs):
+        with self.lock:
+            self.calls.append((cmd, input_text))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        output = next((out for marker, out in self.outputs.items() if marker in input_text), "{}")
+        return CLIResult(success=True, output=output)
+
+    def system_prompt(self, call):
+        cmd = call[0]
+        return cmd[cmd.index("--append-system-prompt") + 1] if "--append-system-prompt" in cmd else None
+
+
+@pytest.fixture
+def cli():
+    return RecordingCLI()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "responses"
+    monkeypatch.setenv("CLAUDE_RESPONSE_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def service(cli, cache_dir):
+    service = ClaudeService()
+    service.cli = cli
+    return service
+
+
+class TestClaudeService:
+    """Test prompts and result handling of the Claude service"""
+
+    @pytest.mark.asyncio
+    async def test_analysis_shares_system_prompt_and_sends_content_once(self, service, cli):
+        """Test that agents share one system prompt and get the document once"""
+        content = "Section 1. " + "confidential terms " * 300
+        agents = ["general-purpose", "security-engineer"]
+
+        results = await service.multi_agent_analysis(content, {"document_id": "doc1"}, agents)
+
+        assert set(results) == set(agents)
+        assert len(cli.calls) == 2
+        system_prompts = {cli.system_prompt(call) for call in cli.calls}
+        assert len(system_prompts) == 1
+        system_prompt = system_prompts.pop()
+        assert system_prompt.startswith(service_module.ANALYSIS_SYSTEM_PROMPT.rstrip())
+        assert json.dumps(service_module.ANALYSIS_SCHEMA, indent=2) in system_prompt
+        for cmd, prompt in cli.calls:
+            assert "CRITICAL JSON OUTPUT REQUIREMENTS" not in prompt
+            assert prompt.count(content[:3000]) == 1
+            assert "Document ID: doc1" in prompt
+        assert any(service_module.AGENT_FOCUS["security-engineer"] in prompt for _, prompt in cli.calls)
+
+    @pytest.mark.asyncio
+    async def test_agents_share_one_token_budgeted_prefix(self, service, cli, monkeypatch):
+        """Test that every agent gets the same token-budgeted prefix, tokenizing only a bounded prefix"""
+        class WordEncoding:
+            def __init__(self):
+                self.encoded = []
+
+            def encode(self, text, disallowed_special=()):
+                self.encoded.append(len(text))
+                return text.split(" ")
+
+            def decode(self, tokens):
+                return " ".join(tokens)
+
+        encoding = WordEncoding()
+        monkeypatch.setattr(service_module, "_token_encoding", lambda: encoding)
+        content = " ".join(f"w{n % 10}xxxx" for n in range(5000))
+        agents = ["general-purpose", "security-engineer", "technical-writer"]
+
+        await service.multi_agent_analysis(content, {"document_id": "doc1"}, agents)
+
+        budget = service_module.ANALYSIS_CONTENT_TOKENS
+        expected = " ".join(f"w{n % 10}xxxx" for n in range(budget))
+        # Longer than the CLI's own character cut, which budgeted text skips
+        assert len(expected) > 3000
+        assert encoding.encoded == [budget * service_module.MAX_CHARS_PER_TOKEN] * len(agents)
+        for cmd, prompt in cli.calls:
+            assert f"---\n{expected}\n---" in prompt
+
+    @pytest.mark.asyncio
+    async def test_analysis_concurrency_is_bounded(self, cache_dir, monkeypatch):
+        """Test that agent calls are capped in flight and results keep agent order"""
+        monkeypatch.setenv("CLAUDE_AGENT_CONCURRENCY", "2")
+        service = ClaudeService()
+        service.cli = RecordingCLI(delay=0.05)
+        agents = [f"agent-{n}" for n in range(6)]
+
+        results = await service.multi_agent_analysis("content", {"document_id": "doc1"}, agents)
+
+        assert list(results) == agents
+        assert all(result.success for result in results.values())
+        assert service.cli.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_operations_send_their_fixed_instructions_as_system_prompts(self, service, cli):
+        """Test that consensus, remediation and validation move fixed instructions out of the message"""
+        document = "# Agreement\n" + "clause text\n" * 100
+        cli.outputs = {"Issues to Address": document, "Compare the original": json.dumps({"quality_score": 90}),
+                       "independent voter": json.dumps({"valid_issues": ["i1"]})}
+        analysis = {"general-purpose": AnalysisResult(
+            success=True, analysis={"issues": [{"id": "i1", "type": "clarity"}], "recommendations": ["r"]}
+        )}
+
+        await service.consensus_validation(analysis, "doc1")
+        remediation = await service.generate_remediation(document, [{"id": "i1"}], "doc1")
+        validation = await service.quality_validation(remediation.remediated_content, document, "doc1")
+
+        assert remediation.success and remediation.issues_resolved == ("i1",)
+        assert validation["quality_score"] == 90
+        system_prompts = [cli.system_prompt(call) for call in cli.calls]
+        assert system_prompts[:4] == [service_module.CONSENSUS_SYSTEM_PROMPT] * 3 + [
+            service_module.REMEDIATION_SYSTEM_PROMPT
+        ]
+        # Schema-bound calls carry the schema with their system prompt
+        assert system_prompts[4].startswith(service_module.QUALITY_SYSTEM_PROMPT.rstrip())
+        assert json.dumps(service_module.QUALITY_SCHEMA, indent=2) in system_prompts[4]
+        for (cmd, prompt), system_prompt in zip(cli.calls, system_prompts):
+            assert system_prompt.strip() not in prompt
+
+    @pytest.mark.asyncio
+    async def test_incomplete_remediation_continued_without_resending_document(self, service, cli):
+        """Test that a cut-short remediation is continued from its own output only"""
+        document = "# Agreement\n" + "".join(f"## Clause {n}\nterms of clause {n}\n" for n in range(40))
+        partial = "# Agreement\n" + "".join(f"## Clause {n}\nbetter terms of clause {n}\n" for n in range(10))
+        rest = "".join(f"## Clause {n}\nbetter terms of clause {n}\n" for n in range(10, 40))
+        cli.outputs = {"Previous output was incomplete": rest, "Issues to Address": partial}
+
+        remediation = await service.generate_remediation(document, [{"id": "i1"}], "doc1")
+
+        assert remediation.success
+        assert remediation.remediated_content == f"{partial.strip()}\n\n{rest.strip()}"
+        assert len(cli.calls) == 2
+        continuation = cli.calls[1][1]
+        assert partial.strip() in continuation
+        assert "terms of clause 39" not in continuation and "i1" not in continuation
+        missing = continuation.partition("still missing:\n")[2]
+        assert missing.startswith("## Clause 10\n") and "## Clause 39\n" in missing
+        assert "## Clause 9\n" not in missing
+
+    @pytest.mark.asyncio
+    async def test_restructured_remediation_with_fewer_headings_not_continued(self, service, cli):
+        """Test that a complete remediation merging sections is not treated as cut short"""
+        document = "# Agreement\n" + "".join(f"## Clause {n}\nTerms of clause {n}.\n" for n in range(40))
+        merged = "# Agreement\n## Terms\n" + "".join(f"Terms of clause {n}.\n" for n in range(40))
+        cli.outputs = {"Issues to Address": merged}
+
+        remediation = await service.generate_remediation(document, [{"id": "i1"}], "doc1")
+
+        assert remediation.success
+        assert remediation.remediated_content == merged.strip()
+        assert len(cli.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_remediation_preamble_dropped_without_retry(self, service, cli):
+        """Test that an introduction line before the document is removed instead of retried"""
+        document = "# Agreement\n" + "clause text\n" * 100
+        cli.outputs = {"Issues to Address": f"Here is the remediated document:\n\n{document}"}
+
+        remediation = await service.generate_remediation(document, [{"id": "i1"}], "doc1")
+
+        assert remediation.remediated_content == document.strip()
+        assert len(cli.calls) == 1
+        assert 'Issues to Address:\n[{"id":"i1"}]\n' in cli.calls[0][1]
+
+    @pytest.mark.parametrize("output, expected", [
+        ("Here is the remediated document:\n# Title", True),
+        ("# Title\nChanges made: none", False),
+        ("## Summary\nShort", True),
+        ("x" * 300 + " Below is", False),
+        ("", False),
+    ])
+    def test_summary_detected_from_first_line(self, service, output, expected):
+        """Test that summary openers are only looked for at the start of the first line"""
+        assert service._looks_like_summary(output) is expected
+
+    @pytest.mark.asyncio
+    async def test_consensus_aggregates_parallel_model_votes(self, service):
+        """Test that models vote in parallel and agreement is their mean pairwise Jaccard"""
+        service.cli = RecordingCLI(delay=0.05, outputs={
+            "answer as gpt-5": json.dumps({"valid_issues": ["a", "b"], "action_items": ["fix a"],
+                                           "priorities": {"a": "high"}, "quality_score": 70}),
+            "answer as claude-opus-4.1": json.dumps({"valid_issues": ["b", "a"], "action_items": ["fix a", "fix b"],
+                                                     "priorities": {"a": "high", "b": "low"}, "quality_score": 80}),
+            "answer as gpt-4.1": json.dumps({"valid_issues": ["a"], "priorities": {"a": "medium"}}),
+        })
+        analysis = {"general-purpose": AnalysisResult(
+            success=True, analysis={"issues": [{"id": "a"}, {"id": "b"}, {"id": "c"}]}
+        )}
+
+        result = await service.consensus_validation(analysis, "doc1")
+
+        assert result.success
+        assert service.cli.max_in_flight == 3
+        assert result.agreement_score == pytest.approx(2 / 3, abs=1e-3)
+        assert result.consensus["valid_issues"] == ["a", "b"]
+        assert result.consensus["priorities"] == {"a": "high", "b": "low"}
+        assert result.consensus["action_items"] == ["fix a", "fix b"]
+        assert result.consensus["quality_score"] == 75
+        assert set(result.consensus["models"]) == set(result.models_used)
+
+    @pytest.mark.asyncio
+    async def test_consensus_prompt_merges_duplicate_findings(self, service, cli):
+        """Test that findings repeated across agents reach the consensus prompt once"""
+        header = {"type": "security", "description": "Missing security header", "severity": "low", "location": "s1"}
+        analysis = {
+            "security-engineer": AnalysisResult(success=True, analysis={
+                "issues": [{**header, "id": "x"}, {"type": "clarity", "description": "Vague terms"}],
+                "recommendations": ["Add a security header", "Define terms"],
+            }),
+            "general-purpose": AnalysisResult(success=True, analysis={
+                "issues": [{**header, "id": "x", "description": " missing SECURITY header ", "severity": "high",
+                            "location": "s2"}],
+                "recommendations": ["add a security header"],
+            }),
+        }
+        cli.outputs = {"independent voter": json.dumps({"valid_issues": ["x"]})}
+
+        result = await service.consensus_validation(analysis, "doc1")
+        prompt = cli.calls[0][1]
+
+        assert result.consensus["valid_issues"] == ["x"]
+        assert prompt.count("ecurity header") == 2
+        issues = json.loads(prompt.split("Issues Identified:\n")[1].split("\n")[0])
+        assert issues == [
+            {"type": "security", "description": "Missing security header", "id": "x", "severity": "high",
+             "locations": ["s1", "s2"], "agents": ["security-engineer", "general-purpose"], "count": 2},
+            {"type": "clarity", "description": "Vague terms", "id": "issue_1",
+             "agents": ["security-engineer"], "count": 1},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_consensus_falls_back_to_unified_call(self, service, cli):
+        """Test that a model without a usable vote triggers one Zen consensus call"""
+        cli.outputs = {
+            "Build multi-model consensus validation": json.dumps({"agreement_score": 0.9}),
+            "answer as gpt-4.1": "I agree with the findings",
+            "independent voter": json.dumps({"valid_issues": []}),
+        }
+
+        result = await service.consensus_validation({}, "doc1")
+
+        assert result.success
+        assert result.consensus == {"agreement_score": 0.9}
+        assert result.agreement_score == 0.9
+        assert len(cli.calls) == 4
+        assert "Build multi-model consensus validation" in cli.calls[-1][1]
+
+    @pytest.mark.parametrize("fallback", [False, True])
+    @pytest.mark.asyncio
+    async def test_consensus_paths_report_valid_issues_alike(self, service, cli, fallback):
+        """Test that per-model and fallback consensus use the same valid_issues key"""
+        cli.outputs = {
+            "Build multi-model consensus validation": json.dumps({"valid_issues": ["i1"]}),
+            "answer as gpt-4.1": "no vote" if fallback else json.dumps({"valid_issues": ["i1"]}),
+            "independent voter": json.dumps({"valid_issues": ["i1"]}),
+        }
+        analysis = {"general-purpose": AnalysisResult(
+            success=True, analysis={"issues": [{"id": "i1", "type": "clarity"}]}
+        )}
+
+        result = await service.consensus_validation(analysis, "doc1")
+
+        assert result.success
+        assert len(cli.calls) == (4 if fallback else 3)
+        assert result.consensus["valid_issues"] == ["i1"]
+        assert "validated_issues" not in result.consensus
+
+    @pytest.mark.asyncio
+    async def test_workflow_runs_consensus_and_remediation_together(self, service):
+        """Test that consensus and remediation overlap once the analysis is done"""
+        document = "# Agreement\n" + "clause text\n" * 100
+        service.cli = RecordingCLI(delay=0.05, outputs={
+            "Issues to Address": document,
+            "independent voter": json.dumps({"valid_issues": []}),
+            "Compare the original": json.dumps({"quality_score": 90}),
+        })
+
+        results = await service.orchestrate_workflow("doc1", document, {"document_id": "doc1"})
+
+        consensus, remediation = results["steps"]["consensus"], results["steps"]["remediation"]
+        assert results["overall_status"] == "completed"
+        assert consensus["status"] == remediation["status"] == "completed"
+        assert consensus["start_offset_seconds"] < remediation["end_offset_seconds"]
+        assert remediation["start_offset_seconds"] < consensus["end_offset_seconds"]
+        assert results["final_quality_score"] == 90
+
+    @pytest.mark.asyncio
+    async def test_workflow_tolerates_string_issues(self, service, cli):
+        """Test that issues given as plain strings still reach remediation"""
+        document = "# Agreement\n" + "clause text\n" * 100
+        cli.outputs = {
+            "Issues to Address": document,
+            "independent voter": json.dumps({"valid_issues": []}),
+            "Compare the original": json.dumps({"quality_score": 90}),
+            "Using the general-purpose": json.dumps({"issues": ["Vague terms", {"id": ""}, {"id": 0}]}),
+        }
+
+        results = await service.orchestrate_workflow("doc1", document, {"document_id": "doc1"})
+
+        assert results["overall_status"] == "completed"
+        assert results["steps"]["remediation"]["status"] == "completed"
+        assert results["steps"]["remediation"]["issues_resolved"] == 3
+        assert service_module._issue_ids(["Vague terms", {"id": ""}, {"id": 0}, {}]) == (
+            "issue_0", "", 0, "issue_3"
+        )
+
+    @pytest.mark.asyncio
+    async def test_confident_analyses_are_cached_across_instances(self, service, cli, cache_dir):
+        """Test that repeated analyses are served from memory and then from disk"""
+        cli.outputs = {"security-engineer": json.dumps({"confidence": 0.9, "issues": [{"id": "s1"}]}),
+                       "general-purpose": json.dumps({"confidence": 0.2})}
+        metadata = {"document_id": "doc1", "content_type": "text/plain"}
+        agents = ["security-engineer", "general-purpose"]
+
+        first = await service.multi_agent_analysis("contract text", metadata, agents)
+        first["security-engineer"].analysis["issues"].append({"id": "mutated"})
+        second = await service.multi_agent_analysis("contract text", metadata, agents)
+
+        # Low-confidence analyses are asked again
+        assert len(cli.calls) == 3
+        assert second["security-engineer"].analysis == {"confidence": 0.9, "issues": [{"id": "s1"}]}
+        assert second["security-engineer"].confidence == 0.9
+        assert len(list(cache_dir.glob("analysis-*.json"))) == 1
+
+        restarted = ClaudeService()
+        restarted.cli = RecordingCLI()
+        cached = await restarted.multi_agent_analysis("contract text", metadata, ["security-engineer"])
+        changed = await restarted.multi_agent_analysis("contract text v2", metadata, ["security-engineer"])
+
+        assert cached["security-engineer"].analysis["issues"] == [{"id": "s1"}]
+        assert len(restarted.cli.calls) == 1
+        assert changed["security-engineer"].confidence == 0.5
+
+    @pytest.mark.asyncio
+    async def test_unparseable_analyses_are_not_cached(self, service, cli, cache_dir):
+        """Test that an empty analysis from an unparseable reply is asked again"""
+        cli.outputs = {"security-engineer": "Sorry, I could not analyze this."}
+        metadata = {"document_id": "doc1"}
+
+        first = await service.multi_agent_analysis("contract text", metadata, ["security-engineer"])
+        restarted = ClaudeService()
+        restarted.cli = RecordingCLI()
+        await restarted.multi_agent_analysis("contract text", metadata, ["security-engineer"])
+
+        assert first["security-engineer"].analysis == {}
+        assert len(restarted.cli.calls) == 1
+        assert not list(cache_dir.glob("analysis-*.json"))
+
+    @pytest.mark.asyncio
+    async def test_analysis_cache_keyed_on_sent_prompt(self, service, cli, monkeypatch):
+        """Test that a changed system prompt misses analyses cached under the old one"""
+        cli.outputs = {"general-purpose": json.dumps({"confidence": 0.9})}
+        metadata = {"document_id": "doc1"}
+
+        await service.multi_agent_analysis("contract text", metadata, ["general-purpose"])
+        await service.multi_agent_analysis("contract text", metadata, ["general-purpose"])
+        monkeypatch.setattr(service_module, "ANALYSIS_SYSTEM_PROMPT", "Analyze differently.")
+        await service.multi_agent_analysis("contract text", metadata, ["general-purpose"])
+
+        assert len(cli.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_quality_validation_cached_unless_empty(self, service, cli, monkeypatch):
+        """Test that validations are cached, except empty results and when disabled"""
+        cli.outputs = {"Compare the original": json.dumps({"quality_score": 80})}
+
+        first = await service.quality_validation("remediated", "original", "doc1")
+        second = await service.quality_validation("remediated", "original", "doc1")
+        assert first == second and second["quality_score"] == 80
+        assert len(cli.calls) == 1
+
+        cli.outputs = {"Compare the original": "not json", "Validate document quality": "not json"}
+        await service.quality_validation("remediated 2", "original", "doc1")
+        await service.quality_validation("remediated 2", "original", "doc1")
+        assert len(cli.calls) == 1 + 2 * 4
+
+        cli.outputs = {"Compare the original": json.dumps({"quality_score": 80})}
+        monkeypatch.setenv("CLAUDE_RESPONSE_CACHE", "false")
+        uncached = ClaudeService()
+        uncached.cli = cli
+        await uncached.quality_validation("remediated", "original", "doc1")
+        assert len(cli.calls) == 10
+
+    @pytest.mark.asyncio
+    async def test_memory_cache_keeps_recent_responses(self, service, cache_dir, monkeypatch):
+        """Test that the in-memory cache is bounded and evicted responses come from disk"""
+        monkeypatch.setattr(service_module, "RESPONSE_CACHE_MEMORY_ENTRIES", 2)
+        for n in range(3):
+            await service._cache_response(f"key{n}", {"n": n})
+        await service._get_cached_response("key1")
+        await service._cache_response("key3", {"n": 3})
+
+        assert list(service._response_cache) == ["key1", "key3"]
+        assert await service._get_cached_response("key0") == {"n": 0}
+        assert list(service._response_cache) == ["key3", "key0"]
+
+    @pytest.mark.parametrize("raw, expected", [
+        ('{"quality_score": 90}', {"quality_score": 90}),
+        ('Here is the result:\n```json\n{"a": "} not \\" closed {", "b": [1, {"c": 2}]}\n```\nDone.',
+         {"a": '} not " closed {', "b": [1, {"c": 2}]}),
+        ('Score "{high}" below: {"quality_score": 70} and {"ignored": true}', {"quality_score": 70}),
+        ('[{"quality_score": 90}]', {}),
+        ('see [1] {"ok": 2}', {"ok": 2}),
+        ('{bad "a": [1,2]} {"ok": 1}', {"ok": 1}),
+        ('{"quality_score": 90', {}),
+        ("no json here", {}),
+    ])
+    def test_json_output_recovered_from_commentary(self, service, raw, expected):
+        """Test that the first complete JSON object is parsed out of surrounding text"""
+        assert service._parse_json_output(raw, "test") == expected
+
+    @pytest.mark.asyncio
+    async def test_quality_fallback_parses_wrapped_json(self, service, cli):
+        """Test that the Zen fallback keeps a validation wrapped in commentary"""
+        cli.outputs = {"Compare the original": "not json",
+                       "Validate document quality": 'Validation:\n{"quality_score": 88, "improvements": ["x"]}'}
+
+        validation = await service.quality_validation("remediated", "original", "doc1")
+
+        assert validation["method"] == "fallback"
+        assert validation["quality_score"] == 88
+        assert validation["improvements"] == ["x"]
+
+    def test_services_share_cli_per_timeout(self, cache_dir, monkeypatch):
+        """Test that services built with the same timeout share one CLI wrapper"""
+        first, second = ClaudeService(), ClaudeService()
+        monkeypatch.setenv("CLAUDE_VALIDATION_TIMEOUT", "42")
+        third = ClaudeService()
+
+        assert first.cli is second.cli
+        assert third.cli is not first.cli and third.cli.timeout == 42
+
+    def test_dsl_parsed_once_until_files_change(self, tmp_path, monkeypatch):
+        """Test that instances share parsed DSL files and reparse edited ones"""
+        dsl_dir = tmp_path / "dsl"
+        dsl_dir.mkdir()
+        operations = dsl_dir / "unified-operations.yaml"
+        operations.write_text("prompt_templates:\n  analysis:\n    template: first {{ agent }}\n")
+        monkeypatch.setattr(service_module, "DSL_DIR", dsl_dir)
+
+        first, second = ClaudeService(), ClaudeService()
+        assert first.dsl_config is second.dsl_config
+        assert first._get_prompt_template("analysis") is first._compiled_templates["analysis"]
+        assert first._get_prompt_template("analysis").render(agent="writer") == "first writer"
+        assert first._get_prompt_template("missing") is None
+        assert first.agent_mappings == {}
+
+        operations.write_text("prompt_templates:\n  analysis:\n    template: second\n")
+        os.utime(operations, ns=(0, operations.stat().st_mtime_ns + 10**9))
+        assert ClaudeService()._get_prompt_template("analysis").render() == "second"
+
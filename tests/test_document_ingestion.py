@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Tests for the document ingestion pipeline script
+Covers format extraction, saved artifacts and batch ingestion
+"""
+
+import importlib.util
+import json
+import sys
+import pytest
+from pathlib import Path
+
+# Load scripts/document-ingestion.py (not importable by name because of the dash)
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "document-ingestion.py"
+spec = importlib.util.spec_from_file_location("document_ingestion", SCRIPT_PATH)
+document_ingestion = importlib.util.module_from_spec(spec)
+sys.modules["document_ingestion"] = document_ingestion
+spec.loader.exec_module(document_ingestion)
+
+DocumentIngestion = document_ingestion.DocumentIngestion
+
+MARKDOWN_SAMPLE = """# Title
+
+Intro with a [link](https://example.com).
+
+## Section Two
+
+```python
+print("hello")
+```
+
+### Deep heading
+"""
+
+
+class TestDocumentIngestion:
+    """Test single and batch document ingestion"""
+
+    @pytest.fixture
+    def pipeline(self, tmp_path):
+        return DocumentIngestion(output_dir=str(tmp_path / "out"))
+
+    def test_markdown_structure(self, pipeline, tmp_path):
+        """Test headings, code blocks and links extracted from Markdown"""
+        doc = tmp_path / "guide.md"
+        doc.write_text(MARKDOWN_SAMPLE)
+
+        result = pipeline.ingest_document(str(doc))
+        structure = json.loads((Path(result["output_path"]) / "structure.json").read_text())
+
+        assert result["format"] == "markdown"
+        assert result["fidelity"] == 1.0
+        assert [(h["level"], h["text"]) for h in structure["headings"]] == [
+            (1, "Title"), (2, "Section Two"), (3, "Deep heading")
+        ]
+        assert structure["links"] == [{"text": "link", "url": "https://example.com"}]
+        assert len(structure["code_blocks"]) == 1
+        assert [s["type"] for s in result["sections"]] == ["heading", "heading", "heading", "code"]
+
+    def test_plaintext_artifacts(self, pipeline, tmp_path):
+        """Test that all output artifacts are written for a plaintext document"""
+        doc = tmp_path / "notes.txt"
+        doc.write_text("alpha beta\ngamma\n")
+
+        result = pipeline.ingest_document(str(doc))
+        doc_dir = Path(result["output_path"])
+
+        assert result["doc_id"].startswith("notes_")
+        assert (doc_dir / "content.txt").read_text() == "alpha beta\ngamma\n"
+        assert json.loads((doc_dir / "structure.json").read_text()) == {
+            "lines": 3, "words": 3, "chars": 17
+        }
+        assert (doc_dir / "metadata.yaml").exists()
+        assert json.loads((doc_dir / "ingestion_report.json").read_text())["status"] == "success"
+
+    def test_doc_id_is_content_addressed(self, pipeline, tmp_path):
+        """Test that identical content yields identical hash parts"""
+        first = tmp_path / "one.txt"
+        second = tmp_path / "two.txt"
+        first.write_text("same content")
+        second.write_text("same content")
+
+        first_id = pipeline._generate_doc_id(first)
+        second_id = pipeline._generate_doc_id(second)
+
+        assert first_id.split("_")[-1] == second_id.split("_")[-1]
+        assert len(first_id.split("_")[-1]) == 12
+
+    def test_missing_document_raises(self, pipeline, tmp_path):
+        """Test that a missing file raises FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            pipeline.ingest_document(str(tmp_path / "missing.pdf"))
+
+    def test_ingest_many_reports_errors_in_order(self, pipeline, tmp_path):
+        """Test batch ingestion returns per-document results in input order"""
+        paths = []
+        for name in ["a.txt", "b.md"]:
+            doc = tmp_path / name
+            doc.write_text(f"# {name}\n")
+            paths.append(str(doc))
+        paths.append(str(tmp_path / "missing.txt"))
+
+        results = list(pipeline.ingest_many(paths, max_workers=2))
+
+        assert [r["status"] for r in results] == ["success", "success", "error"]
+        assert results[0]["format"] == "plaintext"
+        assert results[1]["format"] == "markdown"
+        assert results[2]["original_path"] == paths[2]
+
+    def test_reingest_uses_cached_result(self, pipeline, tmp_path, monkeypatch):
+        """Test that already-ingested content is not parsed again"""
+        doc = tmp_path / "guide.md"
+        doc.write_text(MARKDOWN_SAMPLE)
+        first = pipeline.ingest_document(str(doc))
+
+        def fail(*args):
+            raise AssertionError("content was re-extracted")
+
+        monkeypatch.setattr(pipeline, "_extract_content", fail)
+        cached = pipeline.ingest_document(str(doc))
+
+        assert cached["doc_id"] == first["doc_id"]
+        assert cached["sections"] == first["sections"]
+        assert cached["format"] == "markdown"
+
+    def test_force_bypasses_cache(self, pipeline, tmp_path, monkeypatch):
+        """Test that force=True re-extracts content"""
+        doc = tmp_path / "notes.txt"
+        doc.write_text("text")
+        pipeline.ingest_document(str(doc))
+
+        calls = []
+        original = pipeline._extract_content
+        monkeypatch.setattr(pipeline, "_extract_content",
+                            lambda *args: calls.append(args) or original(*args))
+        pipeline.ingest_document(str(doc), force=True)
+
+        assert len(calls) == 1
+
+    def test_streaming_failure_falls_back_to_plaintext(self, pipeline, tmp_path, monkeypatch):
+        """Test that a parser failing mid-stream leaves plaintext content, not a partial file"""
+        doc = tmp_path / "report.pdf"
+        doc.write_text("raw fallback text")
+
+        def broken_chunks():
+            yield "partial page"
+            raise ValueError("corrupt page stream")
+
+        monkeypatch.setattr(pipeline, "_extract_content",
+                            lambda *args: (broken_chunks(), {"pages": []}, 0.8))
+        result = pipeline.ingest_document(str(doc))
+
+        assert result["fidelity"] == 0.5
+        assert (Path(result["output_path"]) / "content.txt").read_text() == "raw fallback text"
+
+    @pytest.mark.skipif(not document_ingestion.HAS_PDF, reason="pypdf not installed")
+    def test_parallel_pdf_pages_match_serial(self, pipeline, monkeypatch):
+        """Test that thread-pool page extraction preserves page order and text"""
+        pdf_path = Path(__file__).parent.parent / "docs" / "NDA-Tony-yoobroo.pdf"
+        reader = document_ingestion._load_parser("pypdf").PdfReader(str(pdf_path))
+        serial = list(pipeline._extract_pdf_pages(pdf_path, reader))
+
+        monkeypatch.setattr(document_ingestion, "PDF_PARALLEL_MIN_PAGES", 1)
+        parallel = list(pipeline._extract_pdf_pages(pdf_path, reader))
+
+        assert parallel == serial
+
+    @pytest.mark.skipif(not document_ingestion.HAS_PDFIUM, reason="pypdfium2 not installed")
+    def test_pdfium_backend_extracts_pages(self, pipeline):
+        """Test the PDFium backend streams page text with normalized newlines"""
+        pdf_path = Path(__file__).parent.parent / "docs" / "NDA-Tony-yoobroo.pdf"
+        chunks, structure, fidelity = pipeline._extract_pdf(pdf_path)
+        content = "".join(chunks)
+
+        assert fidelity == 0.8
+        assert len(structure["pages"]) == 2
+        assert "\r" not in content
+        assert "NON-DISCLOSURE AGREEMENT" in structure["headings"]
+
+    def test_mmap_plaintext_matches_read_path(self, pipeline, tmp_path, monkeypatch):
+        """Test memory-mapped plaintext extraction counts like the in-memory path"""
+        doc = tmp_path / "log.txt"
+        doc.write_text("naïve café words\nsplit across\tchunk boundaries €\n" * 50)
+        chunks, expected, _ = pipeline._extract_plaintext(doc)
+        expected_content = "".join(chunks)
+
+        monkeypatch.setattr(document_ingestion, "MMAP_MIN_SIZE", 1)
+        monkeypatch.setattr(document_ingestion, "MMAP_CHUNK_SIZE", 7)
+        chunks, structure, fidelity = pipeline._extract_plaintext(doc)
+
+        assert "".join(chunks) == expected_content
+        assert structure == expected
+        assert fidelity == 0.5
+
+    def test_mmap_markdown_matches_read_path(self, pipeline, tmp_path, monkeypatch):
+        """Test memory-mapped Markdown scanning finds the same structure"""
+        doc = tmp_path / "big.md"
+        doc.write_text(MARKDOWN_SAMPLE.replace("Title", "Tïtle €") * 20)
+        chunks, expected, _ = pipeline._extract_markdown(doc)
+        expected_content = "".join(chunks)
+
+        monkeypatch.setattr(document_ingestion, "MMAP_MIN_SIZE", 1)
+        chunks, structure, _ = pipeline._extract_markdown(doc)
+
+        assert structure == expected
+        assert "".join(chunks) == expected_content
+
+    def test_saved_artifacts_without_orjson(self, pipeline, tmp_path, monkeypatch):
+        """Test that the stdlib JSON fallback writes the same structure as orjson"""
+        doc = tmp_path / "guide.md"
+        doc.write_text(MARKDOWN_SAMPLE.replace("Title", "Tïtle"))
+        expected = pipeline.ingest_document(str(doc))
+
+        monkeypatch.setattr(document_ingestion, "HAS_ORJSON", False)
+        result = pipeline.ingest_document(str(doc), force=True)
+        structure = json.loads((Path(result["output_path"]) / "structure.json").read_text(encoding="utf-8"))
+
+        assert structure["headings"][0]["text"] == "Tïtle"
+        assert result["sections"] == expected["sections"]
+        assert pipeline._load_cached_result(result["doc_id"], doc)["metadata"] == result["metadata"]
+
+    def test_write_file_batches_and_resumes_short_writes(self, tmp_path, monkeypatch):
+        """Test that gathered writes survive short writev calls and batch limits"""
+        real_writev = document_ingestion.os.writev
+        calls = []
+
+        def short_writev(fd, buffers):
+            calls.append(len(buffers))
+            return real_writev(fd, [bytes(buffers[0][:5])])
+
+        monkeypatch.setattr(document_ingestion.os, "writev", short_writev)
+        monkeypatch.setattr(document_ingestion, "WRITE_MAX_BUFFERS", 3)
+        chunks = [f"chunk-{i}é|".encode("utf-8") for i in range(10)] + [b""]
+        target = tmp_path / "out.txt"
+
+        document_ingestion._write_file(target, iter(chunks))
+
+        assert target.read_bytes() == b"".join(chunks)
+        assert max(calls) <= 3
+
+    @pytest.mark.skipif(not document_ingestion.HAS_HTML, reason="beautifulsoup4 not installed")
+    def test_html_structure_grouped_by_heading_level(self, pipeline, tmp_path, monkeypatch):
+        """Test single-pass HTML extraction keeps headings grouped by level"""
+        doc = tmp_path / "page.html"
+        doc.write_text(
+            "<html><body><h2 id='b'>Second</h2><h1>First</h1>"
+            "<script>var x;</script><p>Body <a href='/x'>link</a></p>"
+            "<img src='a.png' alt='pic'><h2>Third</h2></body></html>"
+        )
+        chunks, structure, _ = pipeline._extract_html(doc)
+
+        assert [(h["level"], h["text"]) for h in structure["headings"]] == [
+            ("h1", "First"), ("h2", "Second"), ("h2", "Third")
+        ]
+        assert structure["links"] == [{"text": "link", "href": "/x"}]
+        assert structure["images"] == [{"alt": "pic", "src": "a.png"}]
+        assert "var x" not in "".join(chunks)
+
+        monkeypatch.setattr(document_ingestion, "HTML_PARSER", "html.parser")
+        assert pipeline._extract_html(doc)[1] == structure
+
+    def test_pdf_headings_match_line_heuristic(self):
+        """Test PDF heading detection agrees with the per-line isupper() heuristic"""
+        text = ("NON-DISCLOSURE AGREEMENT\nShort\nALLCAPS but lower\n123456\nÉCOLE NATIONALE\n"
+                "ÉCOLE nationale\nTITLE\nTERMS AND CONDITIONS\r\nMixed Case Line\n\nFINAL SECTION")
+        expected = [line for line in text.split("\n") if line.isupper() and len(line) > 5]
+
+        assert document_ingestion._pdf_headings(text) == expected
+
+    def test_text_document_read_once_for_hash_and_parse(self, pipeline, tmp_path, monkeypatch):
+        """Test that text formats are hashed and parsed from a single read"""
+        doc = tmp_path / "guide.md"
+        doc.write_bytes(MARKDOWN_SAMPLE.replace("\n", "\r\n").encode("utf-8"))
+        expected_id = pipeline._generate_doc_id(doc)
+
+        reads = []
+        original = document_ingestion._read_source
+        monkeypatch.setattr(document_ingestion, "_read_source",
+                            lambda path: reads.append(path) or original(path))
+        result = pipeline.ingest_document(str(doc))
+
+        assert reads == [doc]
+        assert result["doc_id"] == expected_id
+        assert len(result["sections"]) == 4
+        assert "\r" not in (Path(result["output_path"]) / "content.txt").read_text()
+
+    @pytest.mark.parametrize("has_blake3", [True, False])
+    def test_doc_id_same_for_read_and_streamed_hash(self, pipeline, tmp_path, monkeypatch, has_blake3):
+        """Test that hashing an in-memory source matches hashing the file"""
+        if has_blake3 and not document_ingestion.HAS_BLAKE3:
+            pytest.skip("blake3 not installed")
+        monkeypatch.setattr(document_ingestion, "HAS_BLAKE3", has_blake3)
+        doc = tmp_path / "notes.txt"
+        doc.write_text("content addressed\n" * 100)
+
+        from_file = pipeline._generate_doc_id(doc)
+        from_source = pipeline._generate_doc_id(doc, document_ingestion._read_source(doc))
+
+        assert from_file == from_source
+
+    def test_plaintext_ingest_does_not_import_parsers(self, tmp_path):
+        """Test that document parsers are imported only by the extractor using them"""
+        import subprocess
+
+        doc = tmp_path / "notes.txt"
+        doc.write_text("plain words")
+        code = (
+            "import importlib.util, sys\n"
+            f"spec = importlib.util.spec_from_file_location('ingest', {str(SCRIPT_PATH)!r})\n"
+            "module = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(module)\n"
+            f"module.DocumentIngestion({str(tmp_path / 'out')!r}).ingest_document({str(doc)!r})\n"
+            "print(sorted({'pypdf', 'pypdfium2', 'docx', 'bs4', 'markdown'} & set(sys.modules)))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert output.stdout.strip() == "[]"
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_streamed_structure_json_matches_dump(self, monkeypatch, has_orjson):
+        """Test that item-by-item structure encoding equals a single dump"""
+        if has_orjson and not document_ingestion.HAS_ORJSON:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(document_ingestion, "HAS_ORJSON", has_orjson)
+        structures = [
+            {},
+            {"lines": 3, "words": 3, "chars": 17},
+            {"headings": [{"level": 1, "text": "Tïtle"}, "PLAIN HEADING"], "links": [],
+             "tables": [{"index": 0, "rows": 2, "cols": 3}], "nested": {"a": [1, 2]}},
+        ]
+
+        for structure in structures:
+            streamed = b"".join(document_ingestion._iter_json(structure))
+            assert streamed == document_ingestion._dump_json(structure)
+
+    def test_parse_error_falls_back_without_rereading(self, pipeline, tmp_path, monkeypatch):
+        """Test that a failed parse reuses the already-read bytes for plaintext"""
+        doc = tmp_path / "broken.md"
+        doc.write_bytes(b"# Heading\ninvalid \xff byte\n")
+
+        reads = []
+        original = document_ingestion._read_source
+        monkeypatch.setattr(document_ingestion, "_read_source",
+                            lambda path: reads.append(path) or original(path))
+        result = pipeline.ingest_document(str(doc))
+
+        assert reads == [doc]
+        assert result["fidelity"] == 0.5
+        assert (Path(result["output_path"]) / "content.txt").read_text() == "# Heading\ninvalid  byte\n"
+
+    def test_section_index_is_contiguous(self, pipeline):
+        """Test section indexes run 0..n-1 across headings, tables and code blocks"""
+        structure = {
+            "headings": [{"level": "Heading 1", "text": "Intro"}, "PLAIN PDF HEADING"],
+            "tables": [{"rows": 2, "cols": 3}, {"rows": 1, "cols": 1}],
+            "code_blocks": [{"index": 0, "length": 10}, {"index": 1, "length": 4}],
+        }
+        sections = pipeline._create_section_index(structure)
+
+        assert [s["index"] for s in sections] == list(range(6))
+        assert [s["type"] for s in sections] == ["heading"] * 2 + ["table"] * 2 + ["code"] * 2
+        assert sections[1]["title"] == "PLAIN PDF HEADING"
+        assert sections[1]["level"] == 1
+        assert sections[3]["dimensions"] == "1x1"
+
+    @pytest.mark.skipif(not (document_ingestion.HAS_PDF or document_ingestion.HAS_PDFIUM),
+                        reason="no PDF parser installed")
+    def test_pdf_with_uppercase_headings_ingests(self, pipeline):
+        """Test that heuristic PDF headings are indexed as sections"""
+        pdf_path = Path(__file__).parent.parent / "docs" / "NDA-Tony-yoobroo.pdf"
+        result = pipeline.ingest_document(str(pdf_path))
+
+        assert result["format"] == "pdf"
+        assert result["sections"][0]["title"] == "NON-DISCLOSURE AGREEMENT"
+
+    def test_failed_ingest_leaves_no_document_directory(self, pipeline, tmp_path, monkeypatch):
+        """Test that an ingest failing before save publishes nothing"""
+        doc = tmp_path / "notes.txt"
+        doc.write_text("text")
+
+        def fail(*args):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(pipeline, "_save_content", fail)
+        with pytest.raises(RuntimeError):
+            pipeline.ingest_document(str(doc))
+
+        assert list(pipeline.output_dir.iterdir()) == []
+
+    def test_force_reingest_replaces_document_directory(self, pipeline, tmp_path):
+        """Test that re-ingesting swaps in a complete directory and cleans up"""
+        doc = tmp_path / "notes.txt"
+        doc.write_text("text")
+        first = pipeline.ingest_document(str(doc))
+        (Path(first["output_path"]) / "stale.txt").write_text("old")
+
+        second = pipeline.ingest_document(str(doc), force=True)
+        doc_dir = Path(second["output_path"])
+
+        assert second["output_path"] == first["output_path"]
+        assert sorted(p.name for p in doc_dir.iterdir()) == [
+            "content.txt", "ingestion_report.json", "metadata.yaml", "structure.json"
+        ]
+        assert [p.name for p in pipeline.output_dir.iterdir()] == [doc_dir.name]
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Tests for the remediation generation script
+Covers template loading, the issue pipeline and saved outputs
+"""
+
+import importlib.util
+import json
+import shutil
+import sys
+import pytest
+import yaml
+from jinja2 import FileSystemBytecodeCache, Template
+from pathlib import Path
+
+# Load scripts/generate-remediation.py (not importable by name because of the dash)
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "generate-remediation.py"
+spec = importlib.util.spec_from_file_location("generate_remediation", SCRIPT_PATH)
+generate_remediation = importlib.util.module_from_spec(spec)
+sys.modules["generate_remediation"] = generate_remediation
+spec.loader.exec_module(generate_remediation)
+
+RemediationGenerator = generate_remediation.RemediationGenerator
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates" / "remediation"
+
+CONTENT_SAMPLE = """# API Documentation
+
+## Overview
+This is the API documentation.
+
+## Authentication
+The API uses session tokens for authentication.
+"""
+
+ISSUES_SAMPLE = [
+    {
+        "id": "iss_001",
+        "type": "clarity",
+        "severity": "medium",
+        "confidence": 0.85,
+        "location": {"type": "section", "ref": {"path": "/api/authentication", "line_range": [3, 6]}},
+        "evidence": {"snippets": ["The 'session token' is used throughout without definition"]},
+        "remediation": {
+            "template_id": "define-term",
+            "parameters": {"term": "session token", "definition": "A temporary credential"}
+        }
+    },
+    {
+        "id": "iss_002",
+        "type": "completeness",
+        "severity": "high",
+        "confidence": 0.92,
+        "location": {"type": "section", "ref": {"path": "/security"}},
+        "remediation": {
+            "template_id": "add-section",
+            "parameters": {"section_title": "Security Considerations", "section_type": "security"}
+        }
+    },
+    {
+        "id": "iss_003",
+        "type": "structure",
+        "severity": "low",
+        "confidence": 0.78,
+        "location": {"type": "document"},
+        "remediation": {"template_id": "fix-structure"}
+    }
+]
+
+
+class TestRemediationGenerator:
+    """Test remediation generation from issues and templates"""
+
+    @pytest.fixture
+    def templates_dir(self, tmp_path):
+        # Copy so template caches are not written into the repository
+        return Path(shutil.copytree(TEMPLATES_DIR, tmp_path / "templates"))
+
+    @pytest.fixture
+    def generator(self, templates_dir, tmp_path):
+        return RemediationGenerator(templates_dir=str(templates_dir), output_dir=str(tmp_path / "out"))
+
+    @pytest.fixture
+    def content_file(self, tmp_path):
+        path = tmp_path / "content.txt"
+        path.write_text(CONTENT_SAMPLE)
+        return path
+
+    def test_templates_loaded_by_id(self, generator):
+        """Test that every template file is loaded under its template id"""
+        assert set(generator.templates) == {"add-section", "define-term", "fix-structure"}
+        assert generator.templates["define-term"]["generation"]["method"] == "insert"
+
+    def test_template_cache_reused_until_templates_change(self, generator, templates_dir, tmp_path, monkeypatch):
+        """Test that parsed templates are cached and invalidated by edits"""
+        def fail(*args):
+            raise AssertionError("templates were parsed again")
+
+        monkeypatch.setattr(RemediationGenerator, "_parse_templates", fail)
+        cached = RemediationGenerator(templates_dir=str(templates_dir), output_dir=str(tmp_path / "out"))
+        assert cached.templates == generator.templates
+
+        monkeypatch.undo()
+        template_file = templates_dir / "define-term.yaml"
+        template_file.write_text(template_file.read_text().replace("Term Definition Template", "Renamed"))
+        reparsed = RemediationGenerator(templates_dir=str(templates_dir), output_dir=str(tmp_path / "out"))
+
+        assert reparsed.templates["define-term"]["name"] == "Renamed"
+        assert len(list(templates_dir.glob(".cache_*.pkl"))) == 1
+
+    def test_parallel_template_parse_matches_serial(self, generator, templates_dir, monkeypatch):
+        """Test that large template sets parsed on a thread pool match a serial parse"""
+        source = (templates_dir / "define-term.yaml").read_text()
+        for n in range(generate_remediation.TEMPLATE_PARALLEL_MIN_FILES):
+            (templates_dir / f"extra-{n}.yaml").write_text(source.replace("id: define-term", f"id: extra-{n}"))
+        template_files = sorted(templates_dir.glob("*.yaml"))
+
+        parallel = generator._parse_templates(template_files)
+        monkeypatch.setattr(generate_remediation, "TEMPLATE_PARALLEL_MIN_FILES", len(template_files) + 1)
+        serial = generator._parse_templates(template_files)
+
+        assert list(parallel) == list(serial)
+        assert parallel == serial
+        assert len(parallel) == len(template_files)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("suffix", [".yaml", ".json"])
+    async def test_generate_remediation_outputs(self, generator, tmp_path, content_file, suffix):
+        """Test an end-to-end run from a YAML or JSON issues file"""
+        issues_file = tmp_path / f"issues{suffix}"
+        if suffix == ".yaml":
+            issues_file.write_text(yaml.safe_dump({"issues": ISSUES_SAMPLE}))
+        else:
+            issues_file.write_text(json.dumps({"issues": ISSUES_SAMPLE}))
+
+        result = await generator.generate_remediation("doc", str(issues_file), str(content_file))
+        paths = result["output_paths"]
+
+        assert result["issues_processed"] == 3
+        assert result["issues_resolved"] == 3
+        assert result["statistics"]["by_category"] == {"clarity": 1, "completeness": 1, "structure": 1}
+        assert Path(paths["document"]).read_text().startswith("# API Documentation")
+        assert json.loads(Path(paths["validation_report"]).read_text())["results"]
+        assert yaml.safe_load(Path(paths["summary"]).read_text())["doc_id"] == "doc"
+
+    def test_normalize_issues_dedups_and_generates_ids(self, generator):
+        """Test duplicate type/location issues are dropped and missing ids generated"""
+        issues = [
+            {"type": "clarity", "location": {"ref": {"path": "/a"}}},
+            {"type": "clarity", "location": {"ref": {"path": "/a"}}, "id": "dup"},
+            {"type": "clarity", "location": {"ref": {"path": "/b"}}, "id": "keep"},
+            {"type": "structure"},
+        ]
+        normalized = generator._normalize_issues(issues)
+
+        assert [i.type for i in normalized] == ["clarity", "clarity", "structure"]
+        assert normalized[1].id == "keep"
+        assert len(normalized[0].id) == 16
+        assert normalized[0].id != normalized[2].id
+        assert normalized[2].severity == "medium"
+        assert normalized[2].location == {}
+        assert not hasattr(normalized[2], "__dict__")
+
+    def test_normalize_issues_keeps_non_string_fields(self, generator):
+        """Test that null or non-string type and severity pass through normalization"""
+        issues = [
+            {"id": "a", "type": None, "severity": None},
+            {"id": "b", "type": 3, "severity": 2, "location": {"ref": {"path": "/b"}}},
+        ]
+        normalized = generator._normalize_issues(issues)
+
+        assert [(i.type, i.severity) for i in normalized] == [(None, None), (3, 2)]
+
+    def test_clarity_check_treats_term_literally(self, generator):
+        """Test that quoted terms with regex metacharacters are matched literally"""
+        issue = {"type": "clarity", "evidence": {"snippets": ["The term 'C++ (v2' is undefined"]}}
+
+        assert generator._check_issue_addressed("Uses C++ (v2 (a language) here", issue)
+        assert not generator._check_issue_addressed("Uses C (v2 without a definition", issue)
+
+    def test_validation_scan_matches_per_issue_checks(self, generator):
+        """Test the single-pass document scan agrees with checking issues one by one"""
+        document = "## Overview\nThe API key (a secret) and session token are used.\nSESSION (login)\n"
+        issues = [
+            {"type": "clarity", "evidence": {"snippets": [f"uses '{term}'"]}}
+            for term in ["API", "API key", "session token", "Session", "missing"]
+        ] + [
+            {"type": "completeness", "remediation": {"parameters": {"section_title": title}}}
+            for title in ["overview", "Over", "Security"]
+        ] + [{"type": "structure"}] * 2
+
+        report = generator._validate_document(document, issues)
+
+        assert [r["addressed"] for r in report["results"]] == [
+            True, True, False, True, False, True, True, False, False, False
+        ]
+        assert [r["addressed"] for r in report["results"]] == [
+            generator._check_issue_addressed(document, issue) for issue in issues
+        ]
+        assert generator._validate_document(document + "### Usage\n", issues)["results"][-1]["addressed"]
+
+    def test_generate_document_interleaves_inserts(self, generator):
+        """Test that inserts land at their lines and rewrites are appended"""
+        def insert(line, content):
+            return {"method": "insert", "content": content,
+                    "location": {"ref": {"line_range": [line]}}}
+
+        remediations = [
+            insert(2, "second-a"),
+            {"method": "rewrite", "content": "rewritten"},
+            insert(1, "first"),
+            insert(2, "second-b"),
+            insert(0, "ignored"),
+        ]
+        document = generator._generate_document("l0\nl1\nl2", remediations)
+
+        assert document.split("\n") == [
+            "l0", "first", "l1", "second-b", "second-a", "l2", "", "rewritten"
+        ]
+
+    def test_generate_document_orders_inserts_past_the_end(self, generator):
+        """Test that inserts at or past the last line keep the list-insert order"""
+        def insert(line, content):
+            return {"method": "insert", "content": content,
+                    "location": {"ref": {"line_range": [line]}}}
+
+        assert generator._generate_document("a", [insert(1, "X0"), insert(6, "X1")]) == "a\nX0\nX1"
+
+        remediations = [
+            insert(5, "five"),
+            insert(3, "three"),
+            insert(2, "two-a"),
+            insert(9, "nine"),
+            insert(2, "two-b"),
+        ]
+        document = generator._generate_document("l0\nl1", remediations)
+
+        assert document.split("\n") == ["l0", "l1", "two-b", "two-a", "nine", "three", "five"]
+
+    def test_patterns_compiled_once_and_bytecode_cached(self, templates_dir, tmp_path, monkeypatch):
+        """Test that patterns compile once per run and later runs reuse the bytecode"""
+        cache_dir = tmp_path / "bytecode"
+        cache_dir.mkdir()
+        monkeypatch.setattr(generate_remediation, "FileSystemBytecodeCache",
+                            lambda: FileSystemBytecodeCache(str(cache_dir)))
+
+        issues = [
+            {"type": "clarity", "severity": "high", "location": {"ref": {"path": f"/{n}"}},
+             "evidence": {"snippets": [f"'term{n}' is undefined"]}}
+            for n in range(3)
+        ]
+
+        def render(compile_calls):
+            generator = RemediationGenerator(templates_dir=str(templates_dir), output_dir=str(tmp_path / "out"))
+            compile_source = generator._pattern_env.compile
+            monkeypatch.setattr(generator._pattern_env, "compile",
+                                lambda source, *args: compile_calls.append(source) or compile_source(source, *args))
+            assignments = generator._select_templates(generator._normalize_issues(issues))
+            return generator._generate_remediations(assignments, CONTENT_SAMPLE), assignments
+
+        first_compiles, cached_compiles = [], []
+        remediations, assignments = render(first_compiles)
+        cached, _ = render(cached_compiles)
+
+        pattern = TEMPLATES_DIR.joinpath("define-term.yaml").read_text()
+        pattern = yaml.safe_load(pattern)["template"]["generation"]["patterns"]["detailed_definition"]
+        assert len(first_compiles) == 1
+        assert cached_compiles == []
+        assert all(r["content"] == Template(pattern).render(**a["parameters"])
+                   for r, a in zip(remediations, assignments))
+        assert [r["content"] for r in cached] == [r["content"] for r in remediations]
+
+    def test_json_fallback_matches_orjson(self, monkeypatch):
+        """Test that stdlib and orjson serialization produce equivalent JSON"""
+        data = {"score": 66.7, "results": [{"issue_id": "é", "addressed": True}], 1: None}
+        encoded = generate_remediation._dump_json(data)
+
+        monkeypatch.setattr(generate_remediation, "HAS_ORJSON", False)
+        fallback = generate_remediation._dump_json(data)
+
+        assert generate_remediation._load_json(encoded) == json.loads(fallback)
+
+    def test_plain_patterns_skip_jinja_with_same_output(self, generator, monkeypatch):
+        """Test that patterns without Jinja syntax render as Jinja would without compiling"""
+        monkeypatch.setattr(generator._pattern_env, "compile", lambda *args: pytest.fail("compiled"))
+        params = {"term": "API", "definition": "An interface", "examples": ["a"]}
+
+        for template_id, template in generator.templates.items():
+            for pattern_name, pattern in template["generation"]["patterns"].items():
+                if any(marker in pattern for marker in generate_remediation.JINJA_MARKERS):
+                    continue
+                compiled = generator._compile_pattern(f"{template_id}/{pattern_name}")
+                assert compiled == Template(pattern).render(**params)
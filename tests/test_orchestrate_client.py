@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Tests for the orchestration API client
+Runs the client against a local aiohttp server standing in for the API
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+from contextlib import asynccontextmanager
+from pathlib import Path
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Import our modules
+import sys
+sys.path.append(str(Path(__file__).parent.parent / "scripts"))
+
+import orchestrate_client
+from orchestrate_client import OrchestrationClient
+
+
+class FakeAPI:
+    """Minimal DocAutomate API serving scripted orchestration statuses"""
+
+    def __init__(self, statuses, events=True, batch=True, event_delay=0.0, cut_stream=False):
+        self.statuses = list(statuses)
+        self.event_delay = event_delay
+        # Drop the event stream connection after its first event
+        self.cut_stream = cut_stream
+        self.polls = 0
+        self.uploads = []
+        self.orchestrations = []
+        self.batches = []
+        self.payloads = []
+        self.streams_open = 0
+        self.max_streams_open = 0
+        # Statuses answered before serving, per path
+        self.failures = {}
+        self.requests = []
+
+        self.app = web.Application(middlewares=[self.fail_first])
+        self.app.router.add_post("/documents/upload", self.upload)
+        self.app.router.add_post("/orchestrate/workflow", self.orchestrate)
+        if batch:
+            self.app.router.add_post("/orchestrate/workflow:batch", self.orchestrate_batch)
+        self.app.router.add_get("/orchestrate/runs/{run_id}", self.run_status)
+        self.app.router.add_get("/documents/{document_id}", self.document)
+        if events:
+            self.app.router.add_get("/orchestrate/runs/{run_id}/events", self.run_events)
+
+    @web.middleware
+    async def fail_first(self, request, handler):
+        self.requests.append((request.method, request.path))
+        failures = self.failures.get(request.path)
+        if failures:
+            await request.read()
+            return web.Response(status=failures.pop(0))
+        return await handler(request)
+
+    async def upload(self, request):
+        data = await request.post()
+        self.uploads.append(data["file"].file.read())
+        return web.json_response({"document_id": data["file"].filename})
+
+    async def orchestrate(self, request):
+        payload = await request.json()
+        self.orchestrations.append(payload["document_id"])
+        self.payloads.append(payload)
+        return web.json_response({"orchestration_id": f"orch_{payload['document_id']}"})
+
+    async def orchestrate_batch(self, request):
+        payload = await request.json()
+        self.batches.append([item["document_id"] for item in payload])
+        self.payloads.extend(payload)
+        return web.json_response([{"orchestration_id": f"orch_{item['document_id']}"} for item in payload])
+
+    async def run_status(self, request):
+        status = self.statuses[min(self.polls, len(self.statuses) - 1)]
+        self.polls += 1
+        return web.json_response(status)
+
+    async def run_events(self, request):
+        self.streams_open += 1
+        self.max_streams_open = max(self.max_streams_open, self.streams_open)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        try:
+            for status in self.statuses:
+                await asyncio.sleep(self.event_delay)
+                await response.write(b": keep-alive\n\n")
+                # Split the event across writes to exercise reassembly
+                event = f"data: {json.dumps(status)}\r\n\r\n".encode()
+                await response.write(event[:7])
+                await response.write(event[7:])
+                if self.cut_stream:
+                    await response.write(b"data: {")
+                    request.transport.close()
+                    return response
+        finally:
+            self.streams_open -= 1
+        return response
+
+    async def document(self, request):
+        return web.json_response({"document_id": request.match_info["document_id"]})
+
+    @asynccontextmanager
+    async def client(self, session=None):
+        server = TestServer(self.app)
+        await server.start_server()
+        try:
+            async with OrchestrationClient(str(server.make_url("")), session=session) as client:
+                yield client
+        finally:
+            await server.close()
+
+
+RUNNING = {"status": "running", "current_step": "analysis"}
+COMPLETED = {"status": "completed", "results": {"summary": "x" * 200000}}
+
+
+class TestOrchestrationClient:
+    """Test the orchestration client against a fake API"""
+
+    @pytest.mark.asyncio
+    async def test_process_document_follows_event_stream(self, tmp_path):
+        """Test an end-to-end run that completes through the status event stream"""
+        document = tmp_path / "report.txt"
+        document.write_text("quarterly report")
+        api = FakeAPI([RUNNING, COMPLETED])
+
+        async with api.client() as client:
+            result = await client.process_document(str(document))
+
+        assert api.uploads == [b"quarterly report"]
+        assert api.polls == 0
+        assert result["orchestration_id"] == "orch_report.txt"
+        assert result["status"] == COMPLETED
+        assert result["results"] == {"document_id": "report.txt"}
+
+    @pytest.mark.asyncio
+    async def test_polling_fallback_backs_off_and_resets_on_progress(self, monkeypatch):
+        """Test that servers without the event stream are polled with backoff"""
+        api = FakeAPI(
+            [RUNNING, RUNNING, RUNNING, {"status": "running", "current_step": "validation"},
+             RUNNING | {"current_step": "validation"}, {"status": "failed"}],
+            events=False
+        )
+        delays = []
+        sleep = asyncio.sleep
+
+        async def record_sleep(delay, *args):
+            # asyncio is shared with aiohttp, which yields with sleep(0)
+            if delay:
+                delays.append(round(delay, 3))
+            await sleep(0)
+
+        async with api.client() as client:
+            monkeypatch.setattr(orchestrate_client.asyncio, "sleep", record_sleep)
+            status = await client.wait_for_completion(
+                "orch_1", timeout=30, poll_interval=1.0, max_poll_interval=2.0
+            )
+
+        assert status == {"status": "failed"}
+        assert delays == [1.0, 1.7, 2.0, 1.0, 1.7]
+
+    @pytest.mark.asyncio
+    async def test_dropped_event_stream_falls_back_to_polling(self):
+        """Test that a stream cut before the terminal event leaves the rest to polling"""
+        api = FakeAPI([RUNNING, COMPLETED], cut_stream=True)
+
+        async with api.client() as client:
+            status = await client.wait_for_completion("orch_1", timeout=10, poll_interval=0.01)
+
+        assert api.requests[-1] == ("GET", "/orchestrate/runs/orch_1")
+        assert api.polls >= 1
+        assert status == COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        """Test that a run that never finishes raises after the timeout"""
+        api = FakeAPI([RUNNING])
+
+        async with api.client() as client:
+            with pytest.raises(TimeoutError, match="timed out after 0.5 seconds"):
+                await client.wait_for_completion("orch_1", timeout=0.5, poll_interval=0.05)
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_event_stream(self):
+        """Test that no unbounded event stream is opened once the deadline has passed"""
+        api = FakeAPI([COMPLETED], event_delay=60)
+
+        async with api.client() as client:
+            with pytest.raises(TimeoutError, match="timed out after 0 seconds"):
+                await asyncio.wait_for(client.wait_for_completion("orch_1", timeout=0), 5)
+
+        assert ("GET", "/orchestrate/runs/orch_1/events") not in api.requests
+
+    @pytest.mark.asyncio
+    async def test_upload_missing_file(self, tmp_path):
+        """Test that uploading a missing file fails before any request"""
+        api = FakeAPI([COMPLETED])
+
+        async with api.client() as client:
+            with pytest.raises(FileNotFoundError, match="Document not found"):
+                await client.upload_document(str(tmp_path / "missing.pdf"))
+
+        assert api.uploads == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batch", [True, False])
+    async def test_process_documents_keeps_order_and_bounds_concurrency(self, tmp_path, batch):
+        """Test that batch processing returns results in input order within the limit"""
+        paths = []
+        for n in range(6):
+            path = tmp_path / f"doc{n}.txt"
+            path.write_text(str(n))
+            paths.append(str(path))
+        names = [f"doc{n}.txt" for n in range(6)]
+        api = FakeAPI([RUNNING, COMPLETED], batch=batch, event_delay=0.05)
+
+        async with api.client() as client:
+            results = await client.process_documents(paths, max_concurrency=2)
+
+        assert [r["document_id"] for r in results] == names
+        assert [r["orchestration_id"] for r in results] == [f"orch_{name}" for name in names]
+        assert api.max_streams_open == 2
+        if batch:
+            assert api.batches == [names] and api.orchestrations == []
+        else:
+            assert api.batches == [] and sorted(api.orchestrations) == names
+
+    @pytest.mark.asyncio
+    async def test_new_session_warms_a_connection(self):
+        """Test that a client with its own session opens a connection on entry"""
+        api = FakeAPI([COMPLETED])
+
+        async with api.client() as client:
+            await client._warmup
+            assert api.requests == [("HEAD", "/")]
+            await client.wait_for_completion("orch_1")
+
+        assert api.requests[1:] == [("GET", "/orchestrate/runs/orch_1/events")]
+
+    @pytest.mark.asyncio
+    async def test_warm_up_failure_is_silent(self, monkeypatch):
+        """Test that an unreachable API fails on the first request, not on entry"""
+        monkeypatch.setattr(orchestrate_client, "RETRY_BASE_DELAY", 0)
+        async with OrchestrationClient("http://127.0.0.1:9") as client:
+            await client._warmup
+            with pytest.raises(aiohttp.ClientConnectorError):
+                await client.get_document_status("doc")
+
+    @pytest.mark.asyncio
+    async def test_shared_session_outlives_clients(self):
+        """Test that clients given the default session reuse it and leave it open"""
+        api = FakeAPI([COMPLETED])
+        session = orchestrate_client.get_default_session()
+
+        try:
+            for _ in range(2):
+                async with api.client(session=orchestrate_client.get_default_session()) as client:
+                    assert client.session is session
+                    await client.wait_for_completion("orch_1")
+                assert not session.closed
+
+            async with api.client() as client:
+                owned = client.session
+                assert owned is not session
+            assert owned.closed and client.session is None
+        finally:
+            await session.close()
+
+        fresh = orchestrate_client.get_default_session()
+        assert fresh is not session
+        await fresh.close()
+
+    @pytest.mark.asyncio
+    async def test_rejected_requests_are_retried(self, tmp_path, monkeypatch):
+        """Test that 429/503 answers are retried with the upload body resent whole"""
+        monkeypatch.setattr(orchestrate_client, "RETRY_BASE_DELAY", 0)
+        document = tmp_path / "report.txt"
+        document.write_text("quarterly report")
+        api = FakeAPI([RUNNING, COMPLETED], events=False)
+        api.failures = {"/documents/upload": [503, 429], "/orchestrate/runs/orch_1": [503]}
+
+        async with api.client() as client:
+            document_id = await client.upload_document(str(document))
+            status = await client.wait_for_completion("orch_1", poll_interval=0.01)
+
+        assert document_id == "report.txt"
+        assert api.uploads == [b"quarterly report"]
+        assert api.requests.count(("POST", "/documents/upload")) == 3
+        assert status == COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_retries_are_bounded_and_skip_server_errors(self, monkeypatch):
+        """Test that retries stop after the budget and 500s are not retried"""
+        monkeypatch.setattr(orchestrate_client, "RETRY_BASE_DELAY", 0)
+        attempts = orchestrate_client.RETRY_ATTEMPTS
+        api = FakeAPI([COMPLETED])
+        api.failures = {"/orchestrate/workflow": [500], "/documents/doc": [503] * (attempts + 1)}
+
+        async with api.client() as client:
+            with pytest.raises(aiohttp.ClientResponseError) as error:
+                await client.orchestrate("doc")
+            assert error.value.status == 500
+            with pytest.raises(aiohttp.ClientResponseError) as error:
+                await client.get_document_status("doc")
+            assert error.value.status == 503
+
+        assert api.requests.count(("POST", "/orchestrate/workflow")) == 1
+        assert api.requests.count(("GET", "/documents/doc")) == attempts
+
+    @pytest.mark.asyncio
+    async def test_orchestrate_sends_defaults_unless_overridden(self):
+        """Test that default agents and models are sent as JSON lists"""
+        api = FakeAPI([COMPLETED])
+
+        async with api.client() as client:
+            await client.orchestrate("doc1")
+            await client.orchestrate_batch(["doc2"], agents=["technical-writer"], models=["gpt-5"])
+
+        assert api.payloads[0]["agents"] == list(orchestrate_client.DEFAULT_AGENTS)
+        assert api.payloads[0]["models"] == list(orchestrate_client.DEFAULT_MODELS)
+        assert api.payloads[1]["agents"] == ["technical-writer"]
+        assert api.payloads[1]["models"] == ["gpt-5"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_processing_releases_connections(self, tmp_path):
+        """Test that cancelling a run mid-wait closes its stream and session"""
+        document = tmp_path / "report.txt"
+        document.write_text("quarterly report")
+        api = FakeAPI([RUNNING] * 100, event_delay=0.05)
+
+        async with api.client() as client:
+            task = asyncio.create_task(client.process_document(str(document)))
+            while not api.streams_open:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            session = client.session
+            assert not session.connector._acquired
+
+        assert session.closed
+
+    @pytest.mark.parametrize("pretty", [False, True])
+    def test_json_fallback_matches_orjson(self, monkeypatch, pretty):
+        """Test that stdlib and orjson output decode to the same payload"""
+        payload = {"document_id": "d", "agents": ["general-purpose"], "config": {"ratio": 0.5}}
+        encoded = orchestrate_client._dump_json(payload, pretty=pretty)
+
+        monkeypatch.setattr(orchestrate_client, "HAS_ORJSON", False)
+        fallback = orchestrate_client._dump_json(payload, pretty=pretty)
+
+        assert orchestrate_client._load_json(encoded) == orchestrate_client._load_json(fallback) == payload
+        assert (b"\n  " in encoded) is (b"\n  " in fallback) is pretty
+
+    def test_format_results_renders_steps(self):
+        """Test that the results summary is rendered as one string"""
+        results = {
+            "document_id": "d", "orchestration_id": "o", "status": {"status": "completed"},
+            "results": {"metadata": {"orchestration_results": {
+                "final_quality_score": 90, "duration_seconds": 3,
+                "steps": {"analysis": {"status": "completed"}, "validation": {"status": "failed"},
+                          "remediation": {}}
+            }}}
+        }
+        text = orchestrate_client.format_results(results)
+
+        assert "Status: completed\n" in text
+        assert "Quality Score: 90%" in text
+        assert "  [✓] analysis: completed\n  [✗] validation: failed\n  [?] remediation: unknown\n" in text
+        assert text.endswith("=" * 60 + "\n")
+
+    def test_format_results_renders_queued_status(self):
+        """Test that results returned without waiting render their string status"""
+        results = {"document_id": "d", "orchestration_id": "o", "status": "queued"}
+
+        text = orchestrate_client.format_results(results)
+
+        assert "Status: queued\n" in text
+
+
+class TestOrchestrationEndpoints:
+    """Test the API's batch orchestration and status event endpoints"""
+
+    @pytest.fixture
+    def api_client(self, monkeypatch):
+        import api
+        from fastapi.testclient import TestClient
+
+        documents = {"doc1": object(), "doc2": object()}
+        started = []
+
+        def register(orchestration_id, request, document):
+            api.orchestration_status[orchestration_id] = {"status": "queued", "current_step": None}
+
+            async def run():
+                started.append(request.document_id)
+                api.orchestration_status[orchestration_id].update(status="completed", current_step="completed")
+            return run
+
+        monkeypatch.setattr(api.document_ingester, "get_document", documents.get)
+        monkeypatch.setattr(api, "_register_orchestration", register)
+        monkeypatch.setattr(api, "ORCHESTRATION_EVENT_INTERVAL", 0.01)
+        return api, TestClient(api.app), started
+
+    def test_batch_queues_every_document(self, api_client):
+        """Test that a batch returns one queued run per document and runs them all"""
+        api, client, started = api_client
+
+        response = client.post("/orchestrate/workflow:batch",
+                               json=[{"document_id": "doc1"}, {"document_id": "doc2"}])
+
+        assert response.status_code == 200
+        assert [r["document_id"] for r in response.json()] == ["doc1", "doc2"]
+        assert all(r["status"] == "queued" for r in response.json())
+        assert sorted(started) == ["doc1", "doc2"]
+
+    def test_batch_with_missing_document_queues_nothing(self, api_client):
+        """Test that one missing document rejects the whole batch"""
+        api, client, started = api_client
+
+        response = client.post("/orchestrate/workflow:batch",
+                               json=[{"document_id": "doc1"}, {"document_id": "nope"}])
+
+        assert response.status_code == 404
+        assert "nope" in response.json()["detail"]
+        assert started == []
+
+    def test_event_stream_ends_with_terminal_status(self, api_client):
+        """Test that the status stream emits changes and closes after completion"""
+        api, client, _ = api_client
+        status = {"status": "running", "current_step": "analysis"}
+        api.orchestration_status["orch_stream"] = status
+
+        # The test client buffers the whole stream, so progress comes from a timer
+        timer = threading.Timer(0.1, status.update, kwargs={"status": "completed", "current_step": "completed"})
+        timer.start()
+        response = client.get("/orchestrate/runs/orch_stream/events")
+        timer.join()
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [json.loads(line[5:]) for line in response.text.splitlines() if line.startswith("data:")]
+        assert [event["status"] for event in events] == ["running", "completed"]
+        assert client.get("/orchestrate/runs/missing/events").status_code == 404
+
+    def test_large_status_compressed_but_event_stream_not(self, api_client):
+        """Test that large status responses are gzipped while events stay plain"""
+        api, client, _ = api_client
+        api.orchestration_status["orch_big"] = {"status": "completed", "current_step": "completed",
+                                                "results": {"summary": "x" * 10000}}
+
+        status = client.get("/orchestrate/runs/orch_big", headers={"Accept-Encoding": "gzip"})
+        events = client.get("/orchestrate/runs/orch_big/events", headers={"Accept-Encoding": "gzip"})
+
+        assert status.headers["content-encoding"] == "gzip"
+        assert status.json()["status"] == "completed"
+        assert events.headers["content-encoding"] == "identity"
+        assert json.loads(events.text.split("data:", 1)[1])["status"] == "completed"
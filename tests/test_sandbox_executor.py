@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Tests for the sandbox executor
+Covers execution, resource accounting and security validation
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import subprocess
+import threading
+
+# Import our modules
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+import sandbox_executor
+from sandbox_executor import SandboxExecutor, ExecutionStatus, ExecutionLimits
+
+
+class TestSandboxExecutor:
+    """Test sandboxed code execution"""
+
+    def setup_method(self):
+        """Create a fresh sandbox per test"""
+        self.sandbox = SandboxExecutor()
+
+    def teardown_method(self):
+        """Cleanup sandbox directories"""
+        self.sandbox.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_execute_python_with_input_data(self):
+        """Test that INPUT_DATA is available to executed Python code"""
+        result = await self.sandbox.execute_code(
+            "print(INPUT_DATA['vendor'])",
+            language="python",
+            input_data={"vendor": "ACME Corp"}
+        )
+
+        assert result.status == ExecutionStatus.SUCCESS
+        assert result.stdout.strip() == "ACME Corp"
+
+    @pytest.mark.asyncio
+    async def test_input_data_file_not_collected_as_artifact(self):
+        """Test that the INPUT_DATA side file is not reported as an artifact"""
+        result = await self.sandbox.execute_code(
+            "print(len(INPUT_DATA['rows']))",
+            input_data={"rows": list(range(1000))}
+        )
+
+        assert result.stdout.strip() == "1000"
+        assert sandbox_executor.INPUT_DATA_FILE not in result.artifacts
+        assert not any(f.endswith(sandbox_executor.INPUT_DATA_FILE) for f in result.files_created)
+
+    @pytest.mark.asyncio
+    async def test_execution_slot_reused_when_no_artifacts(self):
+        """Test that execution directories are cleared and recycled"""
+        ring_size = len(self.sandbox._dir_ring)
+
+        for _ in range(ring_size + 2):
+            result = await self.sandbox.execute_code("x = 1", input_data={"a": 1})
+            assert result.status == ExecutionStatus.SUCCESS
+
+        assert len(self.sandbox._dir_ring) == ring_size
+        for slot in self.sandbox._dir_ring:
+            assert not any(slot.iterdir())
+
+    @pytest.mark.asyncio
+    async def test_execution_slot_kept_with_artifacts(self):
+        """Test that a slot holding artifacts is not recycled"""
+        result = await self.sandbox.execute_code(
+            "f = open('out.txt', 'w')\nf.write('done')\nf.close()"
+        )
+
+        assert result.artifacts["out.txt"] == "done"
+        assert all(Path(f).exists() for f in result.files_created)
+
+    @pytest.mark.asyncio
+    async def test_compiled_script_reused_across_inputs(self):
+        """Test that identical code is compiled once and reused with new input data"""
+        # Pad past the inline threshold so the script goes through the file path
+        padding = "#" * sandbox_executor.INLINE_SCRIPT_MAX_SIZE + "\n"
+        code = padding + "print(INPUT_DATA['n'] * 2)"
+
+        first = await self.sandbox.execute_code(code, input_data={"n": 2})
+        second = await self.sandbox.execute_code(code, input_data={"n": 5})
+
+        assert first.stdout.strip() == "4"
+        assert second.stdout.strip() == "10"
+        assert len(self.sandbox._compiled_scripts) == 1
+
+    @pytest.mark.asyncio
+    async def test_compiled_script_cache_not_writable_by_scripts(self):
+        """Test that a script overwriting its bytecode does not change later runs"""
+        padding = "#" * sandbox_executor.INLINE_SCRIPT_MAX_SIZE + "\n"
+        code = padding + (
+            "import glob\n"
+            "for path in glob.glob('../**/*.pyc', recursive=True):\n"
+            "    open(path, 'wb').write(b'tampered')\n"
+            "print('ran')"
+        )
+
+        first = await self.sandbox.execute_code(code)
+        second = await self.sandbox.execute_code(code)
+
+        assert first.stdout.strip() == second.stdout.strip() == "ran"
+        assert second.status == ExecutionStatus.SUCCESS
+
+    @pytest.mark.asyncio
+    async def test_syntax_error_reported_by_interpreter(self):
+        """Test that code failing to compile still runs and reports the error"""
+        padding = "#" * sandbox_executor.INLINE_SCRIPT_MAX_SIZE + "\n"
+        result = await self.sandbox.execute_code(padding + "def broken(:\n    pass")
+
+        assert result.status == ExecutionStatus.FAILED
+        assert "SyntaxError" in result.stderr
+
+    @pytest.mark.asyncio
+    async def test_small_script_runs_inline_with_stdin_data(self):
+        """Test that small scripts receive INPUT_DATA over stdin without touching disk"""
+        result = await self.sandbox.execute_code(
+            "print(INPUT_DATA['vendor'].upper())",
+            input_data={"vendor": "acme"}
+        )
+
+        assert result.stdout.strip() == "ACME"
+        assert not self.sandbox._compiled_scripts
+
+    @pytest.mark.asyncio
+    async def test_small_script_syntax_error(self):
+        """Test that inline scripts with syntax errors fail cleanly"""
+        result = await self.sandbox.execute_code("def broken(:\n    pass", input_data={"a": 1})
+
+        assert result.status == ExecutionStatus.FAILED
+        assert "SyntaxError" in result.stderr
+
+    @pytest.mark.asyncio
+    async def test_execute_many_preserves_job_order(self):
+        """Test that concurrent executions return results in job order"""
+        jobs = [
+            {"code": "print(INPUT_DATA['i'])", "input_data": {"i": i}}
+            for i in range(6)
+        ] + [{"code": "echo bash", "language": "bash"}]
+
+        results = await self.sandbox.execute_many(jobs, max_concurrency=3)
+
+        assert [r.stdout.strip() for r in results] == ["0", "1", "2", "3", "4", "5", "bash"]
+        assert all(r.status == ExecutionStatus.SUCCESS for r in results)
+
+    @pytest.mark.asyncio
+    async def test_execute_python_failure(self):
+        """Test that a non-zero exit is reported as failed"""
+        result = await self.sandbox.execute_code("raise SystemExit(3)")
+
+        assert result.status == ExecutionStatus.FAILED
+        assert result.return_code == 3
+
+    @pytest.mark.asyncio
+    async def test_large_output_truncated(self):
+        """Test that output beyond max_output_size is truncated while draining"""
+        limits = ExecutionLimits(max_output_size=1000)
+        result = await self.sandbox.execute_code(
+            "print('é' * 200000)",
+            custom_limits=limits
+        )
+
+        assert result.status == ExecutionStatus.SUCCESS
+        assert result.stdout.endswith("... (output truncated)")
+        assert result.stdout.startswith("é" * 1000)
+        assert len(result.stdout) < 1100
+
+    @pytest.mark.asyncio
+    async def test_security_violation_blocks_execution(self):
+        """Test that dangerous code is rejected before execution"""
+        result = await self.sandbox.execute_code("import subprocess")
+
+        assert result.status == ExecutionStatus.PERMISSION_DENIED
+        assert result.security_violations
+
+    def test_cgroup_unavailable_falls_back_to_rlimits(self, tmp_path):
+        """Test that a missing cgroup v2 hierarchy disables cgroup accounting"""
+        with patch.object(sandbox_executor, "CGROUP_ROOT", tmp_path):
+            sandbox = SandboxExecutor()
+
+        try:
+            assert sandbox.cgroup_dir is None
+            assert sandbox._create_execution_cgroup(ExecutionLimits(), "exec_test") is None
+        finally:
+            sandbox.cleanup()
+
+    def test_cgroup_oom_kill_detection(self, tmp_path):
+        """Test parsing of memory.events for OOM kills"""
+        (tmp_path / "memory.events").write_text("low 0\nhigh 0\nmax 2\noom 1\noom_kill 1\n")
+        assert self.sandbox._cgroup_oom_killed(tmp_path)
+
+        (tmp_path / "memory.events").write_text("low 0\nhigh 0\nmax 0\noom 0\noom_kill 0\n")
+        assert not self.sandbox._cgroup_oom_killed(tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_network_probe_runs_off_event_loop(self):
+        """Test that the blocking namespace probe is not run on the event loop thread"""
+        loop_thread = threading.get_ident()
+        probe_threads = []
+
+        def probe():
+            probe_threads.append(threading.get_ident())
+            return False
+
+        with patch.object(sandbox_executor, "network_isolation_available", probe):
+            result = await self.sandbox.execute_code("print('ok')")
+
+        assert result.stdout.strip() == "ok"
+        assert probe_threads and loop_thread not in probe_threads
+
+    @pytest.mark.skipif(
+        not sandbox_executor.network_isolation_available(),
+        reason="network namespaces unavailable"
+    )
+    def test_isolated_network_has_only_loopback(self):
+        """Test that the isolated child sees loopback and no other interfaces"""
+        output = subprocess.run(
+            ["cat", "/proc/net/dev"],
+            preexec_fn=sandbox_executor._isolate_network,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+
+        interfaces = [line.split(":")[0].strip() for line in output.splitlines()[2:]]
+        assert interfaces == ["lo"]
+
+    def test_bash_validation_reports_overlapping_patterns(self):
+        """Test that overlapping dangerous commands are all reported"""
+        issues = self.sandbox._validate_bash_security("sudo rm -rf /tmp/x && curl example.com")
+
+        assert issues == [
+            "Dangerous command: rm -rf",
+            "Dangerous command: rm -r",
+            "Dangerous command: sudo",
+            "Dangerous command: su",
+            "Network command not allowed: curl",
+        ]
+
+    def test_pattern_scanner_matches_substring_checks(self):
+        """Test that PatternScanner agrees with per-pattern substring checks"""
+        patterns = sandbox_executor.BASH_DANGEROUS_COMMANDS
+        scanner = sandbox_executor.PatternScanner(patterns)
+        samples = ["", "echo hi", "umount /mnt", "rm -r dir", "sudo su", "chmod +x a; mkfs"]
+
+        for sample in samples:
+            assert scanner.find(sample) == [p for p in patterns if p in sample]
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_and_reaps_process(self):
+        """Test that a timed-out child is killed and reaped"""
+        limits = ExecutionLimits(timeout_seconds=1)
+        result = await self.sandbox.execute_code("while True:\n    pass", custom_limits=limits)
+
+        assert result.status == ExecutionStatus.TIMEOUT
+        assert result.execution_time < 1 + sandbox_executor.KILL_WAIT_SECONDS
+
+    def test_serialize_input_data_fallback_matches_orjson(self):
+        """Test that stdlib and orjson serialization produce equivalent JSON"""
+        import json
+        from datetime import date
+
+        data = {"amount": 1.5, "items": [1, "two"], "due": date(2024, 1, 31), 3: "three"}
+        encoded = sandbox_executor.serialize_input_data(data)
+
+        with patch.object(sandbox_executor, "HAS_ORJSON", False):
+            fallback = sandbox_executor.serialize_input_data(data)
+
+        assert json.loads(encoded) == json.loads(fallback)